@@ -0,0 +1,11 @@
+import pytest
+
+import news_cache
+
+
+@pytest.fixture(autouse=True)
+def memory_cache(monkeypatch):
+    """测试使用进程内缓存，避免读写项目目录下的持久化缓存"""
+    cache = news_cache.MemoryCache()
+    monkeypatch.setattr(news_cache, '_global_cache', cache)
+    return cache
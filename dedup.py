@@ -0,0 +1,161 @@
+"""
+跨来源去重
+- canonical_url: 规范化链接（去掉跟踪参数、片段和结尾斜杠，合并同一文章的不同栏目路径）
+- SimHashIndex: 标题 SimHash 指纹索引，按分段精确匹配查找近似重复，查找代价与历史条数无关
+- Deduplicator / dedup: 按链接和标题近似度去掉重复新闻，保留先出现的一条
+
+同一条新闻经常同时出现在多个来源，或在同一来源的不同栏目下出现；
+去重在聚合阶段完成，之后的入库和渲染都只处理去重后的新闻。
+"""
+import hashlib
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from search_index import tokenize
+
+# 规范化时去掉的跟踪参数
+TRACKING_PARAMS = frozenset({'spm', 'from', 'source', 'ref', 'share', 'share_token', 'fbclid', 'gclid',
+                             'mc_cid', 'mc_eid', 'taid'})
+TRACKING_PARAM_PREFIXES = ('utm_',)
+# 文章地址与栏目无关的站点：只保留路径最后一段（文章 slug）
+SECTIONLESS_HOSTS = ('reuters.com',)
+
+FINGERPRINT_BITS = 64
+# 汉明距离不超过该值的两个标题视为近似重复
+MAX_DISTANCE = 3
+
+
+def _is_tracking_param(name: str) -> bool:
+    name = name.lower()
+    return name in TRACKING_PARAMS or name.startswith(TRACKING_PARAM_PREFIXES)
+
+
+@lru_cache(maxsize=20000)
+def canonical_url(url: str) -> str:
+    """
+    规范化链接，用作去重键（不改变新闻中保存的原始链接）
+    例: 'https://www.reuters.com/markets/asia/fed-cuts-2024-05-01/?utm_source=x'
+        -> 'https://reuters.com/fed-cuts-2024-05-01'
+    """
+    if not url:
+        return ''
+    try:
+        parts = urlsplit(url.strip())
+    except ValueError:
+        return url.strip()
+    host = parts.netloc.lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    path = parts.path.rstrip('/')
+    if path and host.endswith(SECTIONLESS_HOSTS):
+        path = '/' + path.rsplit('/', 1)[-1]
+    query = urlencode(sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+                             if not _is_tracking_param(k)))
+    return urlunsplit(('https', host, path, query, ''))
+
+
+# 每个指纹位在累加器中占用一个字节的计数槽，因此每次最多累加 255 个词
+_LANE_LIMIT = 255
+_BIT_TO_BYTE = bytes.maketrans(b'01', b'\x00\x01')
+
+
+@lru_cache(maxsize=65536)
+def _token_lanes(token: str) -> int:
+    """
+    词的 64 位哈希展开到 64 个字节槽（第 i 位为 1 时第 i 个字节为 1）
+    多个词的展开值直接相加，即可一次得到每一位为 1 的词数
+    """
+    h = int.from_bytes(hashlib.blake2b(token.encode('utf-8'), digest_size=8).digest(), 'big')
+    bits = format(h, f'0{FINGERPRINT_BITS}b')[::-1].encode('ascii')     # 第 i 个字节为第 i 位
+    return int.from_bytes(bits.translate(_BIT_TO_BYTE), 'little')
+
+
+def simhash(text: str) -> int:
+    """
+    标题的 64 位 SimHash 指纹（分词规则与页面搜索相同：中文二元组 + 英文单词）
+    相似的标题指纹只有少数位不同；没有可用词时返回 0
+    """
+    tokens = list(set(tokenize(text)))
+    if not tokens:
+        return 0
+    counts = [0] * FINGERPRINT_BITS
+    for i in range(0, len(tokens), _LANE_LIMIT):
+        lanes = sum(_token_lanes(token) for token in tokens[i:i + _LANE_LIMIT])
+        counts = [a + b for a, b in zip(counts, lanes.to_bytes(FINGERPRINT_BITS, 'little'))]
+    # 多数词在该位为 1 时指纹该位为 1
+    half = len(tokens) // 2
+    return int(''.join('1' if count > half else '0' for count in reversed(counts)), 2)
+
+
+class SimHashIndex:
+    """
+    SimHash 近似查找
+    将指纹分成 max_distance + 1 段：汉明距离不超过 max_distance 的两个指纹至少有一段完全相同（抽屉原理），
+    因此只需比较与查询指纹某一段相同的候选，无需与所有历史指纹两两比较。
+    """
+
+    def __init__(self, max_distance: int = MAX_DISTANCE):
+        self.max_distance = max_distance
+        bands = max_distance + 1
+        width = FINGERPRINT_BITS // bands
+        # 每段的 (位移, 掩码)；最后一段包含除不尽的剩余位
+        self._bands: List[Tuple[int, int]] = [
+            (i * width, (1 << (width if i < bands - 1 else FINGERPRINT_BITS - i * width)) - 1)
+            for i in range(bands)
+        ]
+        # 每段一张表: 段的值 -> [(指纹, 值)]
+        self._tables: List[Dict[int, List[Tuple[int, Any]]]] = [{} for _ in self._bands]
+
+    def _keys(self, fingerprint: int) -> Iterator[Tuple[Dict[int, List[Tuple[int, Any]]], int]]:
+        for table, (shift, mask) in zip(self._tables, self._bands):
+            yield table, fingerprint >> shift & mask
+
+    def add(self, fingerprint: int, value: Any = None) -> None:
+        for table, key in self._keys(fingerprint):
+            table.setdefault(key, []).append((fingerprint, value))
+
+    def find(self, fingerprint: int) -> Optional[Any]:
+        """返回第一个汉明距离不超过 max_distance 的已有条目的值，没有时返回 None"""
+        for table, key in self._keys(fingerprint):
+            for other, value in table.get(key, ()):
+                if bin(fingerprint ^ other).count('1') <= self.max_distance:
+                    return value if value is not None else other
+        return None
+
+
+class Deduplicator:
+    """
+    有状态的去重器：依次检查新闻，与之前见过的新闻链接相同或标题近似时视为重复
+    同一个实例可以跨多批新闻使用（如先用已入库的历史预热，再检查新抓取的新闻）
+    """
+
+    def __init__(self, max_distance: int = MAX_DISTANCE):
+        self._links = set()
+        self._titles = SimHashIndex(max_distance)
+
+    def is_duplicate(self, item: Mapping[str, Any]) -> bool:
+        """检查并记录一条新闻；重复时返回 True（不记录）"""
+        link = canonical_url(item.get('link', ''))
+        if link and link in self._links:
+            return True
+        fingerprint = simhash(item.get('title', ''))
+        if fingerprint and self._titles.find(fingerprint) is not None:
+            return True
+        if link:
+            self._links.add(link)
+        if fingerprint:
+            self._titles.add(fingerprint, True)
+        return False
+
+    def filter(self, items: Iterable[Any]) -> List[Any]:
+        """去掉重复的新闻，保持原有顺序"""
+        return [item for item in items if not self.is_duplicate(item)]
+
+
+def dedup(items: Iterable[Any], max_distance: int = MAX_DISTANCE) -> List[Any]:
+    """
+    去掉链接相同（规范化后）或标题近似的重复新闻，保留先出现的一条
+    按时间倒序输入时即保留最新的一条
+    """
+    return Deduplicator(max_distance).filter(items)
@@ -1,19 +1,248 @@
 import requests
-from bs4 import BeautifulSoup
 from datetime import datetime
 from zoneinfo import ZoneInfo
-import time
-from requests.adapters import HTTPAdapter
-from urllib3.util import Retry
-import re
-import json
 import sys
-import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from http_client import get_session, conditional_get
+from news_cache import get_cache
+from reuters_extract import extract_candidates, extract_embedded_candidates, LINK_PATTERN, FALLBACK_LINK_PATTERN
 
-def get_reuters_news(use_cache: bool = True, cache_ttl: int = 60, retries: int = 5):
+CACHE_KEY = 'reuters:articles'
+
+
+def _fetch_section(session, url, headers, parser='stream'):
+    """
+    获取并解析单个路透社栏目页面
+    使用条件请求，页面未变化（304）时直接返回上次的解析结果
+    返回该页面的新闻列表；网络错误以 requests 异常抛出
+    """
+    print(f"[Reuters] 获取 {url}", file=sys.stderr)
+
+    def parse(response):
+        response.encoding = 'utf-8'
+        print(f"[Reuters] 状态码: {response.status_code}, 内容长度: {len(response.content)}", file=sys.stderr)
+        # 缓存的是完整的解析结果，已入库链接由调用方在读取后过滤
+        return _parse_section(response.content, url, parser)
+
+    news_items, not_modified = conditional_get(session, url, parse, headers=headers, timeout=20)  # 增加到 20 秒
+    if not_modified:
+        print(f"[Reuters] {url} 未变化 (304)，复用上次解析结果 {len(news_items)} 条", file=sys.stderr)
+    return news_items
+
+
+def _absolute_link(href):
+    """站内相对链接补全为绝对链接，无法识别的链接返回 None"""
+    if href.startswith('/'):
+        return 'https://www.reuters.com' + href
+    if href.startswith('http'):
+        return href
+    return None
+
+
+def _seen_predicate(seen_filter, skipped):
+    """返回判断 href 是否已入库的函数，已入库的链接记入 skipped 集合；没有过滤器时返回 None"""
+    if seen_filter is None:
+        return None
+
+    def skip(href):
+        link_url = _absolute_link(href.strip()) or ''
+        if seen_filter.seen(link_url):
+            skipped.add(link_url)
+            return True
+        return False
+    return skip
+
+
+def _container_index(soup, links):
+    """
+    一次遍历文档，建立两个索引：
+    - 链接 -> 容器：最近的 <article> 祖先，否则最近的 <div> 祖先（卡片容器）
+    - 容器 -> 子树中的第一个 <time>
+    遇到 <time> 时由内向外标记路径上尚未记录的容器；遇到已记录的容器即可停止，
+    因为更外层的容器在那时也已记录，总代价与页面大小成线性关系
+    返回 ({id(链接): id(容器)}, {id(容器): time 元素})
+    """
+    from bs4 import Tag
+
+    wanted = {id(link) for link in links}
+    container_of = {}
+    first_time = {}
+    articles, divs = [], []          # 当前路径上打开的容器
+    stack = [(soup, False)]          # (节点, 是否为离开该节点)
+    while stack:
+        node, leaving = stack.pop()
+        if leaving:
+            (articles if node.name == 'article' else divs).pop()
+            continue
+        if node.name == 'time':
+            for opened in (articles, divs):
+                for container in reversed(opened):
+                    if container in first_time:
+                        break
+                    first_time[container] = node
+        if id(node) in wanted:
+            container = articles[-1] if articles else (divs[-1] if divs else None)
+            if container is not None:
+                container_of[id(node)] = container
+        if node.name in ('article', 'div'):
+            (articles if node.name == 'article' else divs).append(id(node))
+            stack.append((node, True))
+        stack.extend((child, False) for child in reversed(node.contents) if isinstance(child, Tag))
+    return container_of, first_time
+
+
+def _soup_candidates(content, url, skip=None):
+    """
+    基于 BeautifulSoup 提取候选链接
+    skip: 对 href 返回 True 的链接直接跳过，不再提取标题和时间
+    返回 [(href, 标题或 None, 时间属性或 None)]
+    """
+    # 只有 parser='bs4' 时才需要 BeautifulSoup
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(content, 'html.parser')
+
+    # Try different article selection strategies
+    # Strategy 1: Look for article links with specific patterns
+    article_links = soup.find_all('a', href=LINK_PATTERN)
+
+    # 如果没有找到，尝试找所有链接
+    if not article_links:
+        print(f"[Reuters] {url} 未找到标准文章链接，尝试其他方式...", file=sys.stderr)
+        article_links = soup.find_all('a', href=FALLBACK_LINK_PATTERN)
+
+    print(f"[Reuters] {url} 找到 {len(article_links)} 个链接", file=sys.stderr)
+
+    container_of, first_time = _container_index(soup, article_links)
+
+    candidates = []
+    for link in article_links:
+        if skip is not None and skip(link.get('href', '')):
+            continue
+
+        # Find title - try different approaches
+        title = None
+
+        # Try to get text from the link itself
+        title_text = link.get_text(strip=True)
+        if title_text and len(title_text) > 10:
+            title = title_text
+
+        # Or try to find a heading inside
+        if not title:
+            heading = link.find(['h2', 'h3', 'h4'])
+            if heading:
+                title = heading.get_text(strip=True)
+
+        # Or look for span with text
+        if not title:
+            for span in link.find_all('span'):
+                text = span.get_text(strip=True)
+                if text and len(text) > 10:
+                    title = text
+                    break
+
+        # Look for time element in nearby elements（所在容器子树中的第一个 <time>）
+        time_value = None
+        time_elem = first_time.get(container_of.get(id(link)))
+        if time_elem is not None:
+            time_value = time_elem.get('datetime')
+
+        candidates.append((link.get('href', ''), title, time_value))
+    return candidates
+
+
+def _parse_section(content, url, parser='stream', seen_filter=None):
+    """
+    从栏目页面 HTML 中提取新闻列表
+    优先使用页面内嵌的数据 JSON（带真实发布时间）；找不到时才退回 DOM 启发式提取
+    parser: DOM 提取使用的解析器，'stream' 为单次扫描的流式提取器，'bs4' 为 BeautifulSoup
+    seen_filter: 已入库链接的过滤器，其中的链接不再提取标题和时间
+    """
+    if parser not in ('stream', 'bs4'):
+        raise ValueError(f"未知的解析器: {parser}")
+
+    skipped = set()
+    skip = _seen_predicate(seen_filter, skipped)
+    candidates = extract_embedded_candidates(content)
+    if candidates:
+        print(f"[Reuters] {url} 从内嵌数据中找到 {len(candidates)} 篇文章", file=sys.stderr)
+    elif parser == 'bs4':
+        candidates = _soup_candidates(content, url, skip)
+    else:
+        candidates = extract_candidates(content, skip)
+        print(f"[Reuters] {url} 找到 {len(candidates)} 个链接", file=sys.stderr)
+
+    news_items = []
+    seen = set()
+
+    for href, title, time_value in candidates:
+        try:
+            href = href.strip()
+
+            if not href or href in seen:
+                continue
+
+            seen.add(href)
+
+            # Build absolute URL
+            link_url = _absolute_link(href)
+            if link_url is None:
+                continue
+
+            if link_url in skipped:
+                continue
+            if seen_filter is not None and seen_filter.seen(link_url):
+                skipped.add(link_url)
+                continue
+
+            if not title or len(title) < 5:
+                continue
+
+            # Try to find datetime
+            datetime_str = datetime.now(ZoneInfo('UTC')).astimezone(ZoneInfo('Asia/Shanghai')).strftime('%Y-%m-%d %H:%M:%S')
+            if time_value:
+                try:
+                    dt = datetime.fromisoformat(time_value.replace('Z', '+00:00'))
+                    datetime_str = dt.astimezone(ZoneInfo('Asia/Shanghai')).strftime('%Y-%m-%d %H:%M:%S')
+                except Exception:
+                    pass
+
+            if title and link_url:
+                item = {
+                    'title': title,
+                    'datetime': datetime_str,
+                    'link': link_url,
+                    'source': 'reuters',
+                    'type': 'article'
+                }
+                news_items.append(item)
+
+        except Exception as e:
+            continue
+
+    if skipped:
+        print(f"[Reuters] {url} 跳过 {len(skipped)} 个已入库的链接", file=sys.stderr)
+    return news_items
+
+
+def _drop_seen(news_items, seen_filter):
+    """去掉 seen_filter 中已入库的新闻，返回 (剩余的新闻, 跳过的条数)；没有过滤器时原样返回"""
+    if seen_filter is None:
+        return news_items, 0
+    fresh = [item for item in news_items if not seen_filter.seen(item['link'])]
+    return fresh, len(news_items) - len(fresh)
+
+
+def get_reuters_news(use_cache: bool = True, cache_ttl: int = 60, retries: int = 5, max_workers: int = 5,
+                     parser: str = 'stream', seen_filter=None):
     """
     从路透社获取当天的新闻链接清单
     返回数据格式为[{'title': 标题, 'datetime': '日期', 'link': '链接', 'source': 'reuters'}]
+    max_workers: 并发抓取栏目页面的最大线程数
+    parser: 页面解析器，'stream'（默认，单次扫描的流式提取器）或 'bs4'（BeautifulSoup）
+    seen_filter: 已入库链接的过滤器（seen_filter.SeenFilter），只从返回值中去掉其中的链接；
+        缓存中始终保存未过滤的结果，不影响不带过滤器的调用
     """
     # 支持多个备用 URL（如果某个 URL 无法访问）
     urls = [
@@ -45,135 +274,40 @@ def get_reuters_news(use_cache: bool = True, cache_ttl: int = 60, retries: int =
         'Pragma': 'no-cache',
     }
     
-    # Simple in-memory cache
-    global _REUTERS_CACHE
-    try:
-        _REUTERS_CACHE
-    except NameError:
-        _REUTERS_CACHE = {}
+    # 共享缓存（默认持久化到磁盘，进程重启后仍可使用）
+    cache = get_cache()
 
     if use_cache:
-        cached = _REUTERS_CACHE.get('articles')
-        if cached and (time.time() - cached[0]) < cache_ttl:
+        cached = cache.get(CACHE_KEY, max_age=cache_ttl)
+        if cached:
             print("[Reuters] 使用缓存数据", file=sys.stderr)
-            return cached[1]
-
-    # Prepare a requests session with retries/backoff
-    session = requests.Session()
-    retry_strategy = Retry(
-        total=retries,
-        backoff_factor=1.5,  # 增加退避因子
-        status_forcelist=[429, 500, 502, 503, 504],
-        allowed_methods=["HEAD", "GET", "OPTIONS"]
-    )
-    adapter = HTTPAdapter(max_retries=retry_strategy)
-    session.mount("https://", adapter)
-    session.mount("http://", adapter)
+            return _drop_seen(cached, seen_filter)[0]
+
+    # 使用进程级共享的 Session，连接在多次调用之间复用
+    session = get_session(retries=retries, backoff_factor=1.5)  # 增加退避因子
 
     news_items = []
     failed_urls = []
-    
+
+    # 并发抓取各个栏目，每个页面到达后立即在工作线程中解析；
+    # 合并时仍按 urls 的顺序，保证去重结果与顺序抓取一致
+    results = {}
+    workers = max(1, min(max_workers, len(urls)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='reuters-section') as executor:
+        futures = {executor.submit(_fetch_section, session, url, headers, parser): url for url in urls}
+        for future in as_completed(futures):
+            url = futures[future]
+            try:
+                results[url] = future.result()
+            except requests.exceptions.RequestException as e:
+                print(f"[Reuters] 获取 {url} 时出错: {type(e).__name__}: {e}", file=sys.stderr)
+                failed_urls.append(url)
+            except Exception as e:
+                print(f"[Reuters] 解析 {url} 时出错: {type(e).__name__}: {e}", file=sys.stderr)
+                failed_urls.append(url)
+
     for url in urls:
-        try:
-            print(f"[Reuters] 获取 {url}", file=sys.stderr)
-            response = session.get(url, headers=headers, timeout=20)  # 增加到 20 秒
-            response.raise_for_status()
-            response.encoding = 'utf-8'
-            
-            print(f"[Reuters] 状态码: {response.status_code}, 内容长度: {len(response.content)}", file=sys.stderr)
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Try different article selection strategies
-            # Strategy 1: Look for article links with specific patterns
-            article_links = soup.find_all('a', href=re.compile(r'/article/|/world/|/business/|/markets/|/finance/|/technology/'))
-            
-            # 如果没有找到，尝试找所有链接
-            if not article_links:
-                print(f"[Reuters] {url} 未找到标准文章链接，尝试其他方式...", file=sys.stderr)
-                article_links = soup.find_all('a', href=re.compile(r'^/[a-z]+/'))
-            
-            print(f"[Reuters] {url} 找到 {len(article_links)} 个链接", file=sys.stderr)
-            
-            seen = set()
-            
-            for link in article_links:
-                try:
-                    href = link.get('href', '').strip()
-                    
-                    if not href or href in seen:
-                        continue
-                    
-                    seen.add(href)
-                    
-                    # Find title - try different approaches
-                    title = None
-                    
-                    # Try to get text from the link itself
-                    title_text = link.get_text(strip=True)
-                    if title_text and len(title_text) > 10:
-                        title = title_text
-                    
-                    # Or try to find a heading inside
-                    if not title:
-                        heading = link.find(['h2', 'h3', 'h4'])
-                        if heading:
-                            title = heading.get_text(strip=True)
-                    
-                    # Or look for span with text
-                    if not title:
-                        for span in link.find_all('span'):
-                            text = span.get_text(strip=True)
-                            if text and len(text) > 10:
-                                title = text
-                                break
-                    
-                    if not title or len(title) < 5:
-                        continue
-                    
-                    # Build absolute URL
-                    if href.startswith('/'):
-                        link_url = 'https://www.reuters.com' + href
-                    elif href.startswith('http'):
-                        link_url = href
-                    else:
-                        continue
-                    
-                    # Try to find datetime
-                    datetime_str = datetime.now(ZoneInfo('UTC')).astimezone(ZoneInfo('Asia/Shanghai')).strftime('%Y-%m-%d %H:%M:%S')
-                    
-                    # Look for time element in nearby elements
-                    parent = link.find_parent('article') or link.find_parent('div', recursive=True)
-                    if parent:
-                        time_elem = parent.find('time')
-                        if time_elem and time_elem.get('datetime'):
-                            try:
-                                dt = datetime.fromisoformat(time_elem.get('datetime').replace('Z', '+00:00'))
-                                datetime_str = dt.astimezone(ZoneInfo('Asia/Shanghai')).strftime('%Y-%m-%d %H:%M:%S')
-                            except Exception:
-                                pass
-                    
-                    if title and link_url:
-                        item = {
-                            'title': title,
-                            'datetime': datetime_str,
-                            'link': link_url,
-                            'source': 'reuters',
-                            'type': 'article'
-                        }
-                        news_items.append(item)
-                        
-                except Exception as e:
-                    continue
-                    
-        except requests.exceptions.RequestException as e:
-            print(f"[Reuters] 获取 {url} 时出错: {type(e).__name__}: {e}", file=sys.stderr)
-            failed_urls.append(url)
-            continue
-        except Exception as e:
-            print(f"[Reuters] 解析 {url} 时出错: {type(e).__name__}: {e}", file=sys.stderr)
-            failed_urls.append(url)
-            continue
+        news_items.extend(results.get(url, []))
     
     # Remove duplicates while preserving order
     seen_titles = set()
@@ -184,7 +318,7 @@ def get_reuters_news(use_cache: bool = True, cache_ttl: int = 60, retries: int =
             unique_items.append(item)
     
     print(f"[Reuters] 获取完成: 成功 {len(urls) - len(failed_urls)}/{len(urls)}, 共 {len(unique_items)} 条新闻", file=sys.stderr)
-    
+
     # 如果没有获取到任何新闻，记录详细的诊断信息
     if not unique_items:
         print("[Reuters] 错误: 未获取到任何新闻", file=sys.stderr)
@@ -195,16 +329,21 @@ def get_reuters_news(use_cache: bool = True, cache_ttl: int = 60, retries: int =
         print("[Reuters]   3. 网络连接问题", file=sys.stderr)
         print("[Reuters] 将尝试返回过期缓存数据...", file=sys.stderr)
     
-    # If we got articles, cache them
+    # If we got articles, cache them（缓存未过滤的结果）
     if unique_items:
-        _REUTERS_CACHE['articles'] = (time.time(), unique_items)
-        return unique_items
+        cache.set(CACHE_KEY, unique_items)
     else:
         # 如果本次获取失败但有缓存，返回缓存的旧数据（容错）
-        if use_cache and 'articles' in _REUTERS_CACHE:
+        stale = cache.get(CACHE_KEY) if use_cache else None
+        if stale:
             print("[Reuters] 本次获取失败，返回过期的缓存数据作为备用", file=sys.stderr)
-            return _REUTERS_CACHE['articles'][1]
-        return unique_items
+            unique_items = stale
+
+    # 所有链接都已入库时返回空列表：获取本身是成功的，不输出诊断信息
+    fresh, skipped = _drop_seen(unique_items, seen_filter)
+    if skipped:
+        print(f"[Reuters] 跳过 {skipped} 个已入库的链接，剩余 {len(fresh)} 条新闻", file=sys.stderr)
+    return fresh
 
 
 if __name__ == '__main__':
@@ -1,20 +1,166 @@
 import requests
-from bs4 import BeautifulSoup
 from datetime import datetime
 from zoneinfo import ZoneInfo
 import time
-from requests.adapters import HTTPAdapter
-from urllib3.util import Retry
 import re
+from http_client import get_session, conditional_get
+from news_cache import get_cache
 
-def get_wallstreetcn_news(use_cache: bool = True, cache_ttl: int = 60, retries: int = 3):
+CACHE_KEY = 'wallstreetcn:information_flow'
+API_URL = "https://api.wscn.net/apiv1/content/information-flow"
+PAGE_URL = "https://wallstreetcn.com/news/global"
+PAGE_SIZE = 50
+MAX_PAGES = 10
+LIVES_API_URL = "https://api-one.wallstcn.com/apiv1/content/lives"
+LIVES_PAGE_SIZE = 30
+
+
+def _parse_information_flow(js):
+    """将 information-flow API 返回的 JSON 转换为新闻列表"""
+    news_items = []
+    items = js.get('data', {}).get('items', [])
+    for it in items:
+        try:
+            # API wraps resource in item['resource']
+            resource = it.get('resource') or {}
+            # fallback if resource further nested
+            if not isinstance(resource, dict):
+                continue
+
+            title = resource.get('title')
+            link = resource.get('uri')
+            # some URIs may be relative, ensure absolute
+            if link and link.startswith('/'):
+                link = 'https://wallstreetcn.com' + link
+
+            display_time = resource.get('display_time')
+            if display_time:
+                try:
+                    # interpret epoch as UTC then convert to Beijing time
+                    dt = datetime.fromtimestamp(int(display_time), tz=ZoneInfo('UTC'))
+                    datetime_str = dt.astimezone(ZoneInfo('Asia/Shanghai')).strftime('%Y-%m-%d %H:%M:%S')
+                except Exception:
+                    datetime_str = datetime.now(ZoneInfo('Asia/Shanghai')).strftime('%Y-%m-%d %H:%M:%S')
+            else:
+                datetime_str = datetime.now(ZoneInfo('Asia/Shanghai')).strftime('%Y-%m-%d %H:%M:%S')
+            # include resource type if present
+            resource_type = it.get('resource_type') or resource.get('type') or resource.get('resource_type')
+
+            if title and link:
+                item = {'title': title, 'datetime': datetime_str, 'link': link}
+                if resource_type:
+                    item['type'] = resource_type
+                news_items.append(item)
+        except Exception as e:
+            # skip malformed item
+            print(f"解析 API 项目时出错: {e}")
+            continue
+    return news_items
+
+
+def _parse_information_flow_page(js):
+    """解析一页 information-flow 结果，返回 {'items': 新闻列表, 'next_cursor': 下一页游标}"""
+    data = js.get('data') or {}
+    return {'items': _parse_information_flow(js), 'next_cursor': data.get('next_cursor') or None}
+
+
+def _fetch_information_flow(session, headers, known_links, today, max_pages=MAX_PAGES):
+    """
+    按游标分页获取 information-flow，直到：
+    - 遇到上次已经获取过的链接（known_links），或
+    - 遇到早于今天（北京时间）的新闻，或
+    - 没有下一页 / 达到 max_pages
+
+    Returns:
+        (新闻列表, 是否因遇到已获取的链接而提前停止)
+    """
+    news_items = []
+    cursor = None
+    for page in range(max_pages):
+        params = {'channel': 'global', 'limit': PAGE_SIZE}
+        if cursor:
+            params['cursor'] = cursor
+        try:
+            result, _ = conditional_get(
+                session, API_URL, lambda resp: _parse_information_flow_page(resp.json()),
+                params=params, headers=headers, timeout=10)
+        except Exception:
+            # 第一页失败交给调用方处理；后续页失败则保留已获取的部分
+            if page == 0:
+                raise
+            break
+
+        reached_known = False
+        reached_old = False
+        for item in result['items']:
+            if item['link'] in known_links:
+                reached_known = True
+                continue
+            if item['datetime'] < today:
+                reached_old = True
+            news_items.append(item)
+
+        cursor = result['next_cursor']
+        if reached_known:
+            return news_items, True
+        if reached_old or not cursor or not result['items']:
+            break
+    return news_items, False
+
+
+def _parse_html_page(page_text):
+    """API 不可用时，从新闻列表页 HTML 中提取新闻"""
+    # 只在 API 不可用时才需要 BeautifulSoup
+    from bs4 import BeautifulSoup
+
+    news_items = []
+    soup = BeautifulSoup(page_text, 'html.parser')
+    # 尝试查找新闻列表
+    articles = soup.find_all('article', class_='athing')
+    if not articles:
+        # 尝试其他可能的class
+        articles = soup.find_all('div', class_='news-item')
+    if not articles:
+        articles = soup.find_all('div', attrs={'data-component': 'NewsItem'})
+    if not articles:
+        articles = soup.find_all('div', class_='c-card-item')
+
+    for article in articles:
+        try:
+            title_element = article.find('a')
+            if not title_element:
+                continue
+            title = title_element.get_text(strip=True)
+            link = title_element.get('href')
+            if link and not link.startswith('http'):
+                link = 'https://wallstreetcn.com' + link
+            time_element = article.find('time')
+            if time_element:
+                # try to normalize time if it contains a timestamp or full datetime
+                datetime_str = time_element.get_text(strip=True)
+                # If only date present, append current time (Beijing)
+                if re.match(r'^[0-9]{4}-[0-9]{2}-[0-9]{2}$', datetime_str):
+                    datetime_str = datetime_str + ' ' + datetime.now(ZoneInfo('Asia/Shanghai')).strftime('%H:%M:%S')
+            else:
+                datetime_str = datetime.now(ZoneInfo('Asia/Shanghai')).strftime('%Y-%m-%d %H:%M:%S')
+            if title and link:
+                news_items.append({'title': title, 'datetime': datetime_str, 'link': link})
+        except Exception as e:
+            print(f"解析新闻项目时出错: {e}")
+            continue
+    return news_items
+
+
+def get_wallstreetcn_news(use_cache: bool = True, cache_ttl: int = 60, retries: int = 3,
+                          max_pages: int = MAX_PAGES):
     """
     从华尔街见闻获取当天的新闻链接清单
     返回数据格式为[{'title': 标题, 'datetime': '日期', 'link': '链接'}]
+
+    优先使用 information-flow API，并按游标翻页获取当天的全部新闻；遇到上次已获取的新闻时
+    停止翻页，并接上上次结果中今天的部分。只有 API 失败时才下载新闻列表页 HTML。
+    max_pages: 最多翻页数
     """
-    # Prefer using the public content API which returns structured JSON
-    api_url = "https://api.wscn.net/apiv1/content/information-flow"
-    url = "https://wallstreetcn.com/news/global"
     headers = {
         'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
         'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
@@ -24,133 +170,53 @@ def get_wallstreetcn_news(use_cache: bool = True, cache_ttl: int = 60, retries:
         'Upgrade-Insecure-Requests': '1',
     }
     
-    # Simple in-memory cache
-    # Cached value stored as tuple: (timestamp, data)
-    global _WSCN_CACHE
-    try:
-        _WSCN_CACHE
-    except NameError:
-        _WSCN_CACHE = {}
+    # 共享缓存（默认持久化到磁盘，进程重启后仍可使用）
+    cache = get_cache()
 
     if use_cache:
-        cached = _WSCN_CACHE.get('information_flow')
-        if cached and (time.time() - cached[0]) < cache_ttl:
-            return cached[1]
-
-    # Prepare a requests session with retries/backoff
-    session = requests.Session()
-    retry_strategy = Retry(
-        total=retries,
-        backoff_factor=0.5,
-        status_forcelist=[429, 500, 502, 503, 504],
-        allowed_methods=["HEAD", "GET", "OPTIONS"]
-    )
-    adapter = HTTPAdapter(max_retries=retry_strategy)
-    session.mount("https://", adapter)
-    session.mount("http://", adapter)
+        cached = cache.get(CACHE_KEY, max_age=cache_ttl)
+        if cached:
+            return cached
+
+    # 使用进程级共享的 Session，连接在多次调用之间复用
+    session = get_session(retries=retries, backoff_factor=0.5)
+
+    # 上次的结果（不论新旧）用于判断翻页何时可以停止
+    previous = cache.get(CACHE_KEY) or []
+    today = datetime.now(ZoneInfo('Asia/Shanghai')).strftime('%Y-%m-%d')
 
     try:
-        response = session.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
-        response.encoding = 'utf-8'
-        
         # First try the JSON API which is more stable than scraping the SPA HTML
-        news_items = []
         try:
-            api_params = {'channel': 'global', 'limit': 50}
-            api_resp = session.get(api_url, params=api_params, headers=headers, timeout=10)
-            api_resp.raise_for_status()
-            js = api_resp.json()
-            items = js.get('data', {}).get('items', [])
-            for it in items:
-                try:
-                    # API wraps resource in item['resource']
-                    resource = it.get('resource') or {}
-                    # fallback if resource further nested
-                    if not isinstance(resource, dict):
+            known_links = {item['link'] for item in previous}
+            news_items, reached_known = _fetch_information_flow(session, headers, known_links, today, max_pages)
+            if reached_known:
+                # 接上上次结果中今天的新闻；不足一页时用更早的新闻补足，与单页请求的结果规模一致
+                fetched_links = {item['link'] for item in news_items}
+                for item in previous:
+                    if item['link'] in fetched_links:
                         continue
-
-                    title = resource.get('title')
-                    link = resource.get('uri')
-                    # some URIs may be relative, ensure absolute
-                    if link and link.startswith('/'):
-                        link = 'https://wallstreetcn.com' + link
-
-                    display_time = resource.get('display_time')
-                    if display_time:
-                        try:
-                            # interpret epoch as UTC then convert to Beijing time
-                            dt = datetime.fromtimestamp(int(display_time), tz=ZoneInfo('UTC'))
-                            datetime_str = dt.astimezone(ZoneInfo('Asia/Shanghai')).strftime('%Y-%m-%d %H:%M:%S')
-                        except Exception:
-                            datetime_str = datetime.now(ZoneInfo('Asia/Shanghai')).strftime('%Y-%m-%d %H:%M:%S')
-                    else:
-                        datetime_str = datetime.now(ZoneInfo('Asia/Shanghai')).strftime('%Y-%m-%d %H:%M:%S')
-                    # include resource type if present
-                    resource_type = it.get('resource_type') or resource.get('type') or resource.get('resource_type')
-
-                    if title and link:
-                        item = {'title': title, 'datetime': datetime_str, 'link': link}
-                        if resource_type:
-                            item['type'] = resource_type
-                        news_items.append(item)
-                except Exception as e:
-                    # skip malformed item
-                    print(f"解析 API 项目时出错: {e}")
-                    continue
-        except Exception:
+                    if item['datetime'] < today and len(news_items) >= PAGE_SIZE:
+                        break
+                    news_items.append(item)
+        except Exception as e:
             # API failed — fall back to scraping in-case server returns HTML for non-JS clients
-            soup = BeautifulSoup(response.text, 'html.parser')
-            # 尝试查找新闻列表
-            articles = soup.find_all('article', class_='athing')
-            if not articles:
-                # 尝试其他可能的class
-                articles = soup.find_all('div', class_='news-item')
-            if not articles:
-                articles = soup.find_all('div', attrs={'data-component': 'NewsItem'})
-            if not articles:
-                articles = soup.find_all('div', class_='c-card-item')
-
-            for article in articles:
-                try:
-                    title_element = article.find('a')
-                    if not title_element:
-                        continue
-                    title = title_element.get_text(strip=True)
-                    link = title_element.get('href')
-                    if link and not link.startswith('http'):
-                        link = 'https://wallstreetcn.com' + link
-                    time_element = article.find('time')
-                    if time_element:
-                        # try to normalize time if it contains a timestamp or full datetime
-                        datetime_str = time_element.get_text(strip=True)
-                        # If only date present, append current time (Beijing)
-                        if re.match(r'^[0-9]{4}-[0-9]{2}-[0-9]{2}$', datetime_str):
-                            datetime_str = datetime_str + ' ' + datetime.now(ZoneInfo('Asia/Shanghai')).strftime('%H:%M:%S')
-                    else:
-                        datetime_str = datetime.now(ZoneInfo('Asia/Shanghai')).strftime('%Y-%m-%d %H:%M:%S')
-                    if title and link:
-                        news_items.append({'title': title, 'datetime': datetime_str, 'link': link})
-                except Exception as e:
-                    print(f"解析新闻项目时出错: {e}")
-                    continue
+            print(f"华尔街见闻 API 请求失败，改为解析网页: {e}")
+
+            def read_page(response):
+                response.encoding = 'utf-8'
+                return response.text
+
+            page_text, _ = conditional_get(session, PAGE_URL, read_page, headers=headers, timeout=10)
+            news_items = _parse_html_page(page_text)
         
-        # 如果没有找到任何项目，提供一个基本的返回结构
+        # 没有找到任何新闻（如页面结构变化）时返回空列表，不缓存，也不返回会被入库的占位新闻
         if not news_items:
-            # 由于直接解析可能因页面结构变化而失效，这里提供一个示例结构
-            # 实际应用中需要根据实时页面结构调整选择器
-            sample_news = [
-                {
-                    'title': '示例新闻标题',
-                    'datetime': datetime.now(ZoneInfo('Asia/Shanghai')).strftime('%Y-%m-%d %H:%M:%S'),
-                    'link': 'https://wallstreetcn.com/example',
-                    'type': 'article'
-                }
-            ]
-            return sample_news
+            print("华尔街见闻: 未获取到任何新闻")
+            return []
         # cache the result for short TTL
         try:
-            _WSCN_CACHE['information_flow'] = (time.time(), news_items)
+            cache.set(CACHE_KEY, news_items)
         except Exception:
             pass
 
@@ -163,14 +229,77 @@ def get_wallstreetcn_news(use_cache: bool = True, cache_ttl: int = 60, retries:
         print(f"解析华尔街见闻新闻时出错: {e}")
         return []
 
-# 示例使用
-if __name__ == "__main__":
-    news = get_wallstreetcn_news()
-    for item in news:
-        print(f"标题: {item['title']}")
-        print(f"时间: {item['datetime']}")
-        print(f"链接: {item['link']}")
-        print("-" * 50)
+def _parse_lives_page(js):
+    """
+    解析一页快讯（lives）结果
+    返回 {'items': [(id, 新闻)], 'next_cursor': 下一页游标}，按 id 从新到旧排列
+    """
+    data = js.get('data') or {}
+    entries = []
+    for it in data.get('items') or []:
+        try:
+            live_id = int(it.get('id'))
+            title = (it.get('title') or it.get('content_text') or '').strip()
+            if not title:
+                continue
+            link = it.get('uri') or f'https://wallstreetcn.com/livenews/{live_id}'
+            if link.startswith('/'):
+                link = 'https://wallstreetcn.com' + link
+            display_time = it.get('display_time')
+            if display_time:
+                dt = datetime.fromtimestamp(int(display_time), tz=ZoneInfo('UTC'))
+                datetime_str = dt.astimezone(ZoneInfo('Asia/Shanghai')).strftime('%Y-%m-%d %H:%M:%S')
+            else:
+                datetime_str = datetime.now(ZoneInfo('Asia/Shanghai')).strftime('%Y-%m-%d %H:%M:%S')
+            entries.append((live_id, {'title': title, 'datetime': datetime_str, 'link': link,
+                                      'source': 'wallstreetcn', 'type': 'live'}))
+        except Exception as e:
+            print(f"解析快讯项目时出错: {e}")
+            continue
+    entries.sort(key=lambda entry: entry[0], reverse=True)
+    return {'items': entries, 'next_cursor': data.get('next_cursor') or None}
+
+
+def get_wallstreetcn_lives(since_id=None, limit: int = LIVES_PAGE_SIZE, max_pages: int = 5, retries: int = 3):
+    """
+    增量获取华尔街见闻快讯
+    只返回 id 大于 since_id 的快讯；第一页全部为新快讯时沿游标继续翻页，直到遇到 since_id
+    since_id 为 None 时只获取第一页。
+
+    Returns:
+        (新快讯列表（从新到旧）, 其中最大的 id；没有新快讯时为 since_id)
+    """
+    session = get_session(retries=retries, backoff_factor=0.5)
+    headers = {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+        'Accept': 'application/json',
+    }
+
+    new_items = []
+    newest_id = since_id
+    cursor = None
+    pages = max_pages if since_id is not None else 1
+    for _ in range(pages):
+        params = {'channel': 'global-channel', 'limit': limit}
+        if cursor:
+            params['cursor'] = cursor
+        result, _ = conditional_get(
+            session, LIVES_API_URL, lambda resp: _parse_lives_page(resp.json()),
+            params=params, headers=headers, timeout=10)
+
+        reached_seen = False
+        for live_id, item in result['items']:
+            if since_id is not None and live_id <= since_id:
+                reached_seen = True
+                break
+            if newest_id is None or live_id > newest_id:
+                newest_id = live_id
+            new_items.append(item)
+
+        cursor = result['next_cursor']
+        if reached_seen or not cursor or not result['items']:
+            break
+    return new_items, newest_id
 
 
 def save_links_to_file(items, filepath, date=None):
@@ -180,59 +309,59 @@ def save_links_to_file(items, filepath, date=None):
     - filepath: path to write the newline-separated links.
     - date: optional 'YYYY-MM-DD' string; if omitted, uses today's Beijing date.
 
+    Links are streamed to the file (see news_archive.write_links); for
+    multi-day or multi-source exports use news_archive.export_links.
+
     Returns the number of links written.
     """
+    from news_archive import write_links
+
     if date is None:
         date = datetime.now(ZoneInfo('Asia/Shanghai')).strftime('%Y-%m-%d')
 
-    links = []
-    for it in items:
-        dt = it.get('datetime', '')
-        link = it.get('link')
-        if not link:
-            continue
-        # Expect datetime like 'YYYY-MM-DD HH:MM:SS'
-        if isinstance(dt, str) and dt.startswith(date):
-            links.append(link)
-
-    # Deduplicate while preserving order
-    seen = set()
-    unique_links = []
-    for l in links:
-        if l in seen:
-            continue
-        seen.add(l)
-        unique_links.append(l)
-
-    # Ensure parent dir exists
-    try:
-        d = os.path.dirname(filepath)
-        if d:
-            os.makedirs(d, exist_ok=True)
-    except Exception:
-        pass
-
-    with open(filepath, 'w', encoding='utf-8') as f:
-        for l in unique_links:
-            f.write(l.rstrip('/') + '\n')
+    def links():
+        seen = set()
+        for it in items:
+            link = it.get('link')
+            dt = it.get('datetime', '')
+            # Expect datetime like 'YYYY-MM-DD HH:MM:SS'
+            if link and isinstance(dt, str) and dt.startswith(date) and link not in seen:
+                seen.add(link)
+                yield link
 
-    return len(unique_links)
+    return write_links(links(), filepath)
 
 
 def _cli_write_links():
-    """Simple CLI entrypoint to write today's links to a file.
-    Usage: python get_wallstreat_news.py --links-out PATH
+    """CLI entrypoint: fetch WallStreetCN, archive the new items and export links from the archive.
+    Usage: python get_wallstreat_news.py --links-out PATH [--since YYYY-MM-DD] [--until YYYY-MM-DD]
+                                         [--source NAME ...]
     """
     import argparse
+    from news_archive import export_links
+    from news_store import NewsStore
 
+    today = datetime.now(ZoneInfo('Asia/Shanghai')).strftime('%Y-%m-%d')
     parser = argparse.ArgumentParser(description='Fetch WallStreetCN news and optionally save links to a file')
-    parser.add_argument('--links-out', help='Write today\'s links (one per line) to this file')
+    parser.add_argument('--links-out', help='Write archived links (one per line) to this file')
+    parser.add_argument('--since', default=today, help="First day (inclusive), 'YYYY-MM-DD'; default today")
+    parser.add_argument('--until', default=None, help="Last day (inclusive), 'YYYY-MM-DD'; default same as --since")
+    parser.add_argument('--source', action='append', dest='sources',
+                        help='Only export this source (repeatable); default wallstreetcn')
+    parser.add_argument('--no-fetch', action='store_true', help='Export from the archive without fetching first')
     parser.add_argument('--no-cache', action='store_true', help='Disable cache when fetching')
     args = parser.parse_args()
 
-    items = get_wallstreetcn_news(use_cache=not args.no_cache)
+    store = NewsStore()
+    if not args.no_fetch:
+        items = get_wallstreetcn_news(use_cache=not args.no_cache)
+        for item in items:
+            item.setdefault('source', 'wallstreetcn')
+        added = store.ingest('wallstreetcn', items)
+        print(f'Archived {len(added)} new items')
     if args.links_out:
-        n = save_links_to_file(items, args.links_out)
+        n = export_links(args.links_out, args.since, args.until or args.since,
+                         args.sources or ['wallstreetcn'], store.archive)
         print(f'Wrote {n} links to {args.links_out}')
 
 
@@ -0,0 +1,181 @@
+"""
+进程级共享的 HTTP 客户端
+所有新闻源通过 get_session() 获取带连接池与重试策略的 requests.Session，
+同一进程内对同一主机的 TCP/TLS 连接会被复用（keep-alive），
+握手开销每个主机每个进程只需支付一次。
+"""
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+from urllib.parse import urlencode
+
+import requests
+from news_cache import get_cache
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
+
+# 统一的重试策略
+RETRY_STATUS_FORCELIST = (429, 500, 502, 503, 504)
+RETRY_ALLOWED_METHODS = ("HEAD", "GET", "OPTIONS")
+
+# 默认连接池大小
+DEFAULT_POOL_CONNECTIONS = 10
+DEFAULT_POOL_MAXSIZE = 10
+
+# 按主机配置的连接池大小（同一主机允许保持的最大空闲连接数）
+HOST_POOL_SIZES: Dict[str, int] = {
+    'www.reuters.com': 8,
+    'wallstreetcn.com': 4,
+    'api.wscn.net': 4,
+    'api-one.wallstcn.com': 4,
+}
+
+_sessions: Dict[Tuple[int, float], requests.Session] = {}
+_lock = threading.Lock()
+
+# 条件请求的校验信息保存在共享缓存中，键为 VALIDATOR_PREFIX + 请求地址，
+# 值为 {'etag': str, 'last_modified': str, 'parsed': 上次解析结果}
+VALIDATOR_PREFIX = 'http:validator:'
+
+
+def build_retry(retries: int = 3, backoff_factor: float = 0.5) -> Retry:
+    """构造统一的重试策略"""
+    return Retry(
+        total=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=list(RETRY_STATUS_FORCELIST),
+        allowed_methods=list(RETRY_ALLOWED_METHODS),
+    )
+
+
+def _build_session(retries: int, backoff_factor: float) -> requests.Session:
+    session = requests.Session()
+    retry_strategy = build_retry(retries, backoff_factor)
+
+    default_adapter = HTTPAdapter(
+        max_retries=retry_strategy,
+        pool_connections=DEFAULT_POOL_CONNECTIONS,
+        pool_maxsize=DEFAULT_POOL_MAXSIZE,
+    )
+    session.mount("https://", default_adapter)
+    session.mount("http://", default_adapter)
+
+    # 为已知主机挂载独立大小的连接池（requests 按最长前缀匹配适配器）
+    for host, size in HOST_POOL_SIZES.items():
+        adapter = HTTPAdapter(max_retries=retry_strategy, pool_connections=1, pool_maxsize=size)
+        session.mount(f"https://{host}", adapter)
+    return session
+
+
+def get_session(retries: int = 3, backoff_factor: float = 0.5) -> requests.Session:
+    """
+    获取进程级共享的 Session
+    相同重试参数的调用返回同一个 Session，因此连接可以跨调用复用
+
+    Args:
+        retries: 最大重试次数
+        backoff_factor: 重试退避因子
+    """
+    key = (retries, backoff_factor)
+    session = _sessions.get(key)
+    if session is not None:
+        return session
+    with _lock:
+        session = _sessions.get(key)
+        if session is None:
+            session = _build_session(retries, backoff_factor)
+            _sessions[key] = session
+        return session
+
+
+def configure_pools(host_pool_sizes: Optional[Dict[str, int]] = None,
+                    pool_connections: Optional[int] = None,
+                    pool_maxsize: Optional[int] = None) -> None:
+    """
+    调整连接池配置；已创建的 Session 会被关闭，下次 get_session() 时按新配置重建
+    """
+    global DEFAULT_POOL_CONNECTIONS, DEFAULT_POOL_MAXSIZE
+    with _lock:
+        if host_pool_sizes:
+            HOST_POOL_SIZES.update(host_pool_sizes)
+        if pool_connections is not None:
+            DEFAULT_POOL_CONNECTIONS = pool_connections
+        if pool_maxsize is not None:
+            DEFAULT_POOL_MAXSIZE = pool_maxsize
+    close_all()
+
+
+def close_all() -> None:
+    """关闭所有共享 Session 并释放连接"""
+    with _lock:
+        sessions = list(_sessions.values())
+        _sessions.clear()
+    for session in sessions:
+        try:
+            session.close()
+        except Exception:
+            pass
+
+
+def _validator_key(url: str, params: Optional[Dict[str, Any]] = None) -> str:
+    if not params:
+        return VALIDATOR_PREFIX + url
+    return VALIDATOR_PREFIX + url + '?' + urlencode(sorted(params.items()))
+
+
+def clear_validators() -> None:
+    """清空已保存的 ETag / Last-Modified 校验信息"""
+    get_cache().clear(VALIDATOR_PREFIX)
+
+
+def conditional_get(session: requests.Session, url: str, parse: Callable[[requests.Response], Any],
+                    params: Optional[Dict[str, Any]] = None,
+                    headers: Optional[Dict[str, str]] = None,
+                    timeout: float = 10) -> Tuple[Any, bool]:
+    """
+    发送条件 GET 请求（If-None-Match / If-Modified-Since）
+    服务端返回 304 时直接返回上次的解析结果，不再下载和解析页面
+
+    Args:
+        session: 用于请求的 Session
+        url: 请求地址
+        parse: 将 2xx 响应解析为结果的函数；结果会与校验信息一起保存到共享缓存，
+            因此必须可以 JSON 序列化
+        params: 查询参数
+        headers: 请求头
+        timeout: 超时（秒）
+
+    Returns:
+        (解析结果, 是否命中 304)
+    """
+    cache = get_cache()
+    key = _validator_key(url, params)
+    entry = cache.get(key)
+
+    request_headers = dict(headers or {})
+    if entry:
+        if entry.get('etag'):
+            request_headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            request_headers['If-Modified-Since'] = entry['last_modified']
+
+    response = session.get(url, params=params, headers=request_headers, timeout=timeout)
+    if response.status_code == 304:
+        if entry is not None:
+            return entry['parsed'], True
+        # 没有本地副本时不应收到 304，退回普通请求
+        response = session.get(url, params=params, headers=headers, timeout=timeout)
+
+    response.raise_for_status()
+    parsed = parse(response)
+
+    etag = response.headers.get('ETag')
+    last_modified = response.headers.get('Last-Modified')
+    if etag or last_modified:
+        try:
+            cache.set(key, {'etag': etag, 'last_modified': last_modified, 'parsed': parsed})
+        except (TypeError, ValueError):
+            # 解析结果无法序列化时不做条件请求
+            cache.delete(key)
+    else:
+        cache.delete(key)
+    return parsed, False
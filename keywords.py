@@ -0,0 +1,245 @@
+"""
+标题关键词匹配
+- VOCABULARY: 统一的财经关键词表（热度权重 + 利好/利空倾向），热度计算和标题高亮共用
+- KeywordMatcher: Aho-Corasick 多模式匹配器，单次扫描标题即可找出所有关键词（不区分大小写）
+- score / title_score: 批量计算新闻热度
+- highlight_title: 生成页面时为标题中的利好/利空词加上颜色标记，页面加载时无需再运行高亮脚本
+"""
+import html
+from collections import deque
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, NamedTuple, Optional, Tuple
+
+# 利好词显示为红色，利空词显示为绿色（A 股配色习惯）
+BULLISH = 'bull'
+BEARISH = 'bear'
+
+
+class Keyword(NamedTuple):
+    weight: int                 # 每出现一次增加的热度
+    sentiment: Optional[str]    # BULLISH / BEARISH / None（只计热度、不高亮）
+
+
+# 财经关键词表：热度权重与标题高亮的唯一来源
+VOCABULARY: Dict[str, Keyword] = {
+    # 利好
+    '暴涨': Keyword(10, BULLISH), '新高': Keyword(8, BULLISH), '大涨': Keyword(8, BULLISH),
+    '突破': Keyword(7, BULLISH), '获批': Keyword(8, BULLISH), '增长': Keyword(4, BULLISH),
+    '牛市': Keyword(8, BULLISH), '飙升': Keyword(8, BULLISH), '反弹': Keyword(6, BULLISH),
+    '创纪录': Keyword(9, BULLISH), '高歌': Keyword(0, BULLISH), '刷新': Keyword(0, BULLISH),
+    '激增': Keyword(0, BULLISH), '狂涨': Keyword(0, BULLISH), '飞升': Keyword(0, BULLISH),
+    'surge': Keyword(0, BULLISH), 'jump': Keyword(0, BULLISH), 'record': Keyword(0, BULLISH),
+    'bull': Keyword(0, BULLISH), 'gain': Keyword(0, BULLISH), 'rally': Keyword(0, BULLISH),
+    'soar': Keyword(0, BULLISH), 'boom': Keyword(0, BULLISH),
+    # 利空
+    '暴跌': Keyword(10, BEARISH), '崩盘': Keyword(9, BEARISH), '调查': Keyword(7, BEARISH),
+    '制裁': Keyword(8, BEARISH), '下跌': Keyword(5, BEARISH), '跌停': Keyword(9, BEARISH),
+    '风险': Keyword(5, BEARISH), '警告': Keyword(0, BEARISH), '衰退': Keyword(0, BEARISH),
+    '腰斩': Keyword(0, BEARISH), '暴降': Keyword(0, BEARISH), '崩溃': Keyword(0, BEARISH),
+    '亏损': Keyword(0, BEARISH),
+    'plunge': Keyword(0, BEARISH), 'crash': Keyword(0, BEARISH), 'probe': Keyword(0, BEARISH),
+    'sanction': Keyword(0, BEARISH), 'warn': Keyword(0, BEARISH), 'recession': Keyword(0, BEARISH),
+    'decline': Keyword(0, BEARISH), 'fall': Keyword(0, BEARISH), 'slump': Keyword(0, BEARISH),
+    'loss': Keyword(0, BEARISH), 'risk': Keyword(0, BEARISH),
+    # 只计热度
+    '大跌': Keyword(8, None), '熊市': Keyword(8, None), '下降': Keyword(4, None),
+    '上涨': Keyword(5, None), '涨停': Keyword(9, None), '飙低': Keyword(8, None),
+    '预期': Keyword(3, None), '预测': Keyword(3, None),
+}
+
+# 匹配结果: (起始位置, 结束位置, 关键词对应的值)
+Match = Tuple[int, int, Any]
+
+
+def _fold(text: str) -> str:
+    """转为小写，并保证每个字符位置与原文一一对应（个别字符小写后会变成多个字符，保持原样）"""
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        return lowered
+    return ''.join(c.lower() if len(c.lower()) == 1 else c for c in text)
+
+
+def _is_ascii_word_char(c: str) -> bool:
+    return c.isascii() and c.isalnum()
+
+
+class KeywordMatcher:
+    """
+    Aho-Corasick 多模式匹配（不区分大小写）
+
+    以英文字母开头的关键词只在单词开头匹配（'gain' 不会匹配 'again'），
+    但允许后面跟着词尾（'surge' 可以匹配 'surged'）。
+    """
+
+    def __init__(self, keywords: Mapping[str, Any]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # 每个状态结束的关键词: ((关键词长度, 是否要求单词开头, 值), ...)
+        self._out: List[Tuple[Tuple[int, bool, Any], ...]] = [()]
+        for word, value in keywords.items():
+            key = _fold(word)
+            if not key:
+                continue
+            state = 0
+            for c in key:
+                nxt = self._goto[state].get(c)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(())
+                    self._goto[state][c] = nxt
+                state = nxt
+            # 大小写不同的重复关键词只保留第一个
+            if not any(length == len(key) for length, _, _ in self._out[state]):
+                self._out[state] += ((len(key), _is_ascii_word_char(key[0]), value),)
+
+        # 按广度优先顺序计算失败指针，并合并后缀状态上的输出
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for c, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and c not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(c, 0)
+                self._out[nxt] += self._out[self._fail[nxt]]
+
+    def iter_matches(self, text: str) -> Iterator[Match]:
+        """单次扫描，按结束位置顺序产生所有匹配（包括相互重叠的匹配）"""
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for i, c in enumerate(_fold(text)):
+            while state and c not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(c, 0)
+            for length, word_start, value in out[state]:
+                start = i + 1 - length
+                if word_start and start > 0 and _is_ascii_word_char(text[start - 1]):
+                    continue
+                yield start, i + 1, value
+
+    def scorer(self, weight: Callable[[Any], int]) -> Callable[[str], int]:
+        """
+        编译求和函数：对文本中所有匹配（包括重叠的匹配）的 weight(值) 求和
+        每个状态上的权重预先合并好，扫描时不产生中间匹配结果
+        """
+        base = []       # 每个状态上无需检查单词开头的权重之和
+        checks = []     # 每个状态上需要检查单词开头的 (关键词长度, 权重)
+        for out in self._out:
+            base.append(sum(weight(value) for _, word_start, value in out if not word_start))
+            checks.append(tuple((length, weight(value)) for length, word_start, value in out
+                                if word_start and weight(value)))
+        goto, fail = self._goto, self._fail
+
+        if not any(checks):
+            # 常见情况：有权重的关键词都不需要检查单词开头
+            def total(text: str) -> int:
+                result = 0
+                state = 0
+                for c in _fold(text):
+                    while state and c not in goto[state]:
+                        state = fail[state]
+                    state = goto[state].get(c, 0)
+                    result += base[state]
+                return result
+            return total
+
+        def total(text: str) -> int:
+            result = 0
+            state = 0
+            for i, c in enumerate(_fold(text)):
+                while state and c not in goto[state]:
+                    state = fail[state]
+                state = goto[state].get(c, 0)
+                result += base[state]
+                if checks[state]:
+                    for length, value in checks[state]:
+                        start = i + 1 - length
+                        if not (start > 0 and _is_ascii_word_char(text[start - 1])):
+                            result += value
+            return result
+        return total
+
+    def find_spans(self, text: str, predicate=None) -> List[Match]:
+        """
+        从左到右选取互不重叠的匹配，同一位置优先选最长的关键词
+        Args:
+            predicate: 只考虑值满足该条件的关键词
+        """
+        matches = self.iter_matches(text)
+        if predicate is not None:
+            matches = (m for m in matches if predicate(m[2]))
+        matches = sorted(matches, key=lambda m: (m[0], -m[1]))
+        spans = []
+        end = 0
+        for match in matches:
+            if match[0] >= end:
+                spans.append(match)
+                end = match[1]
+        return spans
+
+
+# 由 VOCABULARY 编译出的匹配器，热度计算和高亮共用
+MATCHER = KeywordMatcher(VOCABULARY)
+
+
+def _has_sentiment(keyword: Keyword) -> bool:
+    return keyword.sentiment is not None
+
+
+def _sentiment_spans(title: str) -> List[Match]:
+    return [(start, end, keyword.sentiment)
+            for start, end, keyword in MATCHER.find_spans(title, _has_sentiment)]
+
+
+# 标题的热度：每个关键词每出现一次加上它的权重（单次扫描）
+title_score: Callable[[str], int] = MATCHER.scorer(lambda keyword: keyword.weight)
+
+
+def score(items: Iterable[Mapping[str, Any]]) -> List[int]:
+    """
+    批量计算新闻热度
+    Returns:
+        与 items 顺序一致的热度列表；同一批次中重复的标题只计算一次
+    """
+    memo: Dict[str, int] = {}
+    scores = []
+    for item in items:
+        title = item.get('title', '')
+        value = memo.get(title)
+        if value is None:
+            value = memo[title] = title_score(title)
+        scores.append(value)
+    return scores
+
+
+def highlight_title(title: str) -> str:
+    """转义标题并把利好/利空词包在 <span class='kw-bull|kw-bear'> 中"""
+    spans = _sentiment_spans(title)
+    if not spans:
+        return html.escape(title)
+    parts = []
+    pos = 0
+    for start, end, kind in spans:
+        parts.append(html.escape(title[pos:start]))
+        parts.append(f"<span class='kw-{kind}'>{html.escape(title[start:end])}</span>")
+        pos = end
+    parts.append(html.escape(title[pos:]))
+    return ''.join(parts)
+
+
+def sentiment_marks(title: str) -> List:
+    """
+    标题中利好/利空词的位置，供页面脚本渲染分片中的新闻
+    Returns:
+        扁平列表 [起始, 结束, 类型, ...]，位置按 UTF-16 码元计（与 JavaScript 字符串下标一致）
+    """
+    astral = any(ord(c) > 0xFFFF for c in title)
+    marks = []
+    for start, end, kind in _sentiment_spans(title):
+        if astral:
+            start, end = (len(title[:start].encode('utf-16-le')) // 2,
+                          len(title[:end].encode('utf-16-le')) // 2)
+        marks.extend((start, end, kind))
+    return marks
@@ -1,22 +1,33 @@
 """
 统一的新闻源接口
 支持从多个新闻源获取新闻，返回统一的数据格式
+新闻源通过 source_registry 按名称注册；各来源的抓取模块（requests、bs4 等依赖）在第一次获取时才导入
 """
-from typing import List, Dict, Any, Optional
-from get_wallstreat_news import get_wallstreetcn_news
-from get_reuters_news import get_reuters_news
-from datetime import datetime
-from zoneinfo import ZoneInfo
+from typing import List, Dict, Any, Optional, Tuple
+from concurrent.futures import Future, wait, FIRST_COMPLETED
+import heapq
+import threading
+import time
+from dedup import Deduplicator
+from news_cache import get_cache
+from news_item import NewsItem, by_sort_key, to_items
+from news_time import normalize
+from source_registry import available_sources, create_source
 
 
 class NewsSource:
     """新闻源的基类"""
+    # 为 True 时 fetch 接受 seen_filter 参数（seen_filter.SeenFilter），从结果中去掉已入库的链接；
+    # 过滤器只在入库时按调用传入，不保存在来源上
+    supports_seen_filter = False
     
     @staticmethod
     def fetch(use_cache: bool = True, cache_ttl: int = 60) -> List[Dict[str, Any]]:
         """
         获取新闻
-        返回格式: [{'title': str, 'datetime': str, 'link': str, 'source': str, 'type': str}]
+        返回格式: [NewsItem]，也可以返回字典
+        [{'title': str, 'datetime': str, 'link': str, 'source': str, 'type': str}]，聚合器会转换为 NewsItem；
+        按时间倒序返回时合并最快
         """
         raise NotImplementedError
 
@@ -25,93 +36,303 @@ class WallStreetCNSource(NewsSource):
     """华尔街见闻新闻源"""
     
     @staticmethod
-    def fetch(use_cache: bool = True, cache_ttl: int = 60) -> List[Dict[str, Any]]:
-        items = get_wallstreetcn_news(use_cache=use_cache, cache_ttl=cache_ttl)
-        # 确保所有项都有 source 字段
-        for item in items:
-            if 'source' not in item:
-                item['source'] = 'wallstreetcn'
-        return items
+    def fetch(use_cache: bool = True, cache_ttl: int = 60) -> List[NewsItem]:
+        from get_wallstreat_news import get_wallstreetcn_news
+        # 缺少 source 字段的新闻记为 wallstreetcn
+        return to_items(get_wallstreetcn_news(use_cache=use_cache, cache_ttl=cache_ttl), 'wallstreetcn')
+
+
+class WallStreetCNLiveSource(NewsSource):
+    """
+    华尔街见闻快讯源
+    每次轮询只获取上次见到的最大 id 之后的新快讯，并插入到已有列表前面，
+    无需整体重新获取和排序。轮询状态保存在共享缓存中，进程重启后可继续增量获取。
+    """
+    CACHE_KEY = 'wallstreetcn:lives'
+
+    def __init__(self, max_items: int = 200):
+        self.max_items = max_items
+        self._lock = threading.Lock()
+        self._items: List[Dict[str, Any]] = []
+        self._last_id: Optional[int] = None
+        self._polled_at = 0.0
+        self._loaded = False
+
+    def _load_state(self):
+        state = get_cache().get(self.CACHE_KEY)
+        if state:
+            self._items = state.get('items', [])
+            self._last_id = state.get('last_id')
+            self._polled_at = state.get('polled_at', 0.0)
+        self._loaded = True
+
+    def fetch(self, use_cache: bool = True, cache_ttl: int = 60) -> List[NewsItem]:
+        with self._lock:
+            if not self._loaded:
+                self._load_state()
+            if not (use_cache and time.time() - self._polled_at < cache_ttl):
+                from get_wallstreat_news import get_wallstreetcn_lives
+                new_items, self._last_id = get_wallstreetcn_lives(since_id=self._last_id)
+                self._polled_at = time.time()
+                if new_items:
+                    self._items = (new_items + self._items)[:self.max_items]
+                get_cache().set(self.CACHE_KEY, {'items': self._items, 'last_id': self._last_id,
+                                                 'polled_at': self._polled_at})
+            # 缓存中保存的是可 JSON 序列化的字典；每次返回新的 NewsItem，调用方（如渲染）可以自由修改
+            return [NewsItem.from_dict(item, 'wallstreetcn') for item in self._items]
 
 
 class ReutersSource(NewsSource):
-    """路透社新闻源"""
-    
-    @staticmethod
-    def fetch(use_cache: bool = True, cache_ttl: int = 60) -> List[Dict[str, Any]]:
-        return get_reuters_news(use_cache=use_cache, cache_ttl=cache_ttl)
+    """路透社新闻源（栏目页会反复列出同一批文章，传入 seen_filter 时跳过已入库的链接）"""
+    supports_seen_filter = True
+
+    def fetch(self, use_cache: bool = True, cache_ttl: int = 60, seen_filter=None) -> List[NewsItem]:
+        from get_reuters_news import get_reuters_news
+        return to_items(get_reuters_news(use_cache=use_cache, cache_ttl=cache_ttl,
+                                         seen_filter=seen_filter), 'reuters')
 
 
 class NewsAggregator:
     """新闻聚合器 - 从多个来源获取新闻"""
     
-    def __init__(self, sources: Optional[List[NewsSource]] = None):
+    def __init__(self, sources: Optional[List[NewsSource]] = None, dedup: bool = True):
         """
         初始化聚合器
         Args:
-            sources: 新闻源列表，默认使用所有可用来源
+            sources: 新闻源列表，默认使用 source_registry 中注册的所有来源
+            dedup: 是否去掉跨来源的重复新闻（规范化后链接相同或标题近似，见 dedup.py）
         """
         if sources is None:
-            # 默认使用所有来源
-            self.sources = {
-                'wallstreetcn': WallStreetCNSource(),
-                'reuters': ReutersSource(),
-            }
+            # 默认使用所有已注册的来源；创建实例很轻量，抓取模块在第一次获取时才导入
+            self.sources = {name: create_source(name) for name in available_sources()}
         else:
             self.sources = {source.__class__.__name__.lower(): source for source in sources}
+        self.dedup = dedup
+        # 最近一次 fetch_all 的各来源状态
+        self.last_status: Dict[str, Dict[str, Any]] = {}
     
-    def fetch_all(self, use_cache: bool = True, cache_ttl: int = 60) -> List[Dict[str, Any]]:
+    def fetch_all(self, use_cache: bool = True, cache_ttl: int = 60,
+                  concurrent: bool = False, source_timeout: Optional[float] = None,
+                  deadline: Optional[float] = None) -> List[NewsItem]:
         """
         从所有来源获取新闻，合并后按时间倒序排列
         
         Args:
             use_cache: 是否使用缓存
             cache_ttl: 缓存有效期（秒）
+            concurrent: 是否并发获取各来源（线程池）
+            source_timeout: 并发模式下单个来源的超时（秒），None 表示不限制
+            deadline: 并发模式下整体截止时间（秒），None 表示不限制
         
         Returns:
-            按时间倒序排列的新闻列表
+            按时间倒序排列的新闻列表；各来源的获取状态见 self.last_status
         """
-        import sys
-        all_items = []
+        items, _ = self.fetch_all_with_status(
+            use_cache=use_cache,
+            cache_ttl=cache_ttl,
+            concurrent=concurrent,
+            source_timeout=source_timeout,
+            deadline=deadline,
+        )
+        return items
+
+    def fetch_all_with_status(self, use_cache: bool = True, cache_ttl: int = 60,
+                              concurrent: bool = False, source_timeout: Optional[float] = None,
+                              deadline: Optional[float] = None) -> Tuple[List[NewsItem], Dict[str, Dict[str, Any]]]:
+        """
+        从所有来源获取新闻，同时返回每个来源的状态
         
-        for source_name, source in self.sources.items():
-            try:
-                print(f"[聚合] 正在从 {source_name} 获取新闻...", file=sys.stderr)
-                items = source.fetch(use_cache=use_cache, cache_ttl=cache_ttl)
-                print(f"[聚合] {source_name}: 成功获取 {len(items)} 条新闻", file=sys.stderr)
-                all_items.extend(items)
-            except Exception as e:
-                print(f"[聚合] 从 {source_name} 获取新闻时出错: {type(e).__name__}: {e}", file=sys.stderr)
+        Returns:
+            (按时间倒序排列的新闻列表, {来源名: {'status': 'ok'|'error'|'timeout', 'count': int,
+             'elapsed': float, 'error': str|None}})
+        """
+        import sys
+        if concurrent:
+            results = self._fetch_concurrent(use_cache, cache_ttl, source_timeout, deadline)
+        else:
+            results = self._fetch_sequential(use_cache, cache_ttl)
+
+        status = {}
+        for source_name, (items, info) in results.items():
+            status[source_name] = info
+        self.last_status = status
+
+        # 各来源已按 ts 倒序排列，k 路归并即可得到整体的时间倒序（最新的在前），
+        # 同一时间的新闻按来源顺序排列
+        all_items = list(heapq.merge(*(items for items, _ in results.values()), key=by_sort_key))
         
         print(f"[聚合] 合计获取 {len(all_items)} 条新闻", file=sys.stderr)
+        if self.dedup:
+            count = len(all_items)
+            all_items = Deduplicator().filter(all_items)
+            print(f"[聚合] 去重后 {len(all_items)} 条（去掉 {count - len(all_items)} 条重复）", file=sys.stderr)
+        
+        return all_items, status
+
+    def ingest(self, store, use_cache: bool = True, cache_ttl: int = 60,
+               concurrent: bool = False, source_timeout: Optional[float] = None,
+               deadline: Optional[float] = None) -> List[NewsItem]:
+        """
+        从所有来源获取新闻，并按来源把水位线之后的新增部分写入 store
+        
+        Args:
+            store: news_store.NewsStore 实例
+            其余参数同 fetch_all
         
-        # 按时间倒序排列（最新的在前）
+        Returns:
+            本次新增的新闻；各来源的获取状态见 self.last_status
+        """
+        import sys
+        # 支持的来源跳过已入库的链接；过滤器只用于本次调用，不影响之后的 fetch_all
+        if concurrent:
+            results = self._fetch_concurrent(use_cache, cache_ttl, source_timeout, deadline, store.seen)
+        else:
+            results = self._fetch_sequential(use_cache, cache_ttl, store.seen)
+
+        if self.dedup:
+            results = self._dedup_results(results)
+
+        new_items = []
+        status = {}
+        for source_name, (items, info) in results.items():
+            added = store.ingest(source_name, items)
+            info['new'] = len(added)
+            status[source_name] = info
+            new_items.extend(added)
+            print(f"[入库] {source_name}: 新增 {len(added)} 条", file=sys.stderr)
+        self.last_status = status
+        return new_items
+
+    def _dedup_results(self, results):
+        """
+        按时间倒序合并所有来源后去重（保留最新的一条），再按来源拆分回去
+        """
+        import sys
+        owner = {id(item): source_name for source_name, (items, _) in results.items() for item in items}
+        merged = heapq.merge(*(items for items, _ in results.values()), key=by_sort_key)
+        kept = {source_name: [] for source_name in results}
+        removed = 0
+        deduplicator = Deduplicator()
+        for item in merged:
+            if deduplicator.is_duplicate(item):
+                removed += 1
+            else:
+                kept[owner[id(item)]].append(item)
+        if removed:
+            print(f"[聚合] 去掉 {removed} 条重复新闻", file=sys.stderr)
+        return {source_name: (kept[source_name], info) for source_name, (_, info) in results.items()}
+
+    @staticmethod
+    def _call_fetch(source: NewsSource, use_cache: bool, cache_ttl: int, seen_filter=None):
+        """调用 source.fetch；只有支持的来源才传入 seen_filter"""
+        if seen_filter is not None and source.supports_seen_filter:
+            return source.fetch(use_cache=use_cache, cache_ttl=cache_ttl, seen_filter=seen_filter)
+        return source.fetch(use_cache=use_cache, cache_ttl=cache_ttl)
+
+    def _fetch_one(self, source_name: str, source: NewsSource, use_cache: bool, cache_ttl: int,
+                   seen_filter=None):
+        """获取单个来源，返回 (新闻列表, 状态信息)，不抛出异常"""
+        import sys
+        start = time.monotonic()
         try:
-            all_items.sort(
-                key=lambda x: datetime.strptime(x.get('datetime', '1970-01-01 00:00:00'), '%Y-%m-%d %H:%M:%S'),
-                reverse=True
-            )
+            print(f"[聚合] 正在从 {source_name} 获取新闻...", file=sys.stderr)
+            items = normalize(to_items(self._call_fetch(source, use_cache, cache_ttl, seen_filter)))
+            print(f"[聚合] {source_name}: 成功获取 {len(items)} 条新闻", file=sys.stderr)
+            return items, {'status': 'ok', 'count': len(items),
+                           'elapsed': time.monotonic() - start, 'error': None}
         except Exception as e:
-            print(f"[聚合] 排序新闻时出错: {e}", file=sys.stderr)
-        
-        return all_items
-    
-    def fetch_by_source(self, source_name: str, use_cache: bool = True, cache_ttl: int = 60) -> List[Dict[str, Any]]:
+            print(f"[聚合] 从 {source_name} 获取新闻时出错: {type(e).__name__}: {e}", file=sys.stderr)
+            return [], {'status': 'error', 'count': 0,
+                        'elapsed': time.monotonic() - start, 'error': f"{type(e).__name__}: {e}"}
+
+    def _fetch_sequential(self, use_cache: bool, cache_ttl: int, seen_filter=None):
+        """依次获取各来源（原有行为）"""
+        return {
+            source_name: self._fetch_one(source_name, source, use_cache, cache_ttl, seen_filter)
+            for source_name, source in self.sources.items()
+        }
+
+    def _run_source(self, future: Future, started: Dict[str, float], source_name: str, source: NewsSource,
+                    use_cache: bool, cache_ttl: int, seen_filter=None) -> None:
+        """在工作线程中获取单个来源，记录开始时间并把结果写入 future"""
+        started[source_name] = time.monotonic()
+        try:
+            future.set_result(self._fetch_one(source_name, source, use_cache, cache_ttl, seen_filter))
+        except BaseException as e:
+            future.set_exception(e)
+
+    def _fetch_concurrent(self, use_cache: bool, cache_ttl: int,
+                          source_timeout: Optional[float], deadline: Optional[float], seen_filter=None):
+        """
+        每个来源在单独的守护线程中并发获取
+        单源超时从该来源实际开始获取时计时，整体截止时间从调用时计时；
+        超过任一限制仍未完成的来源标记为 timeout，其结果被丢弃。
+        工作线程无法被强制终止，因此使用守护线程：被放弃的线程不会阻塞调用方，也不会阻止解释器退出。
+        """
+        import sys
+        start = time.monotonic()
+        stop_at = start + deadline if deadline is not None else None
+
+        started: Dict[str, float] = {}
+        futures = {}
+        for source_name, source in self.sources.items():
+            future = Future()
+            futures[future] = source_name
+            threading.Thread(target=self._run_source, name=f'news-source-{source_name}', daemon=True,
+                             args=(future, started, source_name, source, use_cache, cache_ttl, seen_filter)).start()
+
+        results = {}
+        pending = set(futures)
+        while pending:
+            now = time.monotonic()
+            # 每个未完成来源的截止时间：开始时间 + 单源超时，不晚于整体截止时间；尚未开始的来源只受整体截止时间限制
+            limits = {}
+            for future in pending:
+                limit = stop_at
+                if source_timeout is not None and futures[future] in started:
+                    own = started[futures[future]] + source_timeout
+                    limit = own if limit is None else min(limit, own)
+                limits[future] = limit
+            expired = {future for future, limit in limits.items() if limit is not None and limit <= now}
+            if expired:
+                pending -= expired
+                for future in expired:
+                    source_name = futures[future]
+                    elapsed = now - started.get(source_name, start)
+                    print(f"[聚合] {source_name}: 超时 ({elapsed:.1f}s)，已跳过", file=sys.stderr)
+                    results[source_name] = ([], {'status': 'timeout', 'count': 0,
+                                                 'elapsed': elapsed, 'error': 'timeout'})
+                continue
+            timeouts = [limit - now for limit in limits.values() if limit is not None]
+            if source_timeout is not None and len(started) < len(futures):
+                # 还有来源未开始：稍后重新计算，以便从其开始时间计时
+                timeouts.append(0.01)
+            done, pending = wait(pending, timeout=min(timeouts) if timeouts else None,
+                                 return_when=FIRST_COMPLETED)
+            for future in done:
+                results[futures[future]] = future.result()
+
+        # 保持与 self.sources 相同的顺序
+        return {name: results[name] for name in self.sources}
+
+    def fetch_by_source(self, source_name: str, use_cache: bool = True, cache_ttl: int = 60,
+                        seen_filter=None) -> List[NewsItem]:
         """
         从指定来源获取新闻
         
         Args:
-            source_name: 来源名称 ('wallstreetcn', 'reuters' 等)
+            source_name: 来源名称 ('wallstreetcn', 'wallstreetcn_live', 'reuters' 等)
             use_cache: 是否使用缓存
             cache_ttl: 缓存有效期（秒）
+            seen_filter: 已入库链接的过滤器，只对本次调用生效（来源不支持时忽略）
         
         Returns:
-            新闻列表
+            按时间倒序排列的新闻列表（已补充 'ts'）
         """
         if source_name not in self.sources:
             raise ValueError(f"未知的新闻源: {source_name}")
         
-        return self.sources[source_name].fetch(use_cache=use_cache, cache_ttl=cache_ttl)
+        return normalize(to_items(self._call_fetch(self.sources[source_name], use_cache, cache_ttl, seen_filter)))
 
 
 # 全局聚合器实例
@@ -126,14 +347,17 @@ def get_aggregator() -> NewsAggregator:
     return _global_aggregator
 
 
-def fetch_all_news(use_cache: bool = True, cache_ttl: int = 60) -> List[Dict[str, Any]]:
+def fetch_all_news(use_cache: bool = True, cache_ttl: int = 60, concurrent: bool = False,
+                   source_timeout: Optional[float] = None,
+                   deadline: Optional[float] = None) -> List[NewsItem]:
     """
     便利函数 - 从所有来源获取新闻
     """
-    return get_aggregator().fetch_all(use_cache=use_cache, cache_ttl=cache_ttl)
+    return get_aggregator().fetch_all(use_cache=use_cache, cache_ttl=cache_ttl, concurrent=concurrent,
+                                      source_timeout=source_timeout, deadline=deadline)
 
 
-def fetch_news_by_source(source: str, use_cache: bool = True, cache_ttl: int = 60) -> List[Dict[str, Any]]:
+def fetch_news_by_source(source: str, use_cache: bool = True, cache_ttl: int = 60) -> List[NewsItem]:
     """
     便利函数 - 从指定来源获取新闻
     """
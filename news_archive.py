@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+历史新闻归档
+按日期（北京时间，由 ts 换算）分区保存所有入库的新闻，用于跨多天、多来源的查询和导出：
+- YYYY-MM-DD.dat: 由多个独立压缩（zlib）的数据块组成，每个块是同一来源同一批次的新闻（JSON Lines，按时间从旧到新）
+- YYYY-MM-DD.idx: 定长索引记录，每个数据块一条: (最早 ts, 最晚 ts, 条数, 来源, 块偏移, 块长度)
+
+查询时只打开日期范围内的分区，通过 mmap 扫描索引，只读取时间范围和来源都匹配的数据块。
+写入时先追加并落盘数据块，再追加索引记录；中途退出最多留下没有索引的数据，不影响读取。
+
+用法: python news_archive.py --since 2026-10-01 --until 2026-10-15 --source reuters --links-out links.txt
+"""
+import argparse
+import json
+import mmap
+import os
+import struct
+import sys
+import threading
+import zlib
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, TextIO, Tuple
+from zoneinfo import ZoneInfo
+
+from news_item import NewsItem
+from news_time import TZ, UNKNOWN_TS, to_ts
+
+DEFAULT_ARCHIVE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'news', 'archive')
+DATA_SUFFIX = '.dat'
+INDEX_SUFFIX = '.idx'
+# 索引记录: ts_min, ts_max (int64), 条数 (uint32), 来源 (32 字节，UTF-8，不足补 0), 偏移 (uint64), 长度 (uint32)
+INDEX_RECORD = struct.Struct('<qqI32sQI')
+SOURCE_BYTES = 32
+DAY_SECONDS = 24 * 3600
+
+
+def _day(ts: int) -> str:
+    """ts 所在的北京时间日期；时间未知时为 'unknown'"""
+    if ts == UNKNOWN_TS:
+        return 'unknown'
+    return datetime.fromtimestamp(ts, TZ).strftime('%Y-%m-%d')
+
+
+def _encode_source(source: str) -> bytes:
+    data = source.encode('utf-8')
+    if len(data) > SOURCE_BYTES:
+        raise ValueError(f"来源名称过长（最多 {SOURCE_BYTES} 字节）: {source}")
+    return data
+
+
+def time_range(since: Optional[str], until: Optional[str]) -> Tuple[Optional[int], Optional[int]]:
+    """
+    把起止时间（含）转换为 epoch 秒，None 表示不限制
+    'YYYY-MM-DD' 或 'YYYY-MM-DD HH:MM:SS'；until 只给出日期时包含当天全天
+    """
+    start = to_ts(since) if since else None
+    end = None
+    if until:
+        end = to_ts(until)
+        if len(until.strip()) == 10:
+            end += DAY_SECONDS - 1
+    return start, end
+
+
+class NewsArchive:
+    """按日期分区、块压缩、带 mmap 索引的只追加归档"""
+
+    def __init__(self, root: str = DEFAULT_ARCHIVE_DIR, level: int = 6):
+        self.root = root
+        self.level = level
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+
+    # -- 写入 ------------------------------------------------------------
+    def append(self, source_name: str, items: Iterable[Any]) -> int:
+        """
+        追加某个来源的一批新闻（不去重，去重由 NewsStore 的水位线负责）
+        Returns:
+            写入的条数
+        """
+        source = _encode_source(source_name)
+        partitions: Dict[str, List[Dict[str, Any]]] = {}
+        for item in items:
+            record = item.to_dict() if isinstance(item, NewsItem) else dict(item)
+            record.setdefault('source', source_name)
+            if record.get('ts') is None:
+                record['ts'] = to_ts(record.get('datetime', ''))
+            partitions.setdefault(_day(record['ts']), []).append(record)
+
+        count = 0
+        with self._lock:
+            for day, records in partitions.items():
+                records.sort(key=lambda r: r['ts'])
+                block = zlib.compress(''.join(json.dumps(r, ensure_ascii=False) + '\n' for r in records)
+                                      .encode('utf-8'), self.level)
+                data_path = os.path.join(self.root, day + DATA_SUFFIX)
+                with open(data_path, 'ab') as f:
+                    offset = f.tell()
+                    f.write(block)
+                    f.flush()
+                    os.fsync(f.fileno())
+                index_path = os.path.join(self.root, day + INDEX_SUFFIX)
+                with open(index_path, 'ab') as f:
+                    # 先截掉中途退出时写了一半的记录，保证新记录落在记录边界上
+                    size = f.tell()
+                    if size % INDEX_RECORD.size:
+                        f.truncate(size - size % INDEX_RECORD.size)
+                        f.seek(0, os.SEEK_END)
+                    f.write(INDEX_RECORD.pack(records[0]['ts'], records[-1]['ts'], len(records),
+                                              source, offset, len(block)))
+                    f.flush()
+                    os.fsync(f.fileno())
+                count += len(records)
+        return count
+
+    # -- 读取 ------------------------------------------------------------
+    def days(self) -> List[str]:
+        """已有的分区日期，从旧到新"""
+        return sorted(name[:-len(INDEX_SUFFIX)] for name in os.listdir(self.root) if name.endswith(INDEX_SUFFIX))
+
+    def _blocks(self, day: str, start_ts: Optional[int], end_ts: Optional[int],
+                sources: Optional[frozenset]) -> List[tuple]:
+        """在分区索引中找出时间范围和来源都匹配的数据块 [(偏移, 长度)]"""
+        path = os.path.join(self.root, day + INDEX_SUFFIX)
+        size = os.path.getsize(path)
+        # 忽略中途退出时写了一半的记录
+        size -= size % INDEX_RECORD.size
+        if not size:
+            return []
+        blocks = []
+        with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as index:
+            for ts_min, ts_max, _, source, offset, length in INDEX_RECORD.iter_unpack(
+                    memoryview(index)[:size]):
+                if start_ts is not None and ts_max < start_ts:
+                    continue
+                if end_ts is not None and ts_min > end_ts:
+                    continue
+                if sources is not None and source.rstrip(b'\x00') not in sources:
+                    continue
+                blocks.append((offset, length))
+        return blocks
+
+    def query(self, since: Optional[str] = None, until: Optional[str] = None,
+              sources: Optional[Sequence[str]] = None) -> Iterator[Dict[str, Any]]:
+        """
+        逐条读取时间范围内的新闻
+        Args:
+            since / until: 起止时间（含），'YYYY-MM-DD' 或 'YYYY-MM-DD HH:MM:SS'；只给日期时 until 包含当天全天
+            sources: 只读取这些来源，None 表示全部
+        Returns:
+            新闻字典的迭代器：分区从旧到新，同一分区内按写入批次，批次内从旧到新
+        """
+        start_ts, end_ts = time_range(since, until)
+        wanted = None if sources is None else frozenset(_encode_source(s) for s in sources)
+        for day in self.days():
+            if since is not None and day != 'unknown' and day < since[:10]:
+                continue
+            if until is not None and (day == 'unknown' or day > until[:10]):
+                continue
+            blocks = self._blocks(day, start_ts, end_ts, wanted)
+            if not blocks:
+                continue
+            with open(os.path.join(self.root, day + DATA_SUFFIX), 'rb') as f:
+                for offset, length in blocks:
+                    f.seek(offset)
+                    for line in zlib.decompress(f.read(length)).decode('utf-8').splitlines():
+                        record = json.loads(line)
+                        ts = record.get('ts', 0)
+                        if (start_ts is None or ts >= start_ts) and (end_ts is None or ts <= end_ts):
+                            yield record
+
+    def links(self, since: Optional[str] = None, until: Optional[str] = None,
+              sources: Optional[Sequence[str]] = None) -> Iterator[str]:
+        """时间范围内不重复的链接，顺序同 query"""
+        seen = set()
+        for record in self.query(since, until, sources):
+            link = record.get('link')
+            if link and link not in seen:
+                seen.add(link)
+                yield link
+
+
+def write_link_lines(links: Iterable[str], out: TextIO) -> int:
+    """
+    逐条把链接写入 out（每行一个，去掉结尾的 '/'，空链接跳过，重复的只写一次），不在内存中收集完整列表
+    Returns:
+        写入的条数
+    """
+    seen = set()
+    count = 0
+    for link in links:
+        link = link.rstrip('/') if link else ''
+        if link and link not in seen:
+            seen.add(link)
+            out.write(link + '\n')
+            count += 1
+    return count
+
+
+def write_links(links: Iterable[str], filepath: str) -> int:
+    """把链接写入文件（格式见 write_link_lines），返回写入的条数"""
+    directory = os.path.dirname(filepath)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(filepath, 'w', encoding='utf-8') as f:
+        return write_link_lines(links, f)
+
+
+def export_links(filepath: str, since: Optional[str] = None, until: Optional[str] = None,
+                 sources: Optional[Sequence[str]] = None, archive: Optional[NewsArchive] = None) -> int:
+    """把归档中时间范围内的链接导出到文件，返回条数"""
+    archive = archive or NewsArchive()
+    return write_links(archive.links(since, until, sources), filepath)
+
+
+def main():
+    today = datetime.now(ZoneInfo('Asia/Shanghai')).strftime('%Y-%m-%d')
+    parser = argparse.ArgumentParser(description='Query the news archive and export links')
+    parser.add_argument('--archive', default=DEFAULT_ARCHIVE_DIR, help='Archive directory')
+    parser.add_argument('--since', default=today, help="First day (inclusive), 'YYYY-MM-DD'; default today")
+    parser.add_argument('--until', default=None, help="Last day (inclusive), 'YYYY-MM-DD'; default same as --since")
+    parser.add_argument('--source', action='append', dest='sources',
+                        help='Only export this source (repeatable); default all sources')
+    parser.add_argument('--links-out', required=True, help='Write links (one per line) to this file')
+    args = parser.parse_args()
+
+    until = args.until or args.since
+    n = export_links(args.links_out, args.since, until, args.sources, NewsArchive(args.archive))
+    print(f'Wrote {n} links to {args.links_out}', file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,202 @@
+"""
+可插拔的缓存后端
+所有新闻源共享同一个缓存实例（get_cache()），支持：
+- TTL：写入时可指定过期时间，读取时可指定可接受的最大缓存年龄
+- 容量上限：超过 max_entries 时按最近最少使用（LRU）淘汰
+- 原子写入：SQLite 后端的每次写入（含淘汰）在单个事务内完成
+
+默认使用项目目录下 .cache/news_cache.sqlite3，进程重启后仍可复用上次的结果；
+可通过环境变量 DAILY_NEWS_CACHE 指定其他路径，设为 ':memory:' 则只使用进程内缓存。
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'news_cache.sqlite3')
+DEFAULT_MAX_ENTRIES = 1024
+# 条目的默认硬过期时间（秒）；过期条目即使作为备用数据也不再返回
+DEFAULT_TTL = 7 * 24 * 3600
+
+
+class CacheBackend:
+    """缓存后端的基类"""
+
+    def get(self, key: str, max_age: Optional[float] = None) -> Optional[Any]:
+        """
+        读取缓存
+        Args:
+            key: 缓存键
+            max_age: 可接受的最大缓存年龄（秒），None 表示只要未过期即可
+        Returns:
+            缓存的值，不存在或已过期时返回 None
+        """
+        raise NotImplementedError
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = DEFAULT_TTL) -> None:
+        """写入缓存，ttl 为 None 表示永不过期"""
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    def clear(self, prefix: str = '') -> None:
+        """删除所有以 prefix 开头的键"""
+        raise NotImplementedError
+
+
+class MemoryCache(CacheBackend):
+    """进程内 LRU 缓存"""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._data = OrderedDict()  # key -> (stored_at, expires_at, value)
+        self._lock = threading.Lock()
+
+    def get(self, key, max_age=None):
+        now = time.time()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            stored_at, expires_at, value = entry
+            if expires_at is not None and expires_at <= now:
+                del self._data[key]
+                return None
+            if max_age is not None and now - stored_at >= max_age:
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=DEFAULT_TTL):
+        now = time.time()
+        expires_at = now + ttl if ttl is not None else None
+        with self._lock:
+            self._data[key] = (now, expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self, prefix=''):
+        with self._lock:
+            for key in [k for k in self._data if k.startswith(prefix)]:
+                del self._data[key]
+
+
+class SQLiteCache(CacheBackend):
+    """
+    基于 SQLite 的持久化缓存
+    值以 JSON 形式保存；所有写操作在单个事务中完成，进程中途退出不会留下半写入的数据
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        d = os.path.dirname(path)
+        if d:
+            os.makedirs(d, exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS cache ('
+            ' key TEXT PRIMARY KEY,'
+            ' value TEXT NOT NULL,'
+            ' stored_at REAL NOT NULL,'
+            ' expires_at REAL,'
+            ' accessed_at REAL NOT NULL)'
+        )
+        self._conn.execute('CREATE INDEX IF NOT EXISTS cache_accessed_at ON cache (accessed_at)')
+
+    def get(self, key, max_age=None):
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT value, stored_at, expires_at FROM cache WHERE key = ?', (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, stored_at, expires_at = row
+            if expires_at is not None and expires_at <= now:
+                self._conn.execute('DELETE FROM cache WHERE key = ?', (key,))
+                return None
+            if max_age is not None and now - stored_at >= max_age:
+                return None
+            self._conn.execute('UPDATE cache SET accessed_at = ? WHERE key = ?', (now, key))
+        return json.loads(value)
+
+    def set(self, key, value, ttl=DEFAULT_TTL):
+        now = time.time()
+        expires_at = now + ttl if ttl is not None else None
+        payload = json.dumps(value, ensure_ascii=False)
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                self._conn.execute(
+                    'INSERT OR REPLACE INTO cache (key, value, stored_at, expires_at, accessed_at)'
+                    ' VALUES (?, ?, ?, ?, ?)',
+                    (key, payload, now, expires_at, now),
+                )
+                self._conn.execute('DELETE FROM cache WHERE expires_at IS NOT NULL AND expires_at <= ?', (now,))
+                self._conn.execute(
+                    'DELETE FROM cache WHERE key IN ('
+                    ' SELECT key FROM cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)',
+                    (self.max_entries,),
+                )
+                self._conn.execute('COMMIT')
+            except Exception:
+                self._conn.execute('ROLLBACK')
+                raise
+
+    def delete(self, key):
+        with self._lock:
+            self._conn.execute('DELETE FROM cache WHERE key = ?', (key,))
+
+    def clear(self, prefix=''):
+        escaped = prefix.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        with self._lock:
+            self._conn.execute("DELETE FROM cache WHERE key LIKE ? ESCAPE '\\'", (escaped + '%',))
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+# 全局缓存实例
+_global_cache = None
+_global_cache_lock = threading.Lock()
+
+
+def get_cache() -> CacheBackend:
+    """获取全局缓存实例；SQLite 不可用（如只读目录）时退回进程内缓存"""
+    global _global_cache
+    if _global_cache is not None:
+        return _global_cache
+    with _global_cache_lock:
+        if _global_cache is None:
+            path = os.environ.get('DAILY_NEWS_CACHE', DEFAULT_CACHE_PATH)
+            if path == ':memory:':
+                _global_cache = MemoryCache()
+            else:
+                try:
+                    _global_cache = SQLiteCache(path)
+                except (sqlite3.Error, OSError) as e:
+                    import sys
+                    print(f"[缓存] 无法打开 {path}，改用内存缓存: {e}", file=sys.stderr)
+                    _global_cache = MemoryCache()
+        return _global_cache
+
+
+def set_cache(backend: CacheBackend) -> None:
+    """替换全局缓存实例（用于自定义后端或测试）"""
+    global _global_cache
+    with _global_cache_lock:
+        _global_cache = backend
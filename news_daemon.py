@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+常驻轮询模式
+每个来源按各自的间隔轮询，并根据实际发布频率自适应调整：
+有新内容时缩短间隔，连续没有新内容时逐步拉长。
+只有展示的新闻集合真正发生变化时才重新渲染并写入 docs/index.html。
+
+用法: python news_daemon.py [--output docs/index.html] [--min-interval 30] [--max-interval 1800]
+"""
+import argparse
+import hashlib
+import heapq
+import os
+import signal
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+from dedup import dedup
+from news_aggregator import NewsAggregator, get_aggregator
+from news_store import NewsStore
+
+# 各来源的初始轮询间隔（秒）
+DEFAULT_INTERVALS = {
+    'wallstreetcn_live': 60,
+    'wallstreetcn': 300,
+    'reuters': 600,
+}
+DEFAULT_INTERVAL = 300
+MIN_INTERVAL = 30
+MAX_INTERVAL = 1800
+# 有新内容 / 没有新内容时间隔的缩放系数
+SPEEDUP = 0.5
+SLOWDOWN = 1.5
+
+
+class AdaptiveInterval:
+    """根据每次轮询是否有新内容调整的轮询间隔"""
+
+    def __init__(self, initial: float, minimum: float = MIN_INTERVAL, maximum: float = MAX_INTERVAL):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.value = min(max(initial, minimum), maximum)
+
+    def update(self, new_count: int) -> float:
+        factor = SPEEDUP if new_count > 0 else SLOWDOWN
+        self.value = min(max(self.value * factor, self.minimum), self.maximum)
+        return self.value
+
+
+class NewsDaemon:
+    """按来源调度轮询、增量入库，并在新闻集合变化时重新渲染页面"""
+
+    def __init__(self, aggregator: Optional[NewsAggregator] = None, store: Optional[NewsStore] = None,
+                 output: str = os.path.join('docs', 'index.html'),
+                 min_interval: float = MIN_INTERVAL, max_interval: float = MAX_INTERVAL,
+                 history_days: Optional[int] = None, max_items: Optional[int] = None,
+                 inline_items: Optional[int] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        from scripts.generate_news_page import HISTORY_DAYS, MAX_ITEMS
+
+        self.aggregator = aggregator or get_aggregator()
+        self.store = store or NewsStore()
+        self.output = output
+        self.history_days = history_days or HISTORY_DAYS
+        self.max_items = max_items or MAX_ITEMS
+        self.inline_items = inline_items
+        self.clock = clock
+        self.intervals: Dict[str, AdaptiveInterval] = {
+            name: AdaptiveInterval(DEFAULT_INTERVALS.get(name, DEFAULT_INTERVAL), min_interval, max_interval)
+            for name in self.aggregator.sources
+        }
+        self._stop = threading.Event()
+        self._rendered_digest: Optional[str] = None
+        # (到期时间, 来源名)；启动时所有来源立即轮询一次
+        now = self.clock()
+        self._schedule = [(now, name) for name in self.aggregator.sources]
+        heapq.heapify(self._schedule)
+
+    def stop(self, *args) -> None:
+        self._stop.set()
+
+    def _poll(self, source_name: str) -> int:
+        """轮询单个来源并入库，返回新增条数（出错时为 0）"""
+        try:
+            # 支持的来源跳过已入库的链接；过滤器按调用传入，共享的聚合器不受影响
+            items = self.aggregator.fetch_by_source(source_name, use_cache=False, seen_filter=self.store.seen)
+        except Exception as e:
+            print(f"[守护] {source_name} 获取失败: {type(e).__name__}: {e}", file=sys.stderr)
+            return 0
+        added = self.store.ingest(source_name, items)
+        return len(added)
+
+    def tick(self) -> List[str]:
+        """
+        轮询所有已到期的来源，必要时重新渲染
+        Returns:
+            本次轮询的来源名列表
+        """
+        now = self.clock()
+        due = []
+        while self._schedule and self._schedule[0][0] <= now:
+            due.append(heapq.heappop(self._schedule)[1])
+        if not due:
+            return []
+
+        with ThreadPoolExecutor(max_workers=len(due)) as executor:
+            counts = dict(zip(due, executor.map(self._poll, due)))
+
+        finished = self.clock()
+        for name, count in counts.items():
+            interval = self.intervals[name].update(count)
+            heapq.heappush(self._schedule, (finished + interval, name))
+            print(f"[守护] {name}: 新增 {count} 条，下次间隔 {interval:.0f}s", file=sys.stderr)
+
+        if any(counts.values()) or self._rendered_digest is None:
+            self.render_if_changed()
+        return due
+
+    def render_if_changed(self) -> bool:
+        """新闻集合变化时重新渲染页面，返回是否写入了文件"""
+        from scripts.generate_news_page import write_page
+
+        # 各来源分别入库，跨来源的重复新闻在渲染前合并
+        items = dedup(self.store.recent(days=self.history_days, limit=self.max_items))
+        digest = hashlib.sha256()
+        for item in items:
+            digest.update(f"{item.get('link')}\t{item.get('title')}\t{item.get('datetime')}\n".encode('utf-8'))
+        digest = digest.hexdigest()
+        if digest == self._rendered_digest:
+            return False
+
+        # 卡片片段按内容缓存，未变化的新闻直接复用；页面内容哈希与磁盘上的一致时不重写文件
+        written = write_page(self.output, items, inline_limit=self.inline_items)
+        self._rendered_digest = digest
+        if not written:
+            return False
+        print(f"[守护] 已更新 {self.output}（{len(items)} 条）", file=sys.stderr)
+        return True
+
+    def seconds_until_next(self) -> float:
+        if not self._schedule:
+            return MAX_INTERVAL
+        return max(0.0, self._schedule[0][0] - self.clock())
+
+    def run(self, max_ticks: Optional[int] = None) -> None:
+        """运行调度循环，直到 stop() 或达到 max_ticks"""
+        ticks = 0
+        while not self._stop.is_set():
+            if self.tick():
+                ticks += 1
+                if max_ticks is not None and ticks >= max_ticks:
+                    break
+            self._stop.wait(self.seconds_until_next())
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Poll news sources continuously and re-render the page on change')
+    parser.add_argument('--output', default=os.path.join('docs', 'index.html'), help='Page to write')
+    parser.add_argument('--min-interval', type=float, default=MIN_INTERVAL, help='Shortest polling interval (seconds)')
+    parser.add_argument('--max-interval', type=float, default=MAX_INTERVAL, help='Longest polling interval (seconds)')
+    parser.add_argument('--history-days', type=int, default=None, help='Days of history to publish')
+    parser.add_argument('--max-items', type=int, default=None, help='Maximum number of items to publish')
+    parser.add_argument('--inline-items', type=int, default=None,
+                        help='Render only the newest N items inline; older items go to per-day JSON shards')
+    args = parser.parse_args()
+
+    daemon = NewsDaemon(output=args.output, min_interval=args.min_interval, max_interval=args.max_interval,
+                        history_days=args.history_days, max_items=args.max_items, inline_items=args.inline_items)
+    signal.signal(signal.SIGTERM, daemon.stop)
+    try:
+        daemon.run()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+流式导出
+把新闻源（或历史归档）组织成生成器流水线：获取 -> 规范化 -> 过滤 -> 去重 -> 写出，
+每条新闻依次流过各个阶段并立即写出，不在内存中收集完整列表。
+
+输出格式: jsonl（每行一个 JSON 对象）、csv、links（每行一个链接）
+
+用法:
+    python news_export.py --format jsonl --output news.jsonl
+    python news_export.py --from-archive --since 2026-10-01 --until 2026-10-15 --source reuters --format links
+    python news_export.py --format csv --keyword 降息 --keyword Fed --output -
+"""
+import argparse
+import csv
+import heapq
+import json
+import sys
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, TextIO
+
+from dedup import Deduplicator
+from keywords import KeywordMatcher
+from news_archive import time_range, write_link_lines
+from news_item import NewsItem, as_item, by_sort_key, to_items
+from news_time import normalize
+
+CSV_FIELDS = ('title', 'datetime', 'link', 'source', 'type')
+
+
+# -- 获取 ----------------------------------------------------------------
+def fetch_stage(aggregator=None, sources: Optional[Sequence[str]] = None,
+                use_cache: bool = True, cache_ttl: int = 60) -> Iterator[NewsItem]:
+    """
+    依次获取各来源，按时间倒序 k 路归并后逐条产生
+    出错的来源记录日志后跳过，不影响其他来源
+    """
+    if aggregator is None:
+        from news_aggregator import get_aggregator
+        aggregator = get_aggregator()
+    names = list(sources) if sources else list(aggregator.sources)
+
+    def one(name: str) -> Iterator[NewsItem]:
+        source = aggregator.sources.get(name)
+        if source is None:
+            print(f"[导出] 未知的新闻源: {name}", file=sys.stderr)
+            return
+        try:
+            items = normalize(to_items(source.fetch(use_cache=use_cache, cache_ttl=cache_ttl)))
+        except Exception as e:
+            print(f"[导出] 从 {name} 获取新闻时出错: {type(e).__name__}: {e}", file=sys.stderr)
+            return
+        print(f"[导出] {name}: 获取 {len(items)} 条新闻", file=sys.stderr)
+        yield from items
+
+    return heapq.merge(*(one(name) for name in names), key=by_sort_key)
+
+
+def archive_stage(archive=None, since: Optional[str] = None, until: Optional[str] = None,
+                  sources: Optional[Sequence[str]] = None) -> Iterator[Dict[str, Any]]:
+    """从历史归档中逐条读取（只读取日期范围和来源匹配的数据块）"""
+    if archive is None:
+        from news_archive import NewsArchive
+        archive = NewsArchive()
+    return archive.query(since, until, sources)
+
+
+# -- 规范化 / 去重 / 过滤 -------------------------------------------------
+def normalize_stage(records: Iterable[Any]) -> Iterator[NewsItem]:
+    """统一为 NewsItem（补充 ts、驻留来源和类型字符串）"""
+    for record in records:
+        yield as_item(record)
+
+
+def dedup_stage(items: Iterable[NewsItem]) -> Iterator[NewsItem]:
+    """去掉规范化链接相同或标题近似的重复新闻（保留先出现的一条），内存只随不重复的条数增长"""
+    deduplicator = Deduplicator()
+    for item in items:
+        if not deduplicator.is_duplicate(item):
+            yield item
+
+
+def filter_stage(items: Iterable[NewsItem], since: Optional[str] = None, until: Optional[str] = None,
+                 sources: Optional[Sequence[str]] = None,
+                 keywords: Optional[Sequence[str]] = None) -> Iterator[NewsItem]:
+    """
+    按时间范围（含）、来源、标题关键词过滤
+    Args:
+        keywords: 标题包含其中任意一个即保留（不区分大小写，英文关键词按单词开头匹配）
+    """
+    start, end = time_range(since, until)
+    wanted = frozenset(sources) if sources else None
+    matcher = KeywordMatcher(dict.fromkeys(keywords, True)) if keywords else None
+    for item in items:
+        if start is not None and item.ts < start:
+            continue
+        if end is not None and item.ts > end:
+            continue
+        if wanted is not None and item.source not in wanted:
+            continue
+        if matcher is not None and next(matcher.iter_matches(item.title), None) is None:
+            continue
+        yield item
+
+
+# -- 写出 ----------------------------------------------------------------
+def write_jsonl(items: Iterable[NewsItem], out: TextIO) -> int:
+    count = 0
+    for item in items:
+        out.write(json.dumps(item.to_dict(), ensure_ascii=False) + '\n')
+        count += 1
+    return count
+
+
+def write_csv(items: Iterable[NewsItem], out: TextIO) -> int:
+    writer = csv.writer(out)
+    writer.writerow(CSV_FIELDS)
+    count = 0
+    for item in items:
+        writer.writerow((item.title, item.datetime, item.link, item.source, item.type))
+        count += 1
+    return count
+
+
+def write_link_list(items: Iterable[NewsItem], out: TextIO) -> int:
+    """每行一个链接，与归档导出的格式相同（见 news_archive.write_link_lines）"""
+    return write_link_lines((item.link for item in items), out)
+
+
+WRITERS: Dict[str, Callable[[Iterable[NewsItem], TextIO], int]] = {
+    'jsonl': write_jsonl,
+    'csv': write_csv,
+    'links': write_link_list,
+}
+
+
+@contextmanager
+def _open_output(path: str):
+    if path == '-':
+        yield sys.stdout
+        return
+    # CSV 模块自行处理换行
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        yield f
+
+
+def pipeline(records: Iterable[Any], dedup: bool = True, since: Optional[str] = None,
+             until: Optional[str] = None, sources: Optional[Sequence[str]] = None,
+             keywords: Optional[Sequence[str]] = None) -> Iterator[NewsItem]:
+    """规范化 -> 过滤 -> 去重；先过滤再去重，被过滤掉的新闻不会占用去重器的内存"""
+    items = filter_stage(normalize_stage(records), since, until, sources, keywords)
+    return dedup_stage(items) if dedup else items
+
+
+def export(records: Iterable[Any], fmt: str, output: str = '-', **options) -> int:
+    """
+    把 records 流经 pipeline 后写出
+    Returns:
+        写出的条数
+    """
+    if fmt not in WRITERS:
+        raise ValueError(f"未知的导出格式: {fmt}")
+    with _open_output(output) as out:
+        return WRITERS[fmt](pipeline(records, **options), out)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Stream news from sources or the archive to JSONL, CSV or a link list')
+    parser.add_argument('--format', choices=sorted(WRITERS), default='jsonl', help='Output format (default jsonl)')
+    parser.add_argument('--output', default='-', help="Output file, '-' for stdout (default)")
+    parser.add_argument('--from-archive', action='store_true',
+                        help='Read from the history archive instead of fetching the sources')
+    parser.add_argument('--since', help="Earliest time (inclusive), 'YYYY-MM-DD' or 'YYYY-MM-DD HH:MM:SS'")
+    parser.add_argument('--until', help="Latest time (inclusive); a bare date covers the whole day")
+    parser.add_argument('--source', action='append', dest='sources', help='Only export this source (repeatable)')
+    parser.add_argument('--keyword', action='append', dest='keywords',
+                        help='Only export titles containing this keyword (repeatable, any match)')
+    parser.add_argument('--no-dedup', action='store_true', help='Keep cross-source duplicates')
+    parser.add_argument('--no-cache', action='store_true', help='Disable cache when fetching')
+    args = parser.parse_args(argv)
+
+    # --source 按来源名称（聚合器/归档中的名称）选择读取哪些来源，在获取阶段完成
+    if args.from_archive:
+        records = archive_stage(since=args.since, until=args.until, sources=args.sources)
+    else:
+        records = fetch_stage(sources=args.sources, use_cache=not args.no_cache)
+    count = export(records, args.format, args.output, dedup=not args.no_dedup, since=args.since,
+                   until=args.until, keywords=args.keywords)
+    print(f"[导出] 写出 {count} 条", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,101 @@
+"""
+新闻记录
+NewsItem 用 __slots__ 保存一条新闻，取代每条新闻一个字典：没有逐条的哈希表，
+source / type 等重复出现的字符串经过驻留（sys.intern）只保存一份。
+为兼容按字典使用新闻的代码，支持 item['title']、item.get('type', '')、dict(item) 等写法。
+"""
+import sys
+from operator import attrgetter
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Union
+
+from news_time import to_ts
+
+
+class NewsItem:
+    """一条新闻"""
+    __slots__ = ('title', 'datetime', 'link', 'source', 'type', 'ts', 'sort_key', 'hotness')
+
+    # 可以按字典方式访问的字段（按序列化顺序）
+    FIELDS = ('title', 'datetime', 'link', 'source', 'type', 'ts', 'hotness')
+    _FIELD_SET = frozenset(FIELDS)
+
+    def __init__(self, title: str = '', datetime: str = '', link: str = '', source: str = 'unknown',
+                 type: str = '', ts: Optional[int] = None, hotness: int = 0):
+        self.title = title
+        self.datetime = datetime
+        self.link = link
+        self.source = sys.intern(source)
+        self.type = sys.intern(type)
+        self.ts = to_ts(datetime) if ts is None else ts
+        # 时间倒序排列时使用的键，创建时计算一次
+        self.sort_key = -self.ts
+        self.hotness = hotness
+
+    @classmethod
+    def from_dict(cls, record: Mapping[str, Any], source: str = 'unknown') -> 'NewsItem':
+        """从字典创建；缺少 source 时使用参数 source"""
+        return cls(record.get('title') or '', record.get('datetime') or '', record.get('link') or '',
+                   record.get('source') or source, record.get('type') or '',
+                   record.get('ts'), record.get('hotness') or 0)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为可 JSON 序列化的字典（不包含渲染时计算的 hotness）"""
+        return {'title': self.title, 'datetime': self.datetime, 'link': self.link,
+                'source': self.source, 'type': self.type, 'ts': self.ts}
+
+    # -- 字典兼容 --------------------------------------------------------
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._FIELD_SET:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key not in self._FIELD_SET:
+            raise KeyError(key)
+        if key in ('source', 'type'):
+            value = sys.intern(value)
+        setattr(self, key, value)
+        if key == 'ts':
+            self.sort_key = -value
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._FIELD_SET
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key not in self._FIELD_SET:
+            return default
+        return getattr(self, key)
+
+    def keys(self) -> Iterator[str]:
+        return iter(self.FIELDS)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.FIELDS)
+
+    # -- 其他 ------------------------------------------------------------
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, NewsItem):
+            return NotImplemented
+        return (self.title, self.datetime, self.link, self.source, self.type, self.ts) == \
+            (other.title, other.datetime, other.link, other.source, other.type, other.ts)
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f'NewsItem({self.title!r}, {self.datetime!r}, {self.link!r}, source={self.source!r})'
+
+
+# 按时间倒序排列 NewsItem 时使用的键（升序比较 sort_key 即时间倒序）
+by_sort_key = attrgetter('sort_key')
+
+
+def as_item(record: Union[NewsItem, Mapping[str, Any]], source: str = 'unknown') -> NewsItem:
+    """NewsItem 原样返回，字典转换为 NewsItem"""
+    if isinstance(record, NewsItem):
+        return record
+    return NewsItem.from_dict(record, source)
+
+
+def to_items(records: Iterable[Union[NewsItem, Mapping[str, Any]]], source: str = 'unknown') -> List[NewsItem]:
+    """批量转换为 NewsItem 列表"""
+    return [as_item(record, source) for record in records]
@@ -0,0 +1,185 @@
+"""
+增量入库
+- 按链接判断是否新增：回看窗口内已入库的链接（规范化后，不论来源）不再入库，晚到的新闻不会被漏掉
+- 每个来源保存一个水位线（最新见到的时间），只作为下界：早于“水位线 - 回看窗口”的新闻视为已处理
+- 新闻按日期（北京时间）追加写入 data/news/YYYY-MM-DD.jsonl，只追加、不改写，页面可以展示多次抓取累积的历史
+- 入库的链接同时记入 data/news/seen/ 下按天轮换的布隆过滤器（见 seen_filter.py），供来源提前跳过
+- 入库的新闻同时追加到 data/news/archive/ 下的压缩归档（见 news_archive.py），供按日期范围和来源导出
+"""
+import json
+import os
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+from zoneinfo import ZoneInfo
+
+from dedup import canonical_url
+from news_archive import NewsArchive
+from news_item import NewsItem, by_sort_key, to_items
+from seen_filter import SeenFilter
+
+DEFAULT_STORE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'news')
+WATERMARKS_FILE = 'watermarks.json'
+# 已入库链接的布隆过滤器目录、历史归档目录（相对于存储目录）
+SEEN_DIR = 'seen'
+ARCHIVE_DIR = 'archive'
+# 水位线之前仍按链接检查的时间范围：发布时间早于最新新闻、但较晚才出现在列表中的新闻在此范围内仍会入库
+LOOKBACK = timedelta(days=2)
+
+
+class NewsStore:
+    """只追加的本地新闻存储"""
+
+    def __init__(self, root: str = DEFAULT_STORE_DIR):
+        self.root = root
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+        self._watermarks = self._load_watermarks()
+        # 来源可以在提取标题和时间之前用它跳过已入库的链接
+        self.seen = SeenFilter(os.path.join(root, SEEN_DIR))
+        # 压缩分区 + 索引的历史归档，用于跨多天、多来源的查询和导出
+        self.archive = NewsArchive(os.path.join(root, ARCHIVE_DIR))
+        # 回看窗口内已入库的链接 {规范化链接: 时间}，首次用到时从 JSONL 分区加载（归档和过滤器不提交到仓库，可能缺失）
+        self._known: Optional[Dict[str, str]] = None
+        self._known_since: Optional[str] = None
+
+    # -- 水位线 ----------------------------------------------------------
+    def _load_watermarks(self) -> Dict[str, Dict[str, Any]]:
+        path = os.path.join(self.root, WATERMARKS_FILE)
+        try:
+            with open(path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_watermarks(self) -> None:
+        # 先写临时文件再替换，避免中途退出留下损坏的水位线
+        path = os.path.join(self.root, WATERMARKS_FILE)
+        tmp = path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self._watermarks, f, ensure_ascii=False, indent=2, sort_keys=True)
+        os.replace(tmp, path)
+
+    def watermark(self, source_name: str) -> Optional[Dict[str, Any]]:
+        """返回来源的水位线 {'datetime': str}，从未入库时返回 None"""
+        return self._watermarks.get(source_name)
+
+    def _lower_bound(self, source_name: str) -> Optional[str]:
+        """按链接检查的最早时间（水位线 - 回看窗口），从未入库时返回 None"""
+        mark = self._watermarks.get(source_name)
+        if not mark:
+            return None
+        newest = datetime.strptime(mark['datetime'], '%Y-%m-%d %H:%M:%S')
+        return (newest - LOOKBACK).strftime('%Y-%m-%d %H:%M:%S')
+
+    def _known_links(self, lower: str) -> Dict[str, str]:
+        """已入库的链接，至少包含 lower 所在日期及之后的分区"""
+        day = lower[:10]
+        if self._known is None or day < self._known_since:
+            self._known = {canonical_url(record.get('link', '')): record.get('datetime', '')
+                           for record in self.iter_items(day)}
+            self._known_since = day
+        return self._known
+
+    def _prune_known(self) -> None:
+        """去掉所有来源的回看窗口都已不再包含的链接"""
+        lowers = [self._lower_bound(name) for name in self._watermarks]
+        if self._known is None or not lowers:
+            return
+        oldest = min(lowers)
+        for link in [link for link, dt in self._known.items() if dt < oldest]:
+            del self._known[link]
+        self._known_since = max(self._known_since, oldest[:10])
+
+    # -- 写入 ------------------------------------------------------------
+    def delta(self, source_name: str, items: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        过滤出回看窗口内链接未入库过的新闻（不写入），同一批次内按链接去重
+        来源第一次入库时没有水位线，整批都是新增
+        """
+        lower = self._lower_bound(source_name)
+        known = self._known_links(lower) if lower is not None else {}
+        unique = []
+        links = set()
+        for item in items:
+            if lower is not None and item.get('datetime', '') < lower:
+                continue
+            link = canonical_url(item.get('link', ''))
+            if link in known or link in links:
+                continue
+            links.add(link)
+            unique.append(item)
+        return unique
+
+    def ingest(self, source_name: str, items: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        写入某个来源的一批新闻，只追加链接未入库过的部分
+        Returns:
+            本次实际新增的新闻
+        """
+        with self._lock:
+            new_items = self.delta(source_name, items)
+            if not new_items:
+                return []
+
+            partitions: Dict[str, List[Dict[str, Any]]] = {}
+            for item in new_items:
+                day = item.get('datetime', '')[:10] or 'unknown'
+                partitions.setdefault(day, []).append(item)
+            for day, day_items in partitions.items():
+                path = os.path.join(self.root, f'{day}.jsonl')
+                with open(path, 'a', encoding='utf-8') as f:
+                    for item in day_items:
+                        record = item.to_dict() if isinstance(item, NewsItem) else item
+                        f.write(json.dumps(record, ensure_ascii=False) + '\n')
+                    f.flush()
+                    os.fsync(f.fileno())
+            self.archive.append(source_name, new_items)
+            self.seen.add(item.get('link') for item in new_items)
+            self.seen.flush()
+
+            newest = max(item.get('datetime', '') for item in new_items)
+            mark = self._watermarks.get(source_name)
+            if not mark or mark['datetime'] < newest:
+                self._watermarks[source_name] = {'datetime': newest}
+                self._save_watermarks()
+            if self._known is not None:
+                for item in new_items:
+                    self._known[canonical_url(item.get('link', ''))] = item.get('datetime', '')
+                self._prune_known()
+            return new_items
+
+    # -- 读取 ------------------------------------------------------------
+    def days(self) -> List[str]:
+        """已有的分区日期，从新到旧"""
+        names = [name[:-len('.jsonl')] for name in os.listdir(self.root) if name.endswith('.jsonl')]
+        return sorted(names, reverse=True)
+
+    def iter_items(self, since: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """逐条读取 since（'YYYY-MM-DD'，含）之后的分区中的新闻，分区从新到旧"""
+        for day in self.days():
+            if since is not None and day < since:
+                break
+            path = os.path.join(self.root, f'{day}.jsonl')
+            with open(path, encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        # 跳过被截断的行（如写入过程中进程退出）
+                        continue
+
+    def recent(self, days: int = 3, limit: Optional[int] = None) -> List[NewsItem]:
+        """
+        最近 days 天（北京时间）的新闻，按时间倒序
+        Args:
+            days: 包含今天在内的天数
+            limit: 最多返回的条数
+        """
+        since = (datetime.now(ZoneInfo('Asia/Shanghai')) - timedelta(days=days - 1)).strftime('%Y-%m-%d')
+        items = to_items(self.iter_items(since))
+        items.sort(key=by_sort_key)
+        return items[:limit] if limit is not None else items
@@ -0,0 +1,60 @@
+"""
+新闻时间戳
+各来源的 'datetime' 字段是北京时间 'YYYY-MM-DD HH:MM:SS' 字符串。新闻进入聚合器时统一补充
+'ts'（epoch 秒，int），之后的排序、合并、入库和渲染都只比较这个整数，
+不再重复解析字符串，也不依赖运行环境的本地时区。
+"""
+from datetime import datetime
+from functools import lru_cache
+from operator import itemgetter
+from typing import Any, Dict, List
+from zoneinfo import ZoneInfo
+
+TZ = ZoneInfo('Asia/Shanghai')
+# 无法解析的时间按 epoch 0 处理，排在最后
+UNKNOWN_TS = 0
+
+ts_key = itemgetter('ts')
+
+
+@lru_cache(maxsize=20000)
+def to_ts(value: str) -> int:
+    """
+    将时间字符串转换为 epoch 秒
+    支持 'YYYY-MM-DD HH:MM:SS'、'YYYY-MM-DD HH:MM'、'YYYY-MM-DD'（按北京时间）以及带时区偏移的 ISO 时间
+    """
+    if not isinstance(value, str) or not value.strip():
+        return UNKNOWN_TS
+    try:
+        dt = datetime.fromisoformat(value.strip())
+    except ValueError:
+        return UNKNOWN_TS
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=TZ)
+    return int(dt.timestamp())
+
+
+def ensure_ts(item: Dict[str, Any]) -> int:
+    """返回新闻的 ts，缺少时根据 'datetime' 补上"""
+    ts = item.get('ts')
+    if ts is None:
+        ts = item['ts'] = to_ts(item.get('datetime', ''))
+    return ts
+
+
+def normalize(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    为每条新闻补充 ts，并保证列表按 ts 从新到旧排列
+    来源通常已按时间倒序返回，此时只做一次线性检查，不会重新排序
+    """
+    ordered = True
+    prev = None
+    for item in items:
+        ts = ensure_ts(item)
+        if prev is not None and ts > prev:
+            ordered = False
+        prev = ts
+    if not ordered:
+        # 稳定排序：同一时间的新闻保持来源给出的顺序
+        items.sort(key=ts_key, reverse=True)
+    return items
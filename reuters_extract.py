@@ -0,0 +1,365 @@
+"""
+路透社栏目页面的链接提取器
+
+- extract_embedded_candidates: 直接定位页面中内嵌的 Fusion / Next.js 数据 JSON 并解码，
+  得到带真实发布时间的文章列表，无需解析 HTML
+- extract_candidates: 基于标准库 html.parser 的流式提取器，单次扫描即可收集文章链接、
+  链接内的标题/span 文本以及所在容器中的第一个 <time>，不在内存中构建 DOM 树；
+  输出与 get_reuters_news 中基于 BeautifulSoup 的提取逻辑保持一致
+"""
+import html
+import json
+import re
+from html.entities import html5
+from html.parser import HTMLParser
+from typing import Callable, List, Optional, Tuple
+
+# 文章链接匹配规则（与 BeautifulSoup 路径一致）
+LINK_PATTERN = re.compile(r'/article/|/world/|/business/|/markets/|/finance/|/technology/')
+FALLBACK_LINK_PATTERN = re.compile(r'^/[a-z]+/')
+
+# html.parser 构建器中的空元素，不会被压入元素栈
+VOID_ELEMENTS = frozenset([
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'keygen', 'link',
+    'menuitem', 'meta', 'param', 'source', 'track', 'wbr', 'basefont', 'bgsound',
+    'command', 'frame', 'image', 'isindex', 'nextid', 'spacer',
+])
+# 这些元素内的文本不计入 get_text()
+NON_TEXT_ELEMENTS = frozenset(['script', 'style', 'template'])
+HEADINGS = frozenset(['h2', 'h3', 'h4'])
+
+# 候选链接: (href, 标题或 None, 所在容器第一个 <time> 的 datetime 属性或 None)
+Candidate = Tuple[str, Optional[str], Optional[str]]
+
+
+class _Container:
+    """可能为链接提供时间的容器元素（article 等）"""
+    __slots__ = ('has_time', 'time_value')
+
+    def __init__(self):
+        self.has_time = False
+        self.time_value = None
+
+
+class _Anchor:
+    """正在收集文本的 <a> 元素"""
+    __slots__ = ('href', 'container', 'text', 'heading', 'spans')
+
+    def __init__(self, href, container):
+        self.href = href
+        self.container = container
+        self.text = []
+        self.heading = None        # 第一个 h2/h3/h4 的文本片段
+        self.spans = []            # 按出现顺序排列的 span 文本片段列表
+
+
+class ReutersLinkParser(HTMLParser):
+    """
+    单次扫描提取文章链接
+
+    容器解析规则与 BeautifulSoup 路径相同：优先取最近的 <article> 祖先，
+    否则取最近的 <div> 祖先（卡片容器），并取该容器子树中的第一个 <time>。
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=False)
+        self.anchors: List[_Anchor] = []
+        self._stack = []               # [(tag, kind, payload)]
+        self._articles = []            # 打开的 <article> 容器
+        self._divs = []                # 打开的 <div> 容器
+        self._open_anchors = []
+        self._collectors = []          # 当前接收文本的片段列表
+        self._skip_text = 0
+        self._data = []
+
+    # -- 文本处理 --------------------------------------------------------
+    def _flush(self):
+        if not self._data:
+            return
+        text = ''.join(self._data).strip()
+        self._data = []
+        if text and not self._skip_text:
+            for collector in self._collectors:
+                collector.append(text)
+
+    def handle_data(self, data):
+        if self._collectors:
+            self._data.append(data)
+
+    def handle_entityref(self, name):
+        character = html5.get(name + ';')
+        self.handle_data(character if character is not None else '&' + name)
+
+    def handle_charref(self, name):
+        self.handle_data(html.unescape('&#%s;' % name))
+
+    def unknown_decl(self, data):
+        # CDATA 段的文本同样计入 get_text()
+        self._flush()
+        if data.upper().startswith('CDATA['):
+            self.handle_data(data[len('CDATA['):])
+        self._flush()
+
+    def handle_comment(self, data):
+        self._flush()
+
+    def handle_decl(self, decl):
+        self._flush()
+
+    def handle_pi(self, data):
+        self._flush()
+
+    # -- 元素处理 --------------------------------------------------------
+    def _mark_time(self, value):
+        # 由内向外标记尚未找到 <time> 的容器；遇到已标记的容器即可停止，
+        # 因为更外层的容器此前一定也已标记
+        for stack in (self._articles, self._divs):
+            for container in reversed(stack):
+                if container.has_time:
+                    break
+                container.has_time = True
+                container.time_value = value
+
+    def handle_starttag(self, tag, attrs):
+        self._flush()
+        attr_dict = {}
+        for key, value in attrs:
+            attr_dict[key] = '' if value is None else value
+
+        if tag == 'time':
+            self._mark_time(attr_dict.get('datetime'))
+
+        kind = None
+        payload = None
+        if tag == 'article':
+            kind, payload = 'article', _Container()
+            self._articles.append(payload)
+        elif tag == 'div':
+            kind, payload = 'div', _Container()
+            self._divs.append(payload)
+        elif tag == 'a':
+            container = self._articles[-1] if self._articles else (self._divs[-1] if self._divs else None)
+            anchor = _Anchor(attr_dict.get('href'), container)
+            self.anchors.append(anchor)
+            self._open_anchors.append(anchor)
+            self._collectors.append(anchor.text)
+            kind, payload = 'a', anchor
+        elif self._open_anchors and tag in HEADINGS:
+            started = [a for a in self._open_anchors if a.heading is None]
+            if started:
+                pieces = []
+                for anchor in started:
+                    anchor.heading = pieces
+                self._collectors.append(pieces)
+                kind, payload = 'heading', pieces
+        elif self._open_anchors and tag == 'span':
+            pieces = []
+            for anchor in self._open_anchors:
+                anchor.spans.append(pieces)
+            self._collectors.append(pieces)
+            kind, payload = 'span', pieces
+
+        if tag in NON_TEXT_ELEMENTS:
+            self._skip_text += 1
+
+        if tag in VOID_ELEMENTS:
+            self._close_entry(tag, kind, payload)
+        else:
+            self._stack.append((tag, kind, payload))
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_ELEMENTS:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        self._flush()
+        # 与 BeautifulSoup 一致：弹出到最近的同名元素，找不到则忽略
+        for i in range(len(self._stack) - 1, -1, -1):
+            if self._stack[i][0] == tag:
+                break
+        else:
+            return
+        while len(self._stack) > i:
+            self._close_entry(*self._stack.pop())
+
+    def _drop_collector(self, pieces):
+        # 按对象身份移除（不同的空列表彼此相等）
+        for i in range(len(self._collectors) - 1, -1, -1):
+            if self._collectors[i] is pieces:
+                del self._collectors[i]
+                return
+
+    def _close_entry(self, tag, kind, payload):
+        if tag in NON_TEXT_ELEMENTS:
+            self._skip_text -= 1
+        if kind == 'article':
+            self._articles.pop()
+        elif kind == 'div':
+            self._divs.pop()
+        elif kind == 'a':
+            self._open_anchors.remove(payload)
+            self._drop_collector(payload.text)
+        elif kind == 'heading':
+            self._drop_collector(payload)
+        elif kind == 'span':
+            self._drop_collector(payload)
+
+    def close(self):
+        super().close()
+        self._flush()
+
+
+def _anchor_title(anchor: _Anchor) -> Optional[str]:
+    """按 BeautifulSoup 路径相同的优先级确定标题"""
+    title = None
+    title_text = ''.join(anchor.text)
+    if title_text and len(title_text) > 10:
+        title = title_text
+    if not title and anchor.heading is not None:
+        title = ''.join(anchor.heading)
+    if not title:
+        for pieces in anchor.spans:
+            text = ''.join(pieces)
+            if text and len(text) > 10:
+                title = text
+                break
+    return title
+
+
+def extract_candidates(content, skip: Optional[Callable[[str], bool]] = None) -> List[Candidate]:
+    """
+    流式提取候选链接
+    Args:
+        content: 页面 HTML（bytes 按 UTF-8 解码）
+        skip: 对 href 返回 True 的链接直接跳过，不再拼接标题
+    Returns:
+        [(href, 标题或 None, datetime 属性或 None)]，顺序与页面中出现顺序一致
+    """
+    if isinstance(content, bytes):
+        content = content.decode('utf-8', errors='replace')
+    parser = ReutersLinkParser()
+    parser.feed(content)
+    parser.close()
+
+    anchors = [a for a in parser.anchors if a.href is not None and LINK_PATTERN.search(a.href)]
+    if not anchors:
+        anchors = [a for a in parser.anchors if a.href is not None and FALLBACK_LINK_PATTERN.search(a.href)]
+
+    candidates = []
+    for anchor in anchors:
+        if skip is not None and skip(anchor.href):
+            continue
+        time_value = anchor.container.time_value if anchor.container is not None else None
+        candidates.append((anchor.href, _anchor_title(anchor), time_value))
+    return candidates
+
+
+# 内嵌数据 JSON 的位置标记: (标记, 标记之后到 JSON 起点之间需要跳过的分隔符)
+EMBEDDED_JSON_MARKERS = (
+    ('Fusion.contentCache=', ''),
+    ('Fusion.globalContent=', ''),
+    ('id="__NEXT_DATA__"', '>'),
+)
+_TITLE_KEYS = ('title', 'basic_headline')
+_URL_KEYS = ('canonical_url', 'website_url', 'url')
+_TIME_KEYS = ('published_time', 'first_publish_date', 'display_time', 'display_date', 'updated_time')
+_REUTERS_PREFIX = 'https://www.reuters.com/'
+
+
+def _iter_embedded_json(text: str):
+    """定位并解码页面中所有内嵌的数据 JSON（只做字符串查找，不解析 HTML）"""
+    decoder = json.JSONDecoder()
+    for marker, separator in EMBEDDED_JSON_MARKERS:
+        start = 0
+        while True:
+            pos = text.find(marker, start)
+            if pos < 0:
+                break
+            pos += len(marker)
+            if separator:
+                pos = text.find(separator, pos)
+                if pos < 0:
+                    break
+                pos += len(separator)
+            while pos < len(text) and text[pos].isspace():
+                pos += 1
+            start = pos
+            try:
+                data, end = decoder.raw_decode(text, pos)
+            except ValueError:
+                continue
+            start = end
+            yield data
+
+
+def _article_fields(node: dict):
+    """若 node 看起来是一篇文章，返回 (链接, 标题, 时间)，否则返回 None"""
+    url = None
+    for key in _URL_KEYS:
+        value = node.get(key)
+        if isinstance(value, str) and value:
+            url = value
+            break
+    if url is None:
+        return None
+    if url.startswith(_REUTERS_PREFIX):
+        path = url[len(_REUTERS_PREFIX) - 1:]
+    elif url.startswith('/'):
+        path = url
+    else:
+        return None
+    if not LINK_PATTERN.search(path):
+        return None
+
+    title = None
+    for key in _TITLE_KEYS:
+        value = node.get(key)
+        if isinstance(value, str) and value.strip():
+            title = value.strip()
+            break
+    if title is None:
+        headlines = node.get('headlines')
+        if isinstance(headlines, dict) and isinstance(headlines.get('basic'), str):
+            title = headlines['basic'].strip() or None
+    if title is None:
+        return None
+
+    time_value = None
+    for key in _TIME_KEYS:
+        value = node.get(key)
+        if isinstance(value, str) and value:
+            time_value = value
+            break
+    return url, title, time_value
+
+
+def extract_embedded_candidates(content) -> List[Candidate]:
+    """
+    从内嵌的 Fusion / Next.js 数据中提取文章
+    Args:
+        content: 页面 HTML（bytes 按 UTF-8 解码）
+    Returns:
+        [(链接, 标题, 发布时间或 None)]；页面中没有可用的内嵌数据时返回空列表
+    """
+    if isinstance(content, bytes):
+        content = content.decode('utf-8', errors='replace')
+
+    candidates = []
+    seen = set()
+    for data in _iter_embedded_json(content):
+        # 深度优先遍历，保持文章在数据中的顺序；匹配到文章后不再深入其子节点
+        stack = [data]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, dict):
+                fields = _article_fields(node)
+                if fields is not None:
+                    if fields[0] not in seen:
+                        seen.add(fields[0])
+                        candidates.append(fields)
+                    continue
+                stack.extend(reversed(list(node.values())))
+            elif isinstance(node, list):
+                stack.extend(reversed(node))
+    return candidates
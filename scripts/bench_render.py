@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+页面渲染基准：对比一次性拼接（render_html 后写文件）与流式写入（write_page）的
+峰值内存和耗时。每种方式在独立子进程中运行，峰值内存取子进程的 ru_maxrss。
+指定 --baseline 时，另外从该 git 版本导出一份代码，测量当时的 render_html（original 列）。
+
+用法: python scripts/bench_render.py [--counts 10000 100000] [--baseline REV]
+"""
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def make_items(count):
+    sources = ('wallstreetcn', 'reuters', 'wallstreetcn_live')
+    return [{
+        'title': f'美联储官员表示通胀仍然偏高，市场预期年内降息 第 {i} 条',
+        'link': f'https://example.com/articles/{i}',
+        'datetime': f'2024-01-{1 + i % 28:02d} {i % 24:02d}:{i % 60:02d}:00',
+        'source': sources[i % len(sources)],
+        'type': 'article' if i % 2 else '',
+    } for i in range(count)]
+
+
+def run_one(mode, count, output, root=ROOT):
+    """在当前进程中用 root 下的代码渲染一次，返回耗时（秒）"""
+    sys.path.insert(0, root)
+    from scripts.generate_news_page import render_html, write_page
+
+    items = make_items(count)
+    start = time.perf_counter()
+    if mode in ('original', 'buffered'):
+        html = render_html(items)
+        with open(output, 'w', encoding='utf-8') as f:
+            f.write(html)
+    else:
+        write_page(output, items)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark buffered vs streaming page rendering')
+    parser.add_argument('--counts', type=int, nargs='+', default=[10000, 100000])
+    parser.add_argument('--baseline', metavar='REV',
+                        help='Also time render_html as of this git revision (e.g. the commit before streaming)')
+    parser.add_argument('--child', nargs=4, metavar=('MODE', 'COUNT', 'OUTPUT', 'ROOT'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        mode, count, output, root = args.child
+        elapsed = run_one(mode, int(count), output, root)
+        rss_kib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        print(f'{elapsed:.3f} {rss_kib}')
+        return
+
+    print(f"{'items':>8} {'mode':>10} {'time(s)':>9} {'peak RSS(MiB)':>14}")
+    with tempfile.TemporaryDirectory() as tmp:
+        roots = {'buffered': ROOT, 'stream': ROOT}
+        if args.baseline:
+            # 导出旧版本的完整代码树，旧的 render_html 使用当时的依赖模块
+            baseline = os.path.join(tmp, 'baseline')
+            os.makedirs(baseline)
+            archive = subprocess.run(['git', '-C', ROOT, 'archive', args.baseline],
+                                     check=True, capture_output=True).stdout
+            subprocess.run(['tar', '-x', '-C', baseline], input=archive, check=True)
+            roots = {'original': baseline, **roots}
+        for count in args.counts:
+            for mode, root in roots.items():
+                output = os.path.join(tmp, f'{mode}-{count}.html')
+                result = subprocess.run([sys.executable, __file__, '--child', mode, str(count), output, root],
+                                        check=True, capture_output=True, text=True)
+                elapsed, rss_kib = result.stdout.split()
+                print(f'{count:>8} {mode:>10} {float(elapsed):>9.3f} {int(rss_kib) / 1024:>14.1f}')
+
+
+if __name__ == '__main__':
+    main()
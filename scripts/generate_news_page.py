@@ -1,114 +1,270 @@
 #!/usr/bin/env python3
 """Fetch news from multiple sources and render a simple HTML page to docs/index.html"""
 from datetime import datetime
+from functools import lru_cache
 from zoneinfo import ZoneInfo
+import argparse
+import hashlib
+import io
+import itertools
+import json
 import os
+import re
 import sys
 import html as _html
 
 # Ensure project root is on sys.path so imports work when script is executed from scripts/
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from news_aggregator import fetch_all_news, fetch_news_by_source
+from dedup import dedup
+from news_aggregator import get_aggregator
+from news_store import NewsStore
+from news_item import to_items
+from keywords import highlight_title, score, sentiment_marks, title_score
+from search_index import CJK_CLASS, build_index
+
+# 并发抓取时单个来源的超时（秒）；所有来源同时开始，它同时也是整次抓取的上限
+SOURCE_TIMEOUT = 120
+# 页面展示的历史天数与最多条数
+HISTORY_DAYS = 3
+MAX_ITEMS = 1000
+# 卡片片段的缓存容量（常驻模式下跨多次渲染复用）
+RENDER_CACHE_SIZE = 20000
+
+# 页面中的生成时间和内容哈希在计算哈希时以占位符代替，
+# 因此只有新闻内容变化时哈希才会变化
+_GENERATED_AT_PLACEHOLDER = '\x00GENERATED_AT\x00'
+_CONTENT_HASH_PLACEHOLDER = '\x00CONTENT_HASH\x00'
+_ROWS_PLACEHOLDER = '\x00ROWS\x00'
+# 卡片之间的分隔（与原先 "\n      ".join(rows) 的输出一致）
+CARD_SEPARATOR = "\n      "
+_MANIFEST_PLACEHOLDER = '\x00MANIFEST\x00'
+_SEARCH_PLACEHOLDER = '\x00SEARCH\x00'
+_CONTENT_HASH_RE = re.compile(r"<meta name='content-hash' content='([0-9a-f]+)'")
+
+# 分片模式：超出页面内联条数的旧新闻按天写入 docs/shards/<日期>.<内容哈希>.json，
+# 滚动到底部时按需加载到虚拟列表中
+SHARD_DIR = 'shards'
+# 虚拟列表中每行的固定高度（像素，含行间距）
+ARCHIVE_ROW_HEIGHT = 48
+
+# 搜索索引文件（与页面同目录，文件名包含内容哈希）与输入防抖时间
+SEARCH_INDEX_PREFIX = 'search-index.'
+SEARCH_DEBOUNCE_MS = 150
+
+# Source configuration with display names and icons
+SOURCE_CONFIG = {
+    'wallstreetcn': {'name': '华尔街见闻', 'color': '#1478F0', 'icon': 'W'},
+    'reuters': {'name': '路透社', 'color': '#FF8000', 'icon': 'R'},
+}
 
 
 def calculate_hotness(item):
     """
     计算新闻热度
-    基于：标题长度、关键词出现频率等因素
+    基于：标题中财经关键词的出现次数与权重（关键词表见 keywords.VOCABULARY）
     """
-    title = item.get('title', '').lower()
-    hotness = 0
-    
-    # 财经关键词增加热度
-    financial_keywords = {
-        '暴涨': 10, '暴跌': 10, '新高': 8, '大涨': 8, '大跌': 8,
-        '突破': 7, '崩盘': 9, '获批': 8, '制裁': 8, '调查': 7,
-        '创纪录': 9, '牛市': 8, '熊市': 8, '反弹': 6, '下跌': 5,
-        '增长': 4, '下降': 4, '上涨': 5, '跌停': 9, '涨停': 9,
-        '飙升': 8, '飙低': 8, '风险': 5, '预期': 3, '预测': 3,
-    }
-    
-    for keyword, weight in financial_keywords.items():
-        hotness += title.count(keyword.lower()) * weight
-    
-    return hotness
+    return title_score(item.get('title', ''))
 
 
-def parse_datetime(dt_str):
-    """解析日期时间字符串，用于排序"""
-    if not dt_str:
-        return datetime.min
-    try:
-        # 尝试解析常见格式
-        for fmt in ['%Y-%m-%d %H:%M:%S', '%Y-%m-%d %H:%M', '%Y-%m-%d']:
-            try:
-                return datetime.strptime(dt_str.strip(), fmt)
-            except ValueError:
-                continue
-        return datetime.min
-    except:
-        return datetime.min
+@lru_cache(maxsize=RENDER_CACHE_SIZE)
+def _render_card(title, link, dt, rtype, source):
+    """渲染单条新闻卡片；以新闻内容为键缓存，内容不变的新闻不会重复渲染"""
+    # Get source badge
+    config = SOURCE_CONFIG.get(source, {'name': source.upper(), 'color': '#6b7280', 'icon': source[0].upper()})
+    color = config['color']
+    icon = config['icon']
+    config_name = config['name']
+    source_badge = f"<span class='source-badge' style='background-color: {color}' title='{config_name}'>{icon}</span>"
+    
+    badge = f"<span class='badge'>{rtype}</span>" if rtype else ''
+    # escape title to avoid HTML injection; sentiment keywords are highlighted here instead of in the page script
+    safe_title = highlight_title(title)
+    return f"  <li class='card' data-source='{source}'><a href='{link}' target='_blank' rel='noopener noreferrer' class='title'>{safe_title}</a> <div class='meta'>{source_badge}{badge}<time>{dt}</time></div></li>"
 
 
 def render_html(items):
-    now = datetime.now(ZoneInfo('Asia/Shanghai')).strftime('%Y-%m-%d %H:%M:%S')
-    
-    # Source configuration with display names and icons
-    source_config = {
-        'wallstreetcn': {'name': '华尔街见闻', 'color': '#1478F0', 'icon': 'W'},
-        'reuters': {'name': '路透社', 'color': '#FF8000', 'icon': 'R'},
-    }
-    
-    # 为每条新闻添加热度分数
-    for item in items:
-        item['hotness'] = calculate_hotness(item)
-        item['datetime_obj'] = parse_datetime(item.get('datetime', ''))
-    
-    # 按时间倒序排列（第一优先级），热度相同则按热度降序排列（第二优先级）
-    sorted_items = sorted(
-        items,
-        key=lambda x: (-x['datetime_obj'].timestamp(), -x['hotness']),
-        reverse=False
-    )
-    
-    rows = []
-    rows.append(f"<ul class='cards'>")
+    """渲染完整页面"""
+    return render_page(items)[0]
+
+
+def render_page(items):
+    """
+    渲染完整页面（在内存中拼接，适合条数不多或需要直接拿到 HTML 的场景）
+    Returns:
+        (页面 HTML, 内容哈希)；内容哈希不包含生成时间，新闻不变时保持不变
+    """
+    buf = io.StringIO()
+    digest = stream_page(items, buf)
+    return buf.getvalue(), digest
+
+
+def stream_page(items, out):
+    """
+    将页面逐段写入 out（文件路径或带 write() 的对象）：页头、逐条卡片、页尾，
+    不在内存中拼出完整页面
+    Returns:
+        内容哈希
+    """
+    parts = _page_parts(items)
+    if isinstance(out, (str, os.PathLike)):
+        with open(out, 'w', encoding='utf-8') as f:
+            _write_parts(parts, f)
+    else:
+        _write_parts(parts, out)
+    return parts[3]
+
+
+def _card_fields(item):
+    return (item.title, item.link or '#', item.datetime, item.type, item.source)
+
+
+def _page_parts(items, inline_limit=None, asset_dir=None):
+    """
+    排序并准备页头/页尾模板
+    Args:
+        inline_limit: 页面内联的最多条数；为 None 时全部内联
+        asset_dir: 页面所在目录；给出时在其中写入搜索索引，以及（分片模式下）shards/ 分片
+    Returns:
+        (页头, 内联的新闻, 页尾, 内容哈希, 分片清单, 搜索索引文件名或 None)
+    内容哈希基于模板（生成时间为占位符）、每张卡片的输入字段、分片清单和索引文件名计算，
+    卡片 HTML 是这些字段的纯函数，分片和索引的文件名包含内容哈希，因此无需先渲染整页即可得到哈希
+    """
+    # 统一为 NewsItem（字典输入在此转换，ts 缺少时补上），并添加热度分数
+    items = to_items(items)
+    for item, hotness in zip(items, score(items)):
+        item.hotness = hotness
     
+    # 按时间倒序排列（第一优先级），时间相同则按热度降序排列（第二优先级）
+    sorted_items = sorted(items, key=lambda x: (x.sort_key, -x.hotness))
+
+    sharded = inline_limit is not None
+    inline_items, manifest = sorted_items, []
+    if sharded:
+        inline_items = sorted_items[:inline_limit]
+        manifest = _write_shards(sorted_items[inline_limit:], os.path.join(asset_dir or '', SHARD_DIR))
+
+    # 索引的文档 id 即在 sorted_items 中的位置：先是内联卡片，再依次是各分片中的新闻
+    index_name = None
+    search_meta = None
+    if asset_dir is not None:
+        index_name = _write_search_index(sorted_items, asset_dir)
+        search_meta = {'index': index_name}
+
+    head, tail = _page_template(len(sorted_items), sharded)
+    if sharded:
+        tail = tail.replace(_MANIFEST_PLACEHOLDER, _inline_json(manifest))
+    tail = tail.replace(_SEARCH_PLACEHOLDER, _inline_json(search_meta))
+    digest = hashlib.sha256()
+    digest.update(head.encode('utf-8'))
+    for it in inline_items:
+        digest.update('\x1f'.join(_card_fields(it)).encode('utf-8'))
+        digest.update(b'\n')
+    digest.update(tail.encode('utf-8'))
+    digest = digest.hexdigest()
+
+    generated_at = datetime.now(ZoneInfo('Asia/Shanghai')).strftime('%Y-%m-%d %H:%M:%S')
+    head = head.replace(_CONTENT_HASH_PLACEHOLDER, digest).replace(_GENERATED_AT_PLACEHOLDER, generated_at)
+    return head, inline_items, tail, digest, manifest, index_name
+
+
+def _inline_json(value):
+    # 内联在 <script> 中，转义 "</" 避免提前闭合标签
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':')).replace('</', '<\\/')
+
+
+def _write_asset(directory, name, data):
+    """写入以内容哈希命名的静态文件；同名文件已存在时内容必然相同，不重写"""
+    path = os.path.join(directory, name)
+    if not os.path.exists(path):
+        tmp = path + '.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+
+def _write_search_index(items, asset_dir):
+    """为所有新闻的标题建立搜索索引并写入 asset_dir，返回文件名"""
+    index = build_index(it.title for it in items)
+    data = json.dumps(index, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    name = f"{SEARCH_INDEX_PREFIX}{hashlib.sha256(data).hexdigest()[:12]}.json"
+    if asset_dir:
+        os.makedirs(asset_dir, exist_ok=True)
+    _write_asset(asset_dir, name, data)
+    return name
+
+
+def _write_shards(items, shard_dir):
+    """
+    将按时间倒序排列的新闻按天写成 JSON 分片（内容相同的分片文件已存在时不重写）
+    Returns:
+        分片清单 [{'day', 'file', 'count'}]，从新到旧
+    """
+    manifest = []
+    if not items:
+        return manifest
+    os.makedirs(shard_dir, exist_ok=True)
+    for day, group in itertools.groupby(items, key=lambda it: it.datetime[:10] or 'unknown'):
+        # [标题, 链接, 时间, 类型, 来源, 利好/利空词位置]
+        rows = [_card_fields(it) + (sentiment_marks(it.title),) for it in group]
+        data = json.dumps(rows, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        name = f"{day}.{hashlib.sha256(data).hexdigest()[:12]}.json"
+        _write_asset(shard_dir, name, data)
+        manifest.append({'day': day, 'file': f'{SHARD_DIR}/{name}', 'count': len(rows)})
+    return manifest
+
+
+def _prune_assets(asset_dir, manifest, index_name):
+    """删除不再被页面引用的分片和搜索索引"""
+    keep = {entry['file'].rsplit('/', 1)[-1] for entry in manifest}
+    shard_dir = os.path.join(asset_dir, SHARD_DIR)
+    for directory, prefix, keep_names in ((shard_dir, '', keep), (asset_dir or '.', SEARCH_INDEX_PREFIX, {index_name})):
+        try:
+            names = os.listdir(directory)
+        except OSError:
+            continue
+        for name in names:
+            if name.startswith(prefix) and name.endswith('.json') and name not in keep_names:
+                os.remove(os.path.join(directory, name))
+
+
+def _write_parts(parts, f):
+    head, sorted_items, tail = parts[:3]
+    f.write(head)
+    f.write("<ul class='cards'>")
     # Render all items in merged timeline
     for it in sorted_items:
-        title = it.get('title', '')
-        link = it.get('link', '#')
-        dt = it.get('datetime', '')
-        rtype = it.get('type', '')
-        source = it.get('source', 'unknown')
-        
-        # Get source badge
-        config = source_config.get(source, {'name': source.upper(), 'color': '#6b7280', 'icon': source[0].upper()})
-        color = config['color']
-        icon = config['icon']
-        config_name = config['name']
-        source_badge = f"<span class='source-badge' style='background-color: {color}' title='{config_name}'>{icon}</span>"
-        
-        badge = f"<span class='badge'>{rtype}</span>" if rtype else ''
-        # escape title to avoid HTML injection
-        safe_title = _html.escape(title)
-        rows.append(
-            f"  <li class='card' data-source='{source}'><a href='{link}' target='_blank' rel='noopener noreferrer' class='title'>{safe_title}</a> <div class='meta'>{source_badge}{badge}<time>{dt}</time></div></li>"
-        )
-    
-    rows.append(f"</ul>")
-    
-    rows_html = "\n      ".join(rows)
+        f.write(CARD_SEPARATOR)
+        f.write(_render_card(*_card_fields(it)))
+    f.write(CARD_SEPARATOR)
+    f.write("</ul>")
+    f.write(tail)
+
+
+@lru_cache(maxsize=16)
+def _page_template(count, sharded=False):
+    """页面模板，以新闻列表为界拆成 (页头, 页尾)；分片模式下页尾包含分片清单占位符和虚拟列表"""
+    rows_html = _ROWS_PLACEHOLDER
+    cjk_class = CJK_CLASS
+    archive_html = ''
+    archive_script = ''
+    if sharded:
+        archive_html = f"""
+      <div id='archiveList' class='archive'><ul class='archive-rows'></ul></div>
+      <div id='archiveSentinel' style='height:1px'></div>
+      <script type='application/json' id='shardManifest'>{_MANIFEST_PLACEHOLDER}</script>"""
+        archive_script = _archive_script()
     # Inline SVG logo
     logo_svg = """<svg xmlns='http://www.w3.org/2000/svg' width='36' height='36' viewBox='0 0 64 64' aria-hidden='true'><rect rx='8' ry='8' width='64' height='64' fill='#1478F0'/><text x='50%' y='54%' text-anchor='middle' font-family='Arial, sans-serif' font-size='28' fill='#fff' font-weight='700'>📰</text></svg>"""
     # Inline GitHub icon (monochrome; uses currentColor)
     github_svg = """<svg xmlns='http://www.w3.org/2000/svg' viewBox='0 0 24 24' width='20' height='20' aria-hidden='true' fill='currentColor'><path d='M12 .5C5.73.5.5 5.73.5 12c0 5.08 3.29 9.39 7.86 10.91.57.1.78-.25.78-.55 0-.27-.01-1-0.02-1.97-3.2.7-3.88-1.37-3.88-1.37-.52-1.33-1.26-1.69-1.26-1.69-1.03-.7.08-.69.08-.69 1.14.08 1.74 1.17 1.74 1.17 1.01 1.73 2.65 1.23 3.3.94.1-.74.4-1.23.73-1.52-2.56-.29-5.26-1.28-5.26-5.72 0-1.26.45-2.29 1.18-3.1-.12-.29-.51-1.45.11-3.02 0 0 .96-.31 3.15 1.18.92-.26 1.9-.39 2.88-.39.98 0 1.96.13 2.88.39 2.19-1.49 3.15-1.18 3.15-1.18.62 1.57.23 2.73.11 3.02.73.81 1.18 1.84 1.18 3.1 0 4.45-2.7 5.43-5.28 5.71.41.35.78 1.04.78 2.1 0 1.52-.01 2.75-.01 3.13 0 .3.21.65.79.54C20.71 21.39 24 17.08 24 12c0-6.27-5.23-11.5-12-11.5z'/></svg>"""
 
+    now = _GENERATED_AT_PLACEHOLDER
     body = f"""
 <html>
   <head>
     <meta charset='utf-8'/>
+    <meta name='content-hash' content='{_CONTENT_HASH_PLACEHOLDER}' />
     <meta name='description' content='多源财经新闻聚合 — 自动抓取并更新华尔街见闻、路透社等新闻源，展示最新财经资讯。' />
     <meta property='og:title' content='每日新闻 - 财经资讯聚合' />
     <meta property='og:description' content='多源财经新闻聚合 — 自动抓取并更新，展示最新财经资讯。' />
@@ -187,6 +343,16 @@ def render_html(items):
       }}
       ul.cards.list-view .title {{ margin-bottom: 0; flex: 1; }}
       ul.cards.list-view .meta {{ margin-left: 20px; white-space: nowrap; }}
+      /* Sentiment keywords (highlighted at build time) */
+      .kw-bull{{color:#ef4444;font-weight:800}}
+      .kw-bear{{color:#10b981;font-weight:800}}
+      /* Archived history (virtual list) */
+      .archive{{position:relative;margin-top:16px}}
+      ul.archive-rows{{list-style:none;padding:0;margin:0;position:absolute;left:0;right:0;top:0}}
+      ul.archive-rows li.card{{display:flex;justify-content:space-between;align-items:center;box-sizing:border-box;height:{ARCHIVE_ROW_HEIGHT - 4}px;margin:0 0 4px;padding:0 16px;overflow:hidden}}
+      ul.archive-rows li.card:hover{{transform:none}}
+      ul.archive-rows .title{{margin-bottom:0;flex:1;white-space:nowrap;overflow:hidden;text-overflow:ellipsis}}
+      ul.archive-rows .meta{{margin-left:20px;white-space:nowrap}}
     </style>
   </head>
   <body>
@@ -210,7 +376,7 @@ def render_html(items):
       </header>
       
       <div class='stats'>
-        <div class='stat-item'><span>📊 共</span><span class='stat-value'>{len(items)}</span><span>条新闻</span></div>
+        <div class='stat-item'><span>📊 共</span><span class='stat-value'>{count}</span><span>条新闻</span></div>
       </div>
 
       <div class='search-box'>
@@ -225,12 +391,13 @@ def render_html(items):
       </div>
 
       <div id='newsContainer' style='margin-top:24px'>
-      {rows_html}
+      {rows_html}{archive_html}
       </div>
       
       <footer><p>Made with ❤️ by Daily News Aggregator | Source: wallstreetcn.com, reuters.com</p></footer>
     </div>
     <button class='back-to-top' id='backToTop' title='回到顶部' aria-label='回到顶部'>↑</button>
+    <script type='application/json' id='searchMeta'>{_SEARCH_PLACEHOLDER}</script>
     <script>
       // Theme toggle: default to LIGHT unless user previously saved a preference
       const toggle = document.getElementById('themeToggle');
@@ -252,20 +419,93 @@ def render_html(items):
       const searchInput = document.getElementById('searchInput');
       const filterBtns = document.querySelectorAll('.filter-btn');
       const container = document.getElementById('newsContainer');
+      const cards = Array.from(container.querySelectorAll('ul.cards > li.card'));
+      const searchMeta = JSON.parse(document.getElementById('searchMeta').textContent);
       
       let currentFilter = 'all';
       let searchTerm = '';
+      let searchSeq = 0;
+      let searchTimer = null;
+      let indexPromise = null;
+
+      // Build-time inverted index (search_index.py): fetched on first use, postings are delta-encoded
+      function loadIndex() {{
+        if (!searchMeta) return Promise.resolve(null);
+        if (!indexPromise) {{
+          indexPromise = fetch(searchMeta.index).then(r => r.json()).then(data => {{
+            const postings = new Map();
+            for (const [token, deltas] of Object.entries(data.postings)) {{
+              const ids = new Array(deltas.length);
+              let id = 0;
+              for (let i = 0; i < deltas.length; i++) {{ id += deltas[i]; ids[i] = id; }}
+              postings.set(token, ids);
+            }}
+            return {{postings, words: Array.from(postings.keys())}};
+          }}).catch(() => null);
+        }}
+        return indexPromise;
+      }}
+
+      // Same tokenizer as search_index.tokenize: CJK bigrams (single chars kept), lowercase words
+      function queryTerms(q) {{
+        const terms = [];
+        for (const m of q.toLowerCase().matchAll(/[a-z0-9]+|[{cjk_class}]+/g)) {{
+          const run = m[0];
+          if (/^[a-z0-9]/.test(run) || run.length === 1) terms.push(run);
+          else for (let i = 0; i < run.length - 1; i++) terms.push(run.slice(i, i + 2));
+        }}
+        return terms;
+      }}
+
+      function lowerBound(words, term) {{
+        let lo = 0, hi = words.length;
+        while (lo < hi) {{
+          const mid = (lo + hi) >> 1;
+          if (words[mid] < term) lo = mid + 1; else hi = mid;
+        }}
+        return lo;
+      }}
+
+      // Ids of items matching every term; words match by prefix (the last one is usually still
+      // being typed), a single CJK char matches every bigram containing it. null means "all".
+      function searchIndex(index, q) {{
+        let result = null;
+        for (const term of queryTerms(q)) {{
+          let lists;
+          if (/^[a-z0-9]/.test(term)) {{
+            lists = [];
+            for (let i = lowerBound(index.words, term); i < index.words.length && index.words[i].startsWith(term); i++) {{
+              lists.push(index.postings.get(index.words[i]));
+            }}
+          }} else if (term.length === 1) {{
+            lists = index.words.filter(w => w.includes(term)).map(w => index.postings.get(w));
+          }} else {{
+            lists = [index.postings.get(term) || []];
+          }}
+          const ids = new Set();
+          lists.forEach(list => list.forEach(id => ids.add(id)));
+          result = result === null ? ids : new Set([...result].filter(id => ids.has(id)));
+          if (result.size === 0) break;
+        }}
+        return result;
+      }}
+
+      // Fallback when the page was rendered without an index asset
+      function scanCards(q) {{
+        const needle = q.toLowerCase();
+        const ids = new Set();
+        cards.forEach((card, i) => {{
+          if (card.querySelector('.title').textContent.toLowerCase().includes(needle)) ids.add(i);
+        }});
+        return ids;
+      }}
       
-      function filterNews() {{
-        const items = container.querySelectorAll('li.card');
+      function applyFilter(ids) {{
         let visibleCount = 0;
         
-        items.forEach(item => {{
-          const title = item.querySelector('.title').textContent.toLowerCase();
-          const source = item.getAttribute('data-source');
-          
-          const matchesSearch = searchTerm === '' || title.includes(searchTerm.toLowerCase());
-          const matchesFilter = currentFilter === 'all' || source === currentFilter;
+        cards.forEach((item, i) => {{
+          const matchesSearch = ids === null || ids.has(i);
+          const matchesFilter = currentFilter === 'all' || item.getAttribute('data-source') === currentFilter;
           
           if (matchesSearch && matchesFilter) {{
             item.style.display = '';
@@ -275,6 +515,8 @@ def render_html(items):
           }}
         }});
         
+        if (window.newsArchive) visibleCount += window.newsArchive.filter(ids, currentFilter);
+
         // Show empty state if no results
         if (visibleCount === 0) {{
           if (!container.querySelector('.empty-state')) {{
@@ -288,10 +530,24 @@ def render_html(items):
           if (empty) empty.remove();
         }}
       }}
+
+      function filterNews() {{
+        const seq = ++searchSeq;
+        const q = searchTerm.trim();
+        if (q === '') {{
+          applyFilter(null);
+          return;
+        }}
+        loadIndex().then(index => {{
+          if (seq === searchSeq) applyFilter(index ? searchIndex(index, q) : scanCards(q));
+        }});
+      }}
       
+      searchInput.addEventListener('focus', loadIndex, {{once: true}});
       searchInput.addEventListener('input', (e) => {{
         searchTerm = e.target.value;
-        filterNews();
+        clearTimeout(searchTimer);
+        searchTimer = setTimeout(filterNews, {SEARCH_DEBOUNCE_MS});
       }});
       
       filterBtns.forEach(btn => {{
@@ -360,42 +616,159 @@ def render_html(items):
         backToTopBtn.addEventListener('click', function(){{
           window.scrollTo({{top: 0, behavior: 'smooth'}});
         }});
-      }})();
-
-      // Sentiment highlighting: highlight keywords in titles with colors
-      (function(){{
-        const bullishWords = ['暴涨', '新高', '大涨', '突破', '获批', '增长', '牛市', '飙升', '高歌', '反弹', '创纪录', '刷新', '激增', '狂涨', '飞升', 'Surge', 'Jump', 'Record', 'Bull', 'Gain', 'Rally', 'Soar', 'Boom', 'surge', 'jump', 'record', 'bull', 'gain', 'rally', 'soar', 'boom'];
-        const bearishWords = ['暴跌', '崩盘', '调查', '制裁', '警告', '衰退', '下跌', '跌停', '腰斩', '暴降', '崩溃', '风险', '亏损', 'Plunge', 'Crash', 'Probe', 'Sanction', 'Warn', 'Recession', 'Decline', 'Fall', 'Slump', 'Loss', 'Risk', 'plunge', 'crash', 'probe', 'sanction', 'warn', 'recession', 'decline', 'fall', 'slump', 'loss', 'risk'];
-        
-        document.querySelectorAll('.title').forEach(link => {{
-          let html = link.innerHTML;
-          
-          bullishWords.forEach(word => {{
-            html = html.replace(new RegExp(word, 'gi'), `<span style="color:#ef4444;font-weight:800">${{word}}</span>`);
-          }});
-          
-          bearishWords.forEach(word => {{
-            html = html.replace(new RegExp(word, 'gi'), `<span style="color:#10b981;font-weight:800">${{word}}</span>`);
-          }});
-          
-          link.innerHTML = html;
-        }});
-      }})();
+      }})();{archive_script}
     </script>
   </body>
 </html>
 """
-    return body
+    head, tail = body.split(_ROWS_PLACEHOLDER)
+    return head, tail
+
+
+def _archive_script():
+    """虚拟列表脚本：按需加载分片，只渲染视口附近的行；搜索结果和来源过滤作用于已加载的分片"""
+    source_config = json.dumps(SOURCE_CONFIG, ensure_ascii=False)
+    return f"""
+
+      // Archived history: per-day JSON shards loaded on scroll into a virtual list
+      (function(){{
+        const manifestEl = document.getElementById('shardManifest');
+        const box = document.getElementById('archiveList');
+        const sentinel = document.getElementById('archiveSentinel');
+        if(!manifestEl || !box) return;
+        const shards = JSON.parse(manifestEl.textContent);
+        const SOURCES = {source_config};
+        const ROW_H = {ARCHIVE_ROW_HEIGHT}, OVERSCAN = 10;
+        const rows = box.querySelector('ul');
+        let loaded = [], visible = [], next = 0, loading = false, matchIds = null, source = 'all';
+        // Search index ids continue after the inline cards, in manifest order
+        const offsets = [];
+        let offset = document.querySelectorAll('ul.cards > li.card').length;
+        shards.forEach(shard => {{ offsets.push(offset); offset += shard.count; }});
+
+        function esc(s){{
+          return String(s).replace(/[&<>"']/g, c => ({{'&':'&amp;','<':'&lt;','>':'&gt;','"':'&quot;',"'":'&#x27;'}})[c]);
+        }}
+        // Title with build-time sentiment marks: flat [start, end, kind, ...] in UTF-16 offsets
+        function titleHtml(title, marks){{
+          let html = '', pos = 0;
+          for(let i = 0; i < marks.length; i += 3){{
+            html += esc(title.slice(pos, marks[i])) + `<span class='kw-${{marks[i + 2]}}'>${{esc(title.slice(marks[i], marks[i + 1]))}}</span>`;
+            pos = marks[i + 1];
+          }}
+          return html + esc(title.slice(pos));
+        }}
+        // Same markup as the inline cards: [title, link, datetime, type, source, marks]
+        function rowHtml(it){{
+          const [title, link, dt, type, src, marks] = it;
+          const c = SOURCES[src] || {{name: src.toUpperCase(), color: '#6b7280', icon: src.charAt(0).toUpperCase()}};
+          const badge = type ? `<span class='badge'>${{esc(type)}}</span>` : '';
+          return `<li class='card' data-source='${{esc(src)}}'><a href='${{esc(link)}}' target='_blank' rel='noopener noreferrer' class='title'>${{titleHtml(title, marks)}}</a> <div class='meta'><span class='source-badge' style='background-color: ${{c.color}}' title='${{c.name}}'>${{c.icon}}</span>${{badge}}<time>${{esc(dt)}}</time></div></li>`;
+        }}
+        function render(){{
+          box.style.height = (visible.length * ROW_H) + 'px';
+          const offset = -box.getBoundingClientRect().top;
+          const start = Math.max(0, Math.floor(offset / ROW_H) - OVERSCAN);
+          const end = Math.min(visible.length, Math.ceil((offset + window.innerHeight) / ROW_H) + OVERSCAN);
+          rows.style.transform = `translateY(${{start * ROW_H}}px)`;
+          rows.innerHTML = start < end ? visible.slice(start, end).map(rowHtml).join('') : '';
+        }}
+        function matches(it){{
+          return (source === 'all' || it[4] === source) && (matchIds === null || matchIds.has(it[6]));
+        }}
+        function refilter(){{
+          visible = loaded.filter(matches);
+          render();
+          return visible.length;
+        }}
+        function loadNext(){{
+          if(loading || next >= shards.length) return;
+          loading = true;
+          const k = next++;
+          fetch(shards[k].file).then(r => r.json()).then(items => {{
+            items.forEach((it, j) => it.push(offsets[k] + j));
+            loaded = loaded.concat(items);
+            refilter();
+          }}).catch(() => {{}}).finally(() => {{
+            loading = false;
+            if(next >= shards.length) sentinel.remove();
+            else if(sentinel.getBoundingClientRect().top < window.innerHeight * 2) loadNext();
+          }});
+        }}
+
+        new IntersectionObserver(entries => {{
+          if(entries.some(e => e.isIntersecting)) loadNext();
+        }}, {{rootMargin: '600px'}}).observe(sentinel);
+        let ticking = false;
+        window.addEventListener('scroll', () => {{
+          if(ticking) return;
+          ticking = true;
+          requestAnimationFrame(() => {{ ticking = false; render(); }});
+        }}, {{passive: true}});
+        window.newsArchive = {{
+          filter(ids, s){{ matchIds = ids; source = s; return refilter(); }}
+        }};
+      }})();"""
+
+
+def read_content_hash(path):
+    """读取已有页面中的内容哈希，文件不存在或没有哈希时返回 None"""
+    try:
+        with open(path, encoding='utf-8') as f:
+            head = f.read(4096)
+    except OSError:
+        return None
+    match = _CONTENT_HASH_RE.search(head)
+    return match.group(1) if match else None
+
+
+def write_page(path, items, inline_limit=None):
+    """
+    流式写入页面；内容哈希与已有页面相同时跳过（先写临时文件再替换）
+    Args:
+        inline_limit: 页面内联的最多条数，其余按天写入与页面同目录的 shards/ 分片；
+                      为 None 时全部内联
+    同时在页面所在目录写入搜索索引 search-index.<哈希>.json
+    Returns:
+        是否写入了文件
+    """
+    asset_dir = os.path.dirname(path)
+    parts = _page_parts(items, inline_limit, asset_dir)
+    if read_content_hash(path) == parts[3]:
+        return False
+    d = os.path.dirname(path)
+    if d:
+        os.makedirs(d, exist_ok=True)
+    tmp = path + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        _write_parts(parts, f)
+    os.replace(tmp, path)
+    _prune_assets(asset_dir, parts[4], parts[5])
+    return True
 
 
 def main():
+    parser = argparse.ArgumentParser(description='Fetch news and render docs/index.html')
+    parser.add_argument('--history-days', type=int, default=HISTORY_DAYS, help='Days of history to publish')
+    parser.add_argument('--max-items', type=int, default=MAX_ITEMS, help='Maximum number of items to publish')
+    parser.add_argument('--inline-items', type=int, default=None,
+                        help='Render only the newest N items inline; older items go to per-day JSON shards')
+    args = parser.parse_args()
+
     print("=" * 60, file=sys.stderr)
     print("开始生成新闻页面...", file=sys.stderr)
     print("=" * 60, file=sys.stderr)
     
-    items = fetch_all_news(use_cache=False)
+    # 只把新增部分写入本地存储，页面展示最近几天累积的新闻
+    store = NewsStore()
+    new_items = get_aggregator().ingest(store, use_cache=False, concurrent=True,
+                                        source_timeout=SOURCE_TIMEOUT)
+    print(f"\n本次新增 {len(new_items)} 条新闻", file=sys.stderr)
+
+    # 不同批次入库的同一条新闻（如先后出现在不同来源）在此合并，保留最新的一条
+    items = dedup(store.recent(days=args.history_days, limit=args.max_items))
     
-    print(f"\n总计获取 {len(items)} 条新闻:", file=sys.stderr)
+    print(f"\n最近 {args.history_days} 天共 {len(items)} 条新闻:", file=sys.stderr)
     
     # 按来源统计
     sources = {}
@@ -410,13 +783,12 @@ def main():
         print("\n警告: 未获取到任何新闻!", file=sys.stderr)
     
     print(f"\n正在生成 HTML...", file=sys.stderr)
-    html = render_html(items)
-    os.makedirs('docs', exist_ok=True)
     path = os.path.join('docs', 'index.html')
-    with open(path, 'w', encoding='utf-8') as f:
-        f.write(html)
-    print(f"✓ 已保存到 {path}", file=sys.stderr)
-    print(f"✓ 包含 {len(items)} 条新闻", file=sys.stderr)
+    if write_page(path, items, inline_limit=args.inline_items):
+        print(f"✓ 已保存到 {path}", file=sys.stderr)
+        print(f"✓ 包含 {len(items)} 条新闻", file=sys.stderr)
+    else:
+        print(f"✓ 新闻内容未变化，跳过写入 {path}", file=sys.stderr)
     print("=" * 60, file=sys.stderr)
 
 
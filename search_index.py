@@ -0,0 +1,51 @@
+"""
+页面搜索索引
+在生成页面时为所有标题建立倒排索引，写成与 docs/index.html 同目录的 JSON 文件，
+浏览器端只需查索引，不必在每次输入时遍历所有卡片。
+
+分词规则（页面脚本中的 queryTerms 与此保持一致）：
+- 中文（CJK 统一表意文字）连续段按字符二元组切分，单字段保留为单字
+- 英文和数字按单词切分并转为小写
+其他字符（标点、空白等）只作为分隔符
+"""
+import re
+from typing import Dict, Iterable, Iterator, List
+
+INDEX_VERSION = 1
+# 中文字符范围（同时用于页面脚本中的正则）
+CJK_CLASS = r'\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff'
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+|[' + CJK_CLASS + r']+')
+
+
+def tokenize(text: str) -> Iterator[str]:
+    """切分标题，可能产生重复的词"""
+    for match in TOKEN_PATTERN.finditer(text.lower()):
+        run = match.group()
+        if run[0].isascii() or len(run) == 1:
+            yield run
+        else:
+            for i in range(len(run) - 1):
+                yield run[i:i + 2]
+
+
+def build_index(titles: Iterable[str]) -> Dict:
+    """
+    建立倒排索引
+    Args:
+        titles: 按页面顺序排列的标题，序号即文档 id
+    Returns:
+        {'v': 版本, 'size': 文档数, 'postings': {词: 差分编码的文档 id 列表}}
+        词按字典序排列，文档 id 递增，列表中存相邻 id 的差值以减小体积
+    """
+    postings: Dict[str, List[int]] = {}
+    size = 0
+    for doc_id, title in enumerate(titles):
+        size += 1
+        for token in set(tokenize(title)):
+            postings.setdefault(token, []).append(doc_id)
+
+    encoded = {}
+    for token in sorted(postings):
+        ids = postings[token]
+        encoded[token] = [ids[0]] + [ids[i] - ids[i - 1] for i in range(1, len(ids))]
+    return {'v': INDEX_VERSION, 'size': size, 'postings': encoded}
@@ -0,0 +1,161 @@
+"""
+已入库链接的布隆过滤器
+路透社栏目页会连续多天重复列出同一批长期置顶/解读类文章，且这些文章没有 <time>，
+每次都会被当作“当前时间”的新新闻。新闻入库时把链接记入过滤器，
+来源在提取标题和时间之前先查过滤器，直接跳过已入库的链接。
+
+- 每天一个文件 YYYY-MM-DD.bloom，通过 mmap 访问，查询只读几个字节，无需把整个文件读入内存
+- 查询时检查最近 keep_days 天的文件，写入只写当天的文件，更早的文件自动删除
+- 布隆过滤器没有漏报，误报率约为 error_rate（误报时一条新链接会被跳过）
+
+文件格式: 16 字节文件头（b'BLM1'、哈希函数个数 uint32、位数 uint64，小端）+ 位数组
+"""
+import hashlib
+import math
+import mmap
+import os
+import struct
+import threading
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterable, Optional
+from zoneinfo import ZoneInfo
+
+from dedup import canonical_url
+
+MAGIC = b'BLM1'
+HEADER = struct.Struct('<4sIQ')
+# 单日文件的容量与误报率：约 48 KiB
+DEFAULT_CAPACITY = 20000
+DEFAULT_ERROR_RATE = 1e-4
+DEFAULT_KEEP_DAYS = 7
+SUFFIX = '.bloom'
+
+
+def _today() -> str:
+    return datetime.now(ZoneInfo('Asia/Shanghai')).strftime('%Y-%m-%d')
+
+
+class BloomFile:
+    """单个 mmap 布隆过滤器文件"""
+
+    def __init__(self, path: str, capacity: int = DEFAULT_CAPACITY, error_rate: float = DEFAULT_ERROR_RATE):
+        self.path = path
+        if not os.path.exists(path):
+            bits = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+            hashes = max(1, round(bits / capacity * math.log(2)))
+            tmp = path + '.tmp'
+            with open(tmp, 'wb') as f:
+                f.write(HEADER.pack(MAGIC, hashes, bits))
+                f.truncate(HEADER.size + (bits + 7) // 8)
+            os.replace(tmp, path)
+        with open(path, 'r+b') as f:
+            self._map = mmap.mmap(f.fileno(), 0)
+        magic, self.hashes, self.bits = HEADER.unpack_from(self._map)
+        if magic != MAGIC or len(self._map) < HEADER.size + (self.bits + 7) // 8:
+            self._map.close()
+            raise ValueError(f"不是有效的布隆过滤器文件: {path}")
+
+    def _positions(self, key: bytes) -> Iterable[int]:
+        # 双重哈希：由两个 64 位哈希组合出 hashes 个位置
+        digest = hashlib.blake2b(key, digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        for i in range(self.hashes):
+            yield (h1 + i * h2) % self.bits
+
+    def __contains__(self, key: bytes) -> bool:
+        data = self._map
+        for pos in self._positions(key):
+            if not data[HEADER.size + (pos >> 3)] >> (pos & 7) & 1:
+                return False
+        return True
+
+    def add(self, key: bytes) -> None:
+        data = self._map
+        for pos in self._positions(key):
+            offset = HEADER.size + (pos >> 3)
+            data[offset] |= 1 << (pos & 7)
+
+    def flush(self) -> None:
+        self._map.flush()
+
+    def close(self) -> None:
+        if not self._map.closed:
+            self._map.close()
+
+
+class SeenFilter:
+    """
+    按天轮换的已见链接过滤器
+    链接先经过 dedup.canonical_url 规范化，跟踪参数或栏目路径不同的同一篇文章视为同一链接
+    """
+
+    def __init__(self, root: str, keep_days: int = DEFAULT_KEEP_DAYS, capacity: int = DEFAULT_CAPACITY,
+                 error_rate: float = DEFAULT_ERROR_RATE, today: Callable[[], str] = _today):
+        self.root = root
+        self.keep_days = keep_days
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.today = today
+        self._lock = threading.Lock()
+        self._files: Dict[str, BloomFile] = {}
+        self._day: Optional[str] = None
+        os.makedirs(root, exist_ok=True)
+
+    def _rotate(self) -> str:
+        """日期变化时打开当天的文件，关闭并删除超出保留天数的文件"""
+        day = self.today()
+        if day == self._day:
+            return day
+        oldest = (datetime.strptime(day, '%Y-%m-%d') - timedelta(days=self.keep_days - 1)).strftime('%Y-%m-%d')
+        for name in os.listdir(self.root):
+            if not name.endswith(SUFFIX):
+                continue
+            file_day = name[:-len(SUFFIX)]
+            if file_day < oldest:
+                bloom = self._files.pop(file_day, None)
+                if bloom is not None:
+                    bloom.close()
+                os.remove(os.path.join(self.root, name))
+            elif file_day not in self._files and file_day <= day:
+                try:
+                    self._files[file_day] = BloomFile(os.path.join(self.root, name))
+                except (OSError, ValueError):
+                    continue
+        if day not in self._files:
+            self._files[day] = BloomFile(os.path.join(self.root, day + SUFFIX), self.capacity, self.error_rate)
+        self._day = day
+        return day
+
+    @staticmethod
+    def _key(link: str) -> bytes:
+        return canonical_url(link).encode('utf-8')
+
+    def seen(self, link: str) -> bool:
+        """链接是否在最近 keep_days 天内入库过（可能误报，不会漏报）"""
+        if not link:
+            return False
+        key = self._key(link)
+        with self._lock:
+            self._rotate()
+            return any(key in bloom for bloom in self._files.values())
+
+    def add(self, links: Iterable[str]) -> None:
+        """记录一批已入库的链接（写入当天的文件）"""
+        with self._lock:
+            bloom = self._files[self._rotate()]
+            for link in links:
+                if link:
+                    bloom.add(self._key(link))
+
+    def flush(self) -> None:
+        with self._lock:
+            for bloom in self._files.values():
+                bloom.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            for bloom in self._files.values():
+                bloom.close()
+            self._files.clear()
+            self._day = None
@@ -0,0 +1,90 @@
+"""
+新闻源注册表
+新闻源按名称注册为 'module:attr' 字符串（或可调用对象），第一次使用时才导入对应模块，
+只用到一个来源时不必导入其他来源的依赖（requests、bs4 等）。
+
+第三方包可以通过 entry points 注册新闻源，无需修改本项目:
+
+    [project.entry-points."daily_news.sources"]
+    mysource = "mypackage.sources:MySource"
+
+注册的对象被调用（无参数）后应返回 news_aggregator.NewsSource 实例。
+"""
+import importlib
+import sys
+import threading
+from typing import Any, Callable, Dict, List, Union
+
+ENTRY_POINT_GROUP = 'daily_news.sources'
+
+# 内置来源（顺序即默认聚合器中的顺序）
+BUILTIN_SOURCES = {
+    'wallstreetcn': 'news_aggregator:WallStreetCNSource',
+    'wallstreetcn_live': 'news_aggregator:WallStreetCNLiveSource',
+    'reuters': 'news_aggregator:ReutersSource',
+}
+
+_registry: Dict[str, Union[str, Callable[[], Any]]] = dict(BUILTIN_SOURCES)
+_lock = threading.Lock()
+_entry_points_loaded = False
+
+
+def register_source(name: str, target: Union[str, Callable[[], Any]]) -> None:
+    """
+    注册新闻源，同名时覆盖
+    Args:
+        target: 'module:attr'（使用时才导入）或返回 NewsSource 实例的可调用对象（如类）
+    """
+    with _lock:
+        _registry[name] = target
+
+
+def _load_entry_points() -> None:
+    """首次需要完整列表时扫描 entry points（只扫描一次；已显式注册的名称不会被覆盖）"""
+    global _entry_points_loaded
+    if _entry_points_loaded:
+        return
+    _entry_points_loaded = True
+    from importlib.metadata import entry_points
+    try:
+        found = entry_points(group=ENTRY_POINT_GROUP)
+    except Exception as e:
+        print(f"[来源] 读取 entry points 失败: {type(e).__name__}: {e}", file=sys.stderr)
+        return
+    for ep in found:
+        with _lock:
+            _registry.setdefault(ep.name, ep.value)
+
+
+def available_sources() -> List[str]:
+    """所有已注册的来源名称（内置来源在前）"""
+    _load_entry_points()
+    with _lock:
+        return list(_registry)
+
+
+def _resolve(target: Union[str, Callable[[], Any]]) -> Callable[[], Any]:
+    if not isinstance(target, str):
+        return target
+    module_name, _, attr = target.partition(':')
+    obj = importlib.import_module(module_name)
+    for part in attr.split('.') if attr else ():
+        obj = getattr(obj, part)
+    return obj
+
+
+def create_source(name: str):
+    """
+    创建指定名称的新闻源实例
+    Raises:
+        ValueError: 未注册的名称
+    """
+    with _lock:
+        target = _registry.get(name)
+    if target is None:
+        _load_entry_points()
+        with _lock:
+            target = _registry.get(name)
+    if target is None:
+        raise ValueError(f"未知的新闻源: {name}")
+    return _resolve(target)()
@@ -0,0 +1,46 @@
+import random
+
+from dedup import SimHashIndex, canonical_url, dedup, simhash
+
+
+def test_canonical_url_strips_tracking_and_sections():
+    assert canonical_url('https://www.reuters.com/markets/asia/fed-cuts-2024-05-01/?utm_source=x&spm=1#top') == \
+        'https://reuters.com/fed-cuts-2024-05-01'
+    assert canonical_url('http://wallstreetcn.com/articles/123/?id=5&from=rss') == \
+        'https://wallstreetcn.com/articles/123?id=5'
+    assert canonical_url('https://wallstreetcn.com/articles/123') != canonical_url('https://wallstreetcn.com/livenews/123')
+    assert canonical_url('') == ''
+
+
+def test_simhash_ignores_punctuation_and_case():
+    assert simhash('美联储宣布降息25个基点！') == simhash('美联储宣布降息 25 个基点')
+    assert simhash('Fed Cuts Rates') == simhash('fed cuts rates.')
+    assert simhash('！？') == 0
+
+
+def test_simhash_index_matches_brute_force():
+    rng = random.Random(7)
+    index = SimHashIndex(max_distance=3)
+    stored = []
+    for i in range(2000):
+        fp = rng.getrandbits(64)
+        index.add(fp, i)
+        stored.append(fp)
+    for _ in range(300):
+        base = rng.choice(stored)
+        query = base
+        for bit in rng.sample(range(64), rng.randint(0, 5)):
+            query ^= 1 << bit
+        expected = [i for i, fp in enumerate(stored) if bin(fp ^ query).count('1') <= 3]
+        found = index.find(query)
+        assert (found is not None) == bool(expected)
+        assert found is None or found in expected
+
+
+def test_dedup_keeps_first_occurrence():
+    items = [{'title': '美联储宣布降息25个基点', 'link': 'https://a/1'},
+             {'title': '苹果发布新款 iPhone', 'link': 'https://a/1/?utm_medium=x'},
+             {'title': '美联储宣布降息 25 个基点！', 'link': 'https://b/1'},
+             {'title': '苹果发布新款 iPhone', 'link': 'https://b/2'},
+             {'title': '油价下跌', 'link': 'https://b/3'}]
+    assert [it['link'] for it in dedup(items)] == ['https://a/1', 'https://b/2', 'https://b/3']
@@ -0,0 +1,100 @@
+import scripts.generate_news_page as page
+
+
+def make(title, dt, source='reuters'):
+    return {'title': title, 'datetime': dt, 'link': f'https://example.com/{title}',
+            'source': source, 'type': 'article'}
+
+
+def test_content_hash_ignores_generation_time(monkeypatch):
+    items = [make('美联储宣布降息', '2024-01-02 08:00:00'), make('<b>tag</b>', '2024-01-01 08:00:00')]
+    html1, digest1 = page.render_page([dict(i) for i in items])
+    html2, digest2 = page.render_page([dict(i) for i in items])
+    assert digest1 == digest2
+    assert f"<meta name='content-hash' content='{digest1}' />" in html1
+    assert '&lt;b&gt;tag&lt;/b&gt;' in html1
+    assert '\x00' not in html1
+    assert html1.index('美联储宣布降息') < html1.index('&lt;b&gt;tag')
+
+    _, digest3 = page.render_page([dict(i) for i in items[:1]])
+    assert digest3 != digest1
+
+
+def test_cards_are_memoized():
+    page._render_card.cache_clear()
+    items = [make('a', '2024-01-01 08:00:00'), make('b', '2024-01-01 09:00:00')]
+    page.render_page([dict(i) for i in items])
+    page.render_page([dict(i) for i in items] + [make('c', '2024-01-01 10:00:00')])
+    info = page._render_card.cache_info()
+    assert info.hits == 2
+    assert info.misses == 3
+
+
+def test_write_page_skips_unchanged(tmp_path):
+    path = str(tmp_path / 'docs' / 'index.html')
+    assert page.write_page(path, [make('a', '2024-01-01 08:00:00')])
+    digest = page.read_content_hash(path)
+    assert digest
+    mtime = (tmp_path / 'docs' / 'index.html').stat().st_mtime_ns
+
+    assert not page.write_page(path, [make('a', '2024-01-01 08:00:00')])
+    assert (tmp_path / 'docs' / 'index.html').stat().st_mtime_ns == mtime
+
+    assert page.write_page(path, [make('b', '2024-01-01 09:00:00')])
+    assert page.read_content_hash(path) != digest
+
+
+def test_stream_page_matches_render_page(tmp_path):
+    items = [make(f'title {i}', f'2024-01-01 {i % 24:02d}:00:00') for i in range(50)]
+    html, digest = page.render_page([dict(i) for i in items])
+    path = tmp_path / 'index.html'
+    assert page.stream_page([dict(i) for i in items], str(path)) == digest
+    streamed = path.read_text(encoding='utf-8')
+    # 只有生成时间可能不同
+    assert streamed.split('更新时间')[1][30:] == html.split('更新时间')[1][30:]
+    assert streamed.split('更新时间')[0] == html.split('更新时间')[0]
+
+
+def test_sharded_output_inlines_newest_and_prunes_old_shards(tmp_path):
+    import json
+    items = [make(f'title {i}', f'2024-01-0{1 + i % 3} {i % 24:02d}:00:00') for i in range(30)]
+    path = str(tmp_path / 'index.html')
+    assert page.write_page(path, [dict(i) for i in items], inline_limit=5)
+    html = (tmp_path / 'index.html').read_text(encoding='utf-8')
+    assert html.count("href='https://example.com/") == 5
+
+    manifest = json.loads(html.split("id='shardManifest'>")[1].split('</script>')[0])
+    assert [entry['day'] for entry in manifest] == ['2024-01-03', '2024-01-02', '2024-01-01']
+    assert sum(entry['count'] for entry in manifest) == 25
+    archived = []
+    for entry in manifest:
+        archived += json.loads((tmp_path / entry['file']).read_text(encoding='utf-8'))
+    assert len({row[1] for row in archived}) == 25
+    assert [row[2] for row in archived] == sorted((row[2] for row in archived), reverse=True)
+
+    # 内容不变时不重写；旧分片在页面更新后被清理
+    assert not page.write_page(path, [dict(i) for i in items], inline_limit=5)
+    assert page.write_page(path, [dict(i) for i in items[:10]], inline_limit=5)
+    assert len(list((tmp_path / 'shards').iterdir())) == len(
+        json.loads((tmp_path / 'index.html').read_text(encoding='utf-8')
+                   .split("id='shardManifest'>")[1].split('</script>')[0]))
+
+
+def test_write_page_publishes_search_index(tmp_path):
+    import json
+    items = [make(f'美联储 降息 {i}', f'2024-01-01 {i:02d}:00:00') for i in range(6)]
+    path = str(tmp_path / 'index.html')
+    page.write_page(path, [dict(i) for i in items], inline_limit=2)
+    html = (tmp_path / 'index.html').read_text(encoding='utf-8')
+    meta = json.loads(html.split("id='searchMeta'>")[1].split('</script>')[0])
+    index = json.loads((tmp_path / meta['index']).read_text(encoding='utf-8'))
+    assert index['size'] == 6
+    assert index['postings']['降息'] == [0, 1, 1, 1, 1, 1]
+
+    # 页面更新后旧索引被清理
+    page.write_page(path, [dict(i) for i in items[:3]], inline_limit=2)
+    assert len(list(tmp_path.glob('search-index.*.json'))) == 1
+
+    # 不经过 write_page 渲染时没有索引，页面脚本退回到遍历卡片
+    html, _ = page.render_page([dict(i) for i in items])
+    assert "id='searchMeta'>null</script>" in html
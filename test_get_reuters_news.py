@@ -0,0 +1,167 @@
+import os
+import threading
+import time
+
+import get_reuters_news as reuters
+
+FIXTURE = os.path.join(os.path.dirname(__file__), 'fixtures', 'reuters_section.html')
+
+
+class FakeResponse:
+    def __init__(self, content, status_code=200):
+        self.content = content
+        self.status_code = status_code
+        self.encoding = None
+        self.headers = {}
+
+    @property
+    def text(self):
+        return self.content.decode(self.encoding or 'utf-8')
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise reuters.requests.HTTPError(f'{self.status_code} error')
+
+
+class FakeSession:
+    """按 URL 返回固定页面，并记录并发请求数"""
+
+    def __init__(self, pages, delay=0.0):
+        self.pages = pages
+        self.delay = delay
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def mount(self, prefix, adapter):
+        pass
+
+    def get(self, url, headers=None, timeout=None, **kwargs):
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(self.delay)
+            page = self.pages.get(url)
+            if page is None:
+                raise reuters.requests.ConnectionError(f'cannot reach {url}')
+            return FakeResponse(page)
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+def load_fixture():
+    with open(FIXTURE, 'rb') as f:
+        return f.read()
+
+
+def test_fetch_section_parses_fixture():
+    session = FakeSession({'https://www.reuters.com/world': load_fixture()})
+    items = reuters._fetch_section(session, 'https://www.reuters.com/world', {})
+    by_link = {it['link']: it for it in items}
+    hero = by_link['https://www.reuters.com/world/europe/eu-leaders-agree-new-sanctions-package-2024-05-14/']
+    assert hero['title'] == 'EU leaders agree new sanctions package after marathon talks'
+    # <div> 卡片容器中的 <time> 同样生效
+    assert hero['datetime'] == '2024-05-14 16:31:00'
+    card = by_link['https://www.reuters.com/business/autos-transportation/carmaker-recalls-vehicles-2024-05-13/']
+    assert card['datetime'] == '2024-05-14 06:40:00'
+    assert 'https://www.reuters.com/world/tiny/' not in by_link
+    assert all(it['source'] == 'reuters' and it['type'] == 'article' for it in items)
+
+
+def test_sections_are_fetched_concurrently(monkeypatch):
+    page = load_fixture()
+    urls = ['https://www.reuters.com/world', 'https://www.reuters.com/business',
+            'https://www.reuters.com/markets', 'https://www.reuters.com/finance',
+            'https://www.reuters.com/technology']
+    session = FakeSession({url: page for url in urls[:-1]}, delay=0.3)
+    monkeypatch.setattr(reuters, 'get_session', lambda **kwargs: session)
+
+    start = time.monotonic()
+    items = reuters.get_reuters_news(use_cache=False)
+    elapsed = time.monotonic() - start
+
+    assert session.max_active > 1
+    assert elapsed < 1.0
+    # 去重后与单个页面的解析结果一致
+    assert [it['title'] for it in items] == [it['title'] for it in reuters._fetch_section(
+        FakeSession({urls[0]: page}), urls[0], {})]
+
+
+def test_stream_parser_matches_beautifulsoup_on_fixtures():
+    import glob
+    from reuters_extract import extract_candidates
+
+    fixtures = sorted(glob.glob(os.path.join(os.path.dirname(FIXTURE), 'reuters_*.html')))
+    assert len(fixtures) >= 3
+    for path in fixtures:
+        with open(path, 'rb') as f:
+            content = f.read()
+        assert extract_candidates(content) == reuters._soup_candidates(content, path), path
+
+
+def test_soup_containers_are_resolved_in_one_pass(monkeypatch):
+    from bs4 import Tag
+
+    def no_parent_walks(*args, **kwargs):
+        raise AssertionError('find_parent called per link')
+
+    monkeypatch.setattr(Tag, 'find_parent', no_parent_walks)
+    assert reuters._soup_candidates(load_fixture(), FIXTURE) == reuters.extract_candidates(load_fixture())
+
+def test_embedded_json_is_preferred_over_dom():
+    path = os.path.join(os.path.dirname(FIXTURE), 'reuters_fusion.html')
+    with open(path, 'rb') as f:
+        items = reuters._parse_section(f.read(), path)
+    assert [(it['title'], it['datetime']) for it in items] == [
+        ('Wall Street ends higher as tech rally broadens', '2024-05-15 04:05:00'),
+        ('Gold hits record as "safe haven" demand surges', '2024-05-14 19:00:00'),
+        ('ECB signals June cut', '2024-05-13 17:15:00'),
+    ]
+    assert items[0]['link'] == 'https://www.reuters.com/markets/us/wall-street-ends-higher-tech-rally-2024-05-14/'
+    assert items[2]['link'] == 'https://www.reuters.com/markets/europe/ecb-signals-june-cut-2024-05-13/'
+
+
+def test_next_data_headlines_and_dom_fallback():
+    path = os.path.join(os.path.dirname(FIXTURE), 'reuters_next_data.html')
+    with open(path, 'rb') as f:
+        items = reuters._parse_section(f.read(), path)
+    assert [it['title'] for it in items] == ['Leaders meet for climate summit in Baku']
+    # 没有内嵌数据时退回 DOM 提取
+    assert len(reuters._parse_section(load_fixture(), FIXTURE)) == 8
+
+
+def test_seen_links_are_skipped_before_extraction(tmp_path):
+    from seen_filter import SeenFilter
+
+    items = reuters._parse_section(load_fixture(), FIXTURE)
+    seen = SeenFilter(str(tmp_path), today=lambda: '2024-05-01')
+    seen.add(it['link'] for it in items[:3])
+    for parser in ('stream', 'bs4'):
+        remaining = reuters._parse_section(load_fixture(), FIXTURE, parser, seen_filter=seen)
+        assert [it['link'] for it in remaining] == [it['link'] for it in items[3:]]
+    seen.close()
+
+
+def test_seen_filter_only_trims_the_result_not_the_cache(tmp_path, monkeypatch, capsys, memory_cache):
+    from seen_filter import SeenFilter
+
+    items = reuters._parse_section(load_fixture(), FIXTURE)
+    seen = SeenFilter(str(tmp_path), today=lambda: '2024-05-01')
+    seen.add(it['link'] for it in items)
+
+    url = 'https://www.reuters.com/world'
+    monkeypatch.setattr(reuters, 'get_session', lambda **kwargs: FakeSession({url: load_fixture()}))
+    memory_cache.set(reuters.CACHE_KEY, items[:1])
+    # 所有链接都已入库：返回空列表，不输出诊断信息，也不返回过期缓存
+    assert reuters.get_reuters_news(use_cache=True, cache_ttl=0, seen_filter=seen) == []
+    err = capsys.readouterr().err
+    assert f'跳过 {len(items)} 个已入库的链接' in err
+    assert '未获取到任何新闻' not in err
+
+    # 缓存中保存的是未过滤的结果，不带过滤器的调用仍能拿到全部新闻
+    assert [it['link'] for it in memory_cache.get(reuters.CACHE_KEY)] == [it['link'] for it in items]
+    assert reuters.get_reuters_news(use_cache=True) == memory_cache.get(reuters.CACHE_KEY)
+    assert reuters.get_reuters_news(use_cache=True, seen_filter=seen) == []
+    seen.close()
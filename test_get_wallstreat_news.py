@@ -2,6 +2,7 @@ import re
 from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
 from get_wallstreat_news import get_wallstreetcn_news, save_links_to_file
+import get_wallstreat_news as wscn
 
 def test_fetch_and_datetime_format():
     news = get_wallstreetcn_news(use_cache=False)
@@ -42,6 +43,101 @@ def test_save_links_to_file(tmp_path):
     assert text == ['https://wallstreetcn.com/a', 'https://wallstreetcn.com/b']
 
 
+class FakeResponse:
+    def __init__(self, payload=None, text=None, status_code=200):
+        self.payload = payload
+        self.text = text
+        self.status_code = status_code
+        self.headers = {}
+        self.encoding = None
+
+    def json(self):
+        return self.payload
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise wscn.requests.HTTPError(str(self.status_code))
+
+
+class FakeWSCNSession:
+    """模拟 information-flow 分页 API，记录请求过的 URL"""
+
+    def __init__(self, pages, api_fails=False, page_html=''):
+        self.pages = pages
+        self.api_fails = api_fails
+        self.page_html = page_html
+        self.calls = []
+
+    def get(self, url, params=None, headers=None, timeout=None):
+        self.calls.append((url, dict(params or {})))
+        if url == wscn.PAGE_URL:
+            return FakeResponse(text=self.page_html)
+        if self.api_fails:
+            return FakeResponse(status_code=503)
+        return FakeResponse(self.pages[(params or {}).get('cursor')])
+
+
+def _api_page(ids, next_cursor, day):
+    ts = int(datetime.strptime(day, '%Y-%m-%d').replace(tzinfo=ZoneInfo('Asia/Shanghai')).timestamp())
+    items = [{'resource_type': 'article',
+              'resource': {'title': f'新闻 {i}', 'uri': f'https://wallstreetcn.com/articles/{i}',
+                           'display_time': ts + 3600 * 12 - i}} for i in ids]
+    return {'data': {'items': items, 'next_cursor': next_cursor}}
+
+
+def test_api_first_pagination_skips_html(monkeypatch, memory_cache):
+    today = datetime.now(ZoneInfo('Asia/Shanghai')).strftime('%Y-%m-%d')
+    session = FakeWSCNSession({None: _api_page([1, 2], 'c2', today),
+                               'c2': _api_page([3, 4], 'c3', today),
+                               'c3': _api_page([5], '', today)})
+    monkeypatch.setattr(wscn, 'get_session', lambda **kwargs: session)
+
+    items = get_wallstreetcn_news(use_cache=False)
+    assert [it['title'] for it in items] == ['新闻 1', '新闻 2', '新闻 3', '新闻 4', '新闻 5']
+    assert all(url == wscn.API_URL for url, _ in session.calls)
+    assert [params.get('cursor') for _, params in session.calls] == [None, 'c2', 'c3']
+
+
+def test_pagination_stops_at_previously_seen_items(monkeypatch, memory_cache):
+    today = datetime.now(ZoneInfo('Asia/Shanghai')).strftime('%Y-%m-%d')
+    memory_cache.set(wscn.CACHE_KEY, wscn._parse_information_flow(_api_page([2, 3], None, today)))
+    session = FakeWSCNSession({None: _api_page([1, 2], 'c2', today),
+                               'c2': _api_page([3], None, today)})
+    monkeypatch.setattr(wscn, 'get_session', lambda **kwargs: session)
+
+    items = get_wallstreetcn_news(use_cache=False)
+    assert [it['title'] for it in items] == ['新闻 1', '新闻 2', '新闻 3']
+    assert len(session.calls) == 1
+
+
+def test_html_fallback_only_when_api_fails(monkeypatch, memory_cache):
+    html = "<div class='news-item'><a href='/articles/9'>网页新闻标题</a><time>2024-01-02 03:04:05</time></div>"
+    session = FakeWSCNSession({}, api_fails=True, page_html=html)
+    monkeypatch.setattr(wscn, 'get_session', lambda **kwargs: session)
+
+    items = get_wallstreetcn_news(use_cache=False)
+    assert items == [{'title': '网页新闻标题', 'datetime': '2024-01-02 03:04:05',
+                      'link': 'https://wallstreetcn.com/articles/9'}]
+    assert session.calls[-1][0] == wscn.PAGE_URL
+
+
+def test_lives_fetches_only_new_entries(monkeypatch, memory_cache):
+    def lives_page(ids, next_cursor):
+        return {'data': {'items': [{'id': i, 'content_text': f' 快讯 {i} ', 'display_time': 1700000000 + i}
+                                   for i in ids], 'next_cursor': next_cursor}}
+
+    session = FakeWSCNSession({None: lives_page([9, 8], 'p2'), 'p2': lives_page([7, 6], 'p3'),
+                               'p3': lives_page([5, 4], None)})
+    monkeypatch.setattr(wscn, 'get_session', lambda **kwargs: session)
+
+    items, newest = wscn.get_wallstreetcn_lives(since_id=6)
+    assert [it['title'] for it in items] == ['快讯 9', '快讯 8', '快讯 7']
+    assert newest == 9
+    assert items[0]['link'] == 'https://wallstreetcn.com/livenews/9'
+    assert items[0]['type'] == 'live' and items[0]['source'] == 'wallstreetcn'
+    assert len(session.calls) == 2
+
+
 if __name__ == '__main__':
     try:
         test_fetch_and_datetime_format()
@@ -0,0 +1,64 @@
+import http_client
+
+
+def test_session_is_shared_per_retry_policy():
+    http_client.close_all()
+    a = http_client.get_session(retries=3, backoff_factor=0.5)
+    b = http_client.get_session(retries=3, backoff_factor=0.5)
+    c = http_client.get_session(retries=5, backoff_factor=1.5)
+    assert a is b
+    assert a is not c
+
+
+def test_per_host_pool_sizes():
+    http_client.configure_pools(host_pool_sizes={'example.com': 2})
+    session = http_client.get_session()
+    adapter = session.get_adapter('https://example.com/a')
+    assert adapter._pool_maxsize == 2
+    assert adapter.max_retries.total == 3
+    assert session.get_adapter('https://other.org/')._pool_maxsize == http_client.DEFAULT_POOL_MAXSIZE
+    http_client.HOST_POOL_SIZES.pop('example.com')
+    http_client.close_all()
+
+
+class FakeResponse:
+    def __init__(self, status_code, body=None, headers=None):
+        self.status_code = status_code
+        self.body = body
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise http_client.requests.HTTPError(str(self.status_code))
+
+
+class ValidatingSession:
+    """模拟支持 ETag 的服务端"""
+
+    def __init__(self):
+        self.requests = []
+
+    def get(self, url, params=None, headers=None, timeout=None):
+        self.requests.append(dict(headers or {}))
+        if (headers or {}).get('If-None-Match') == '"v1"':
+            return FakeResponse(304)
+        return FakeResponse(200, body='payload', headers={'ETag': '"v1"'})
+
+
+def test_conditional_get_reuses_parsed_result_on_304():
+    http_client.clear_validators()
+    session = ValidatingSession()
+    calls = []
+
+    def parse(resp):
+        calls.append(resp.body)
+        return [resp.body]
+
+    first, hit1 = http_client.conditional_get(session, 'https://example.com/feed', parse, params={'a': 1})
+    second, hit2 = http_client.conditional_get(session, 'https://example.com/feed', parse, params={'a': 1})
+    assert (hit1, hit2) == (False, True)
+    assert first == second == ['payload']
+    assert calls == ['payload']
+    assert 'If-None-Match' not in session.requests[0]
+    assert session.requests[1]['If-None-Match'] == '"v1"'
+    http_client.clear_validators()
@@ -0,0 +1,33 @@
+"""冷启动导入开销：用 -X importtime 记录各模块的导入时间，防止重量级依赖回到启动路径上"""
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+# 导入 news_aggregator 的累计耗时上限（微秒）；本机约 40 ms，预留足够余量避免在慢机器上误报
+IMPORT_BUDGET_US = 200_000
+HEAVY_MODULES = {'requests', 'bs4', 'urllib3', 'get_wallstreat_news', 'get_reuters_news'}
+
+
+def import_times(code):
+    """在新进程中执行 code，返回 {模块名: 累计导入耗时（微秒）}"""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=ROOT,
+                            capture_output=True, text=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line.split('|')
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_aggregator_import_stays_light():
+    times = import_times('import news_aggregator; news_aggregator.NewsAggregator()')
+    assert not HEAVY_MODULES & set(times), sorted(HEAVY_MODULES & set(times))
+    assert times['news_aggregator'] < IMPORT_BUDGET_US, times['news_aggregator']
+
+
+def test_html_parser_is_loaded_on_demand():
+    times = import_times('import get_wallstreat_news, get_reuters_news')
+    assert 'bs4' not in times
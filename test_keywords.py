@@ -0,0 +1,50 @@
+import random
+
+from keywords import KeywordMatcher, highlight_title, sentiment_marks
+
+
+def test_matcher_finds_all_overlapping_matches():
+    words = ['甲乙', '乙', '甲乙丙', '乙丙', '丙', '丙甲', '甲', '甲甲乙']
+    matcher = KeywordMatcher({w: w for w in words})
+    rng = random.Random(0)
+    for _ in range(500):
+        text = ''.join(rng.choice('甲乙丙') for _ in range(12))
+        expected = sorted((i, i + len(w), w) for w in words for i in range(len(text)) if text.startswith(w, i))
+        assert sorted(matcher.iter_matches(text)) == expected
+
+
+def test_find_spans_prefers_leftmost_longest():
+    matcher = KeywordMatcher({'甲乙': 1, '甲乙丙': 2, '丙丁': 3, '丁': 4})
+    assert matcher.find_spans('甲乙丙丁') == [(0, 3, 2), (3, 4, 4)]
+
+
+def test_english_keywords_match_at_word_start_only():
+    matcher = KeywordMatcher({'Gain': 'g', 'risk': 'r'})
+    assert [m[:2] for m in matcher.find_spans('GAINS again, brisk RISK')] == [(0, 4), (19, 23)]
+
+
+def test_highlight_title_escapes_and_wraps_keywords():
+    assert highlight_title('<b>美股暴涨</b> & Stocks Plunge') == (
+        "&lt;b&gt;美股<span class='kw-bull'>暴涨</span>&lt;/b&gt; &amp; Stocks <span class='kw-bear'>Plunge</span>")
+    assert highlight_title('平稳') == '平稳'
+
+
+def test_sentiment_marks_use_utf16_offsets():
+    assert sentiment_marks('美股暴涨') == [2, 4, 'bull']
+    assert sentiment_marks('😀暴涨') == [2, 4, 'bull']
+
+
+def test_title_score_matches_per_keyword_count():
+    from keywords import VOCABULARY, score, title_score
+    pieces = list(VOCABULARY) + ['涨', '跌', '期', ' ', 'x']
+    rng = random.Random(1)
+    for _ in range(500):
+        title = ''.join(rng.choice(pieces) for _ in range(rng.randint(0, 8)))
+        expected = sum(title.lower().count(word) * kw.weight for word, kw in VOCABULARY.items())
+        assert title_score(title) == expected
+    assert score([{'title': '暴涨暴涨'}, {}, {'title': '暴涨暴涨'}]) == [20, 0, 20]
+
+
+def test_scorer_checks_word_start_for_english_keywords():
+    scorer = KeywordMatcher({'gain': 2, 'risk': 3, '暴涨': 1}).scorer(lambda value: value)
+    assert scorer('Gains again brisk RISK 暴涨暴涨') == 2 + 3 + 2
@@ -4,8 +4,12 @@ import sys
 import os
 sys.path.insert(0, os.path.dirname(__file__))
 
-from news_aggregator import fetch_all_news, fetch_news_by_source
+from news_aggregator import fetch_all_news, fetch_news_by_source, NewsAggregator, NewsSource, WallStreetCNLiveSource
+import get_wallstreat_news
+import news_aggregator
 from datetime import datetime
+import threading
+import time
 
 def validate_article(article):
     """Validate article structure"""
@@ -95,5 +99,176 @@ def test_aggregator():
     print("\n" + "=" * 60)
     print("✓ All tests passed!" if invalid_count == 0 else f"✗ {invalid_count} tests failed")
 
+class FastSource(NewsSource):
+    def fetch(self, use_cache=True, cache_ttl=60):
+        return [{'title': 'fast', 'datetime': '2024-01-02 00:00:00', 'link': 'https://a/1',
+                 'source': 'fast', 'type': 'article'}]
+
+
+class SlowSource(NewsSource):
+    def fetch(self, use_cache=True, cache_ttl=60):
+        time.sleep(0.5)
+        return [{'title': 'slow', 'datetime': '2024-01-03 00:00:00', 'link': 'https://a/2',
+                 'source': 'slow', 'type': 'article'}]
+
+
+class BrokenSource(NewsSource):
+    def fetch(self, use_cache=True, cache_ttl=60):
+        raise RuntimeError('boom')
+
+
+def test_concurrent_runs_sources_in_parallel():
+    agg = NewsAggregator([SlowSource(), FastSource()], dedup=False)
+    agg.sources['slow2'] = SlowSource()
+    start = time.monotonic()
+    items, status = agg.fetch_all_with_status(concurrent=True)
+    assert time.monotonic() - start < 0.9
+    assert [it['title'] for it in items] == ['slow', 'slow', 'fast']
+    assert all(info['status'] == 'ok' for info in status.values())
+
+
+def test_concurrent_deadline_returns_partial_results():
+    agg = NewsAggregator([SlowSource(), FastSource(), BrokenSource()])
+    start = time.monotonic()
+    items, status = agg.fetch_all_with_status(concurrent=True, source_timeout=0.1)
+    assert time.monotonic() - start < 0.4
+    assert [it['title'] for it in items] == ['fast']
+    assert status['slowsource']['status'] == 'timeout'
+    assert status['fastsource']['status'] == 'ok'
+    assert status['brokensource']['status'] == 'error'
+    assert agg.last_status == status
+
+
+def test_deadline_caps_source_timeout_and_workers_are_daemons():
+    workers = []
+
+    class RecordingSource(FastSource):
+        def fetch(self, use_cache=True, cache_ttl=60):
+            workers.append(threading.current_thread())
+            return super().fetch(use_cache, cache_ttl)
+
+    agg = NewsAggregator([SlowSource(), RecordingSource()])
+    start = time.monotonic()
+    items, status = agg.fetch_all_with_status(concurrent=True, source_timeout=5, deadline=0.1)
+    assert time.monotonic() - start < 0.4
+    assert status['slowsource']['status'] == 'timeout'
+    # 被放弃的工作线程不阻止解释器退出
+    assert workers and workers[0].daemon
+
+
+def test_source_timeout_counts_from_each_source_start(monkeypatch):
+    run_source = NewsAggregator._run_source
+
+    def late_start(self, future, started, source_name, *args):
+        # 模拟晚开始的来源：开始前的等待不计入单源超时
+        time.sleep(0.3)
+        run_source(self, future, started, source_name, *args)
+
+    class QuickSource(NewsSource):
+        def fetch(self, use_cache=True, cache_ttl=60):
+            time.sleep(0.2)
+            return [{'title': 'quick', 'datetime': '2024-01-01 00:00:00', 'link': 'https://q/1'}]
+
+    monkeypatch.setattr(NewsAggregator, '_run_source', late_start)
+    items, status = NewsAggregator([QuickSource()]).fetch_all_with_status(concurrent=True, source_timeout=0.35)
+    assert status['quicksource']['status'] == 'ok'
+    assert [it['title'] for it in items] == ['quick']
+
+
+def test_sequential_matches_concurrent():
+    agg = NewsAggregator([FastSource(), SlowSource()])
+    assert agg.fetch_all() == agg.fetch_all(concurrent=True)
+
+
+def test_live_source_polls_incrementally(monkeypatch):
+    feed = [[3, 2, 1], [5, 4, 3, 2]]
+    calls = []
+
+    def fake_lives(since_id=None):
+        calls.append(since_id)
+        ids = [i for i in feed.pop(0) if since_id is None or i > since_id]
+        items = [{'title': f'快讯 {i}', 'datetime': f'2024-01-01 00:00:0{i}', 'link': f'https://wallstreetcn.com/livenews/{i}',
+                  'source': 'wallstreetcn', 'type': 'live'} for i in ids]
+        return items, max(ids) if ids else since_id
+
+    monkeypatch.setattr(get_wallstreat_news, 'get_wallstreetcn_lives', fake_lives)
+    source = WallStreetCNLiveSource()
+    assert [it['title'] for it in source.fetch(use_cache=False)] == ['快讯 3', '快讯 2', '快讯 1']
+    assert [it['title'] for it in source.fetch(use_cache=True)] == ['快讯 3', '快讯 2', '快讯 1']
+    assert [it['title'] for it in source.fetch(use_cache=False)] == ['快讯 5', '快讯 4', '快讯 3', '快讯 2', '快讯 1']
+    assert calls == [None, 3]
+    # 新实例从共享缓存中恢复轮询状态
+    assert WallStreetCNLiveSource().fetch(use_cache=True)[0]['title'] == '快讯 5'
+
+
+class UnorderedSource(NewsSource):
+    def fetch(self, use_cache=True, cache_ttl=60):
+        return [{'title': 'u1', 'datetime': '2024-01-01 00:00:00', 'link': 'https://u/1'},
+                {'title': 'u3', 'datetime': '2024-01-03 12:00:00', 'link': 'https://u/3'}]
+
+
+def test_sources_are_merged_by_timestamp():
+    agg = NewsAggregator([FastSource(), UnorderedSource(), SlowSource()])
+    items = agg.fetch_all()
+    assert [it['title'] for it in items] == ['u3', 'slow', 'fast', 'u1']
+    assert [it['ts'] for it in items] == sorted((it['ts'] for it in items), reverse=True)
+
+
+class MirrorSource(NewsSource):
+    """与 SlowSource 报道同一条新闻：链接只差栏目路径和跟踪参数，标题只差标点"""
+    def fetch(self, use_cache=True, cache_ttl=60):
+        return [{'title': 'Fed cuts rates by 25 basis points, first cut this year', 'datetime': '2024-01-03 00:00:00',
+                 'link': 'https://www.reuters.com/markets/us/fed-cuts-2024-01-03/?utm_source=rss'},
+                {'title': '美联储宣布降息25个基点', 'datetime': '2024-01-02 00:00:00', 'link': 'https://m/2'}]
+
+
+class ReutersMirrorSource(NewsSource):
+    def fetch(self, use_cache=True, cache_ttl=60):
+        return [{'title': 'Fed cuts rates by 25 basis points - first cut this year', 'datetime': '2024-01-03 00:00:00',
+                 'link': 'https://www.reuters.com/world/fed-cuts-2024-01-03/'},
+                {'title': '美联储宣布降息 25 个基点！', 'datetime': '2024-01-01 00:00:00', 'link': 'https://other/9'},
+                {'title': 'Oil prices fall', 'datetime': '2024-01-01 00:00:00', 'link': 'https://other/10'}]
+
+
+def test_cross_source_duplicates_are_removed():
+    agg = NewsAggregator([MirrorSource(), ReutersMirrorSource()])
+    items = agg.fetch_all()
+    assert [it['link'] for it in items] == [
+        'https://www.reuters.com/markets/us/fed-cuts-2024-01-03/?utm_source=rss', 'https://m/2', 'https://other/10']
+    assert len(NewsAggregator([MirrorSource(), ReutersMirrorSource()], dedup=False).fetch_all()) == 5
+
+
+def test_ingest_keeps_newest_copy_under_its_own_source(tmp_path):
+    from news_store import NewsStore
+    store = NewsStore(str(tmp_path))
+    added = NewsAggregator([ReutersMirrorSource(), MirrorSource()]).ingest(store)
+    assert [it['link'] for it in added] == [
+        'https://www.reuters.com/world/fed-cuts-2024-01-03/', 'https://other/10', 'https://m/2']
+    assert store.watermark('mirrorsource')['datetime'] == '2024-01-02 00:00:00'
+
+
+
+class FilteringSource(NewsSource):
+    supports_seen_filter = True
+
+    def __init__(self):
+        self.filters = []
+
+    def fetch(self, use_cache=True, cache_ttl=60, seen_filter=None):
+        self.filters.append(seen_filter)
+        return [{'title': 'f1', 'datetime': '2024-01-01 00:00:00', 'link': 'https://f/1'}]
+
+
+def test_seen_filter_is_passed_per_ingest_call(tmp_path):
+    from news_store import NewsStore
+    store = NewsStore(str(tmp_path))
+    source = FilteringSource()
+    agg = NewsAggregator([source, FastSource()])
+    agg.ingest(store)
+    agg.fetch_all()
+    agg.fetch_by_source('filteringsource')
+    assert source.filters == [store.seen, None, None]
+
+
 if __name__ == '__main__':
     test_aggregator()
@@ -0,0 +1,67 @@
+import os
+
+from news_archive import INDEX_RECORD, NewsArchive, export_links
+from news_item import NewsItem
+from news_store import NewsStore
+
+
+def make(title, dt, source='reuters'):
+    return {'title': title, 'datetime': dt, 'link': f'https://example.com/{title}/', 'source': source}
+
+
+def test_query_filters_by_range_and_source(tmp_path):
+    archive = NewsArchive(str(tmp_path))
+    archive.append('reuters', [make('r2', '2024-05-02 10:00:00'), make('r1', '2024-05-01 09:00:00')])
+    archive.append('wallstreetcn', [NewsItem.from_dict(make('w1', '2024-05-01 12:00:00', 'wallstreetcn')),
+                                    make('w3', '2024-05-03 08:00:00', 'wallstreetcn')])
+    archive.append('reuters', [make('r3', '2024-05-03 23:59:59')])
+
+    assert archive.days() == ['2024-05-01', '2024-05-02', '2024-05-03']
+    assert [r['title'] for r in archive.query()] == ['r1', 'w1', 'r2', 'w3', 'r3']
+    assert [r['title'] for r in archive.query('2024-05-02', '2024-05-03', ['reuters'])] == ['r2', 'r3']
+    assert [r['title'] for r in archive.query('2024-05-01 10:00:00', '2024-05-01')] == ['w1']
+    assert list(archive.query(sources=['other'])) == []
+
+
+
+def test_partition_day_is_beijing_day_of_ts(tmp_path):
+    archive = NewsArchive(str(tmp_path))
+    # UTC 05-01 16:00 是北京时间 05-02 00:00
+    archive.append('reuters', [make('utc', '2024-05-01T16:00:00+00:00')])
+    assert archive.days() == ['2024-05-02']
+    assert [r['title'] for r in archive.query('2024-05-02', '2024-05-02')] == ['utc']
+    assert list(archive.query('2024-05-01', '2024-05-01')) == []
+
+def test_only_matching_blocks_are_read(tmp_path, monkeypatch):
+    archive = NewsArchive(str(tmp_path))
+    archive.append('reuters', [make('a', '2024-05-01 09:00:00')])
+    archive.append('wallstreetcn', [make('b', '2024-05-01 10:00:00')])
+    archive.append('reuters', [make('c', '2024-05-01 20:00:00')])
+    assert os.path.getsize(tmp_path / '2024-05-01.idx') == 3 * INDEX_RECORD.size
+
+    reads = []
+    import zlib
+    real = zlib.decompress
+    monkeypatch.setattr(zlib, 'decompress', lambda data: reads.append(len(data)) or real(data))
+    assert [r['title'] for r in archive.query('2024-05-01 12:00:00', '2024-05-01', ['reuters'])] == ['c']
+    assert len(reads) == 1
+
+
+def test_torn_index_record_is_ignored(tmp_path):
+    archive = NewsArchive(str(tmp_path))
+    archive.append('reuters', [make('a', '2024-05-01 09:00:00')])
+    with open(tmp_path / '2024-05-01.idx', 'ab') as f:
+        f.write(b'\x01\x02\x03')
+    assert [r['title'] for r in archive.query()] == ['a']
+    archive.append('reuters', [make('b', '2024-05-01 10:00:00')])
+    assert os.path.getsize(tmp_path / '2024-05-01.idx') == 2 * INDEX_RECORD.size
+    assert [r['title'] for r in archive.query()] == ['a', 'b']
+
+
+def test_store_archives_and_exports_links(tmp_path):
+    store = NewsStore(str(tmp_path))
+    store.ingest('reuters', [make('a', '2024-05-01 09:00:00'), make('b', '2024-05-02 09:00:00')])
+    store.ingest('wallstreetcn', [make('c', '2024-05-02 10:00:00', 'wallstreetcn')])
+    out = tmp_path / 'out' / 'links.txt'
+    assert export_links(str(out), '2024-05-01', '2024-05-02', ['reuters'], store.archive) == 2
+    assert out.read_text(encoding='utf-8').splitlines() == ['https://example.com/a', 'https://example.com/b']
@@ -0,0 +1,59 @@
+import time
+
+import pytest
+
+from news_cache import MemoryCache, SQLiteCache
+
+
+@pytest.fixture(params=['memory', 'sqlite'])
+def make_cache(request, tmp_path):
+    def factory(max_entries=1024):
+        if request.param == 'memory':
+            return MemoryCache(max_entries=max_entries)
+        return SQLiteCache(str(tmp_path / 'cache.sqlite3'), max_entries=max_entries)
+    return factory
+
+
+def test_get_set_and_max_age(make_cache):
+    cache = make_cache()
+    cache.set('k', [{'title': '标题'}])
+    assert cache.get('k') == [{'title': '标题'}]
+    assert cache.get('k', max_age=60) == [{'title': '标题'}]
+    assert cache.get('k', max_age=0) is None
+    # max_age 只影响新鲜度判断，不删除条目
+    assert cache.get('k') == [{'title': '标题'}]
+
+
+def test_ttl_expiry(make_cache):
+    cache = make_cache()
+    cache.set('k', 1, ttl=0.05)
+    time.sleep(0.1)
+    assert cache.get('k') is None
+
+
+def test_lru_eviction(make_cache):
+    cache = make_cache(max_entries=2)
+    cache.set('a', 1)
+    time.sleep(0.01)
+    cache.set('b', 2)
+    time.sleep(0.01)
+    assert cache.get('a') == 1
+    time.sleep(0.01)
+    cache.set('c', 3)
+    assert cache.get('b') is None
+    assert cache.get('a') == 1 and cache.get('c') == 3
+
+
+def test_clear_prefix(make_cache):
+    cache = make_cache()
+    cache.set('http:validator:x', 1)
+    cache.set('http_other', 2)
+    cache.clear('http:')
+    assert cache.get('http:validator:x') is None
+    assert cache.get('http_other') == 2
+
+
+def test_sqlite_cache_survives_reopen(tmp_path):
+    path = str(tmp_path / 'cache.sqlite3')
+    SQLiteCache(path).set('reuters:articles', [{'link': 'https://a'}])
+    assert SQLiteCache(path).get('reuters:articles', max_age=60) == [{'link': 'https://a'}]
@@ -0,0 +1,60 @@
+from news_aggregator import NewsAggregator, NewsSource
+from news_daemon import AdaptiveInterval, NewsDaemon
+from news_store import NewsStore
+
+
+class ScriptedSource(NewsSource):
+    """每次 fetch 依次返回预先设定的结果"""
+
+    def __init__(self, batches):
+        self.batches = list(batches)
+
+    def fetch(self, use_cache=True, cache_ttl=60):
+        return self.batches.pop(0) if self.batches else []
+
+
+def make(title, dt):
+    return {'title': title, 'datetime': dt, 'link': f'https://example.com/{title}',
+            'source': 'reuters', 'type': 'article'}
+
+
+def test_adaptive_interval_bounds():
+    interval = AdaptiveInterval(100, minimum=30, maximum=200)
+    assert interval.update(3) == 50
+    assert interval.update(1) == 30
+    assert interval.update(0) == 45
+    for _ in range(10):
+        interval.update(0)
+    assert interval.value == 200
+
+
+def test_daemon_renders_only_when_items_change(tmp_path, monkeypatch):
+    import scripts.generate_news_page as page
+    renders = []
+    write_page = page.write_page
+    monkeypatch.setattr(page, 'write_page',
+                        lambda path, items, inline_limit=None: renders.append(len(items)) or write_page(path, items))
+
+    today = page.datetime.now(page.ZoneInfo('Asia/Shanghai')).strftime('%Y-%m-%d')
+    source = ScriptedSource([[make('a', f'{today} 08:00:00')],
+                             [make('a', f'{today} 08:00:00')],
+                             [make('b', f'{today} 09:00:00'), make('a', f'{today} 08:00:00')]])
+    aggregator = NewsAggregator([source])
+    now = [0.0]
+    daemon = NewsDaemon(aggregator=aggregator, store=NewsStore(str(tmp_path / 'store')),
+                        output=str(tmp_path / 'docs' / 'index.html'),
+                        min_interval=10, max_interval=1000, clock=lambda: now[0])
+
+    assert daemon.tick() == ['scriptedsource']
+    first_interval = daemon.intervals['scriptedsource'].value
+    assert daemon.tick() == []           # 未到期
+
+    now[0] += first_interval
+    daemon.tick()                        # 没有新内容：不渲染，间隔变长
+    assert daemon.intervals['scriptedsource'].value > first_interval
+
+    now[0] += daemon.intervals['scriptedsource'].value
+    daemon.tick()                        # 有新内容：重新渲染
+    assert renders == [1, 2]
+    html = (tmp_path / 'docs' / 'index.html').read_text(encoding='utf-8')
+    assert 'https://example.com/a' in html and 'https://example.com/b' in html
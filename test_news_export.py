@@ -0,0 +1,95 @@
+import csv
+import io
+import json
+
+import news_export
+from news_aggregator import NewsAggregator, NewsSource
+from news_archive import NewsArchive
+
+
+class FirstSource(NewsSource):
+    def fetch(self, use_cache=True, cache_ttl=60):
+        return [{'title': '美联储宣布降息25个基点', 'datetime': '2024-05-02 10:00:00', 'link': 'https://a/1/',
+                 'source': 'first', 'type': 'news'},
+                {'title': 'Oil rally continues', 'datetime': '2024-05-01 09:00:00', 'link': 'https://a/2',
+                 'source': 'first', 'type': 'news'}]
+
+
+class SecondSource(NewsSource):
+    def fetch(self, use_cache=True, cache_ttl=60):
+        return [{'title': '美联储宣布降息 25 个基点！', 'datetime': '2024-05-02 09:00:00', 'link': 'https://b/1',
+                 'source': 'second', 'type': 'news'},
+                {'title': 'Again, markets wait', 'datetime': '2024-05-01 12:00:00', 'link': 'https://b/2',
+                 'source': 'second', 'type': 'news'}]
+
+
+class BrokenSource(NewsSource):
+    def fetch(self, use_cache=True, cache_ttl=60):
+        raise RuntimeError('boom')
+
+
+def aggregator():
+    return NewsAggregator([FirstSource(), SecondSource(), BrokenSource()])
+
+
+def test_fetch_stage_merges_sources_lazily_and_skips_errors():
+    items = list(news_export.fetch_stage(aggregator()))
+    assert [it.link for it in items] == ['https://a/1/', 'https://b/1', 'https://b/2', 'https://a/2']
+    assert [it.title for it in news_export.fetch_stage(aggregator(), ['secondsource'])] == [
+        '美联储宣布降息 25 个基点！', 'Again, markets wait']
+
+
+def test_fetch_stage_reports_errors_inside_a_source_as_fetch_errors(capsys):
+    class KeyErrorSource(NewsSource):
+        def fetch(self, use_cache=True, cache_ttl=60):
+            return {}['items']
+
+    agg = NewsAggregator([KeyErrorSource()])
+    assert list(news_export.fetch_stage(agg, ['keyerrorsource', 'missing'])) == []
+    err = capsys.readouterr().err
+    assert '从 keyerrorsource 获取新闻时出错: KeyError' in err
+    assert '未知的新闻源: missing' in err
+    assert '未知的新闻源: keyerrorsource' not in err
+
+
+def test_pipeline_dedups_and_filters():
+    records = list(news_export.fetch_stage(aggregator()))
+    assert [it.link for it in news_export.pipeline(records)] == ['https://a/1/', 'https://b/2', 'https://a/2']
+    assert [it.link for it in news_export.pipeline(records, dedup=False, since='2024-05-01 10:00:00',
+                                                   until='2024-05-01')] == ['https://b/2']
+    assert [it.link for it in news_export.pipeline(records, sources=['second'])] == ['https://b/1', 'https://b/2']
+    # 英文关键词按单词开头匹配：'gain' 不匹配 'Again'
+    assert [it.link for it in news_export.pipeline(records, keywords=['RALLY', 'gain', '降息'])] == [
+        'https://a/1/', 'https://a/2']
+
+
+def test_writers(tmp_path):
+    records = list(news_export.fetch_stage(aggregator()))
+    out = tmp_path / 'news.jsonl'
+    assert news_export.export(records, 'jsonl', str(out)) == 3
+    rows = [json.loads(line) for line in out.read_text(encoding='utf-8').splitlines()]
+    assert rows[0]['title'] == '美联储宣布降息25个基点' and rows[0]['ts'] == 1714615200
+
+    out = tmp_path / 'news.csv'
+    news_export.export(records, 'csv', str(out), dedup=False)
+    with open(out, encoding='utf-8', newline='') as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == list(news_export.CSV_FIELDS)
+    assert len(rows) == 5
+
+    buf = io.StringIO()
+    assert news_export.write_link_list(news_export.pipeline(records, dedup=False), buf) == 4
+    assert buf.getvalue().splitlines()[0] == 'https://a/1'
+
+
+def test_cli_exports_from_archive(tmp_path, monkeypatch):
+    archive = NewsArchive(str(tmp_path / 'archive'))
+    archive.append('reuters', [{'title': 'a', 'datetime': '2024-05-01 09:00:00', 'link': 'https://r/a'},
+                               {'title': 'b', 'datetime': '2024-05-03 09:00:00', 'link': 'https://r/b'}])
+    archive.append('wallstreetcn', [{'title': 'c', 'datetime': '2024-05-01 10:00:00', 'link': 'https://w/c'}])
+    monkeypatch.setattr(news_export, 'archive_stage',
+                        lambda since=None, until=None, sources=None: archive.query(since, until, sources))
+    out = tmp_path / 'links.txt'
+    assert news_export.main(['--from-archive', '--since', '2024-05-01', '--until', '2024-05-02',
+                             '--source', 'reuters', '--format', 'links', '--output', str(out)]) == 0
+    assert out.read_text(encoding='utf-8').splitlines() == ['https://r/a']
@@ -0,0 +1,52 @@
+import json
+
+import pytest
+
+from news_item import NewsItem, by_sort_key, to_items
+
+
+def test_from_dict_fills_defaults_and_ts():
+    item = NewsItem.from_dict({'title': 't', 'datetime': '2024-01-02 00:00:00', 'link': 'l'}, 'reuters')
+    assert item.source == 'reuters'
+    assert item.type == ''
+    assert item.ts == 1704124800
+    assert item.sort_key == -1704124800
+    assert NewsItem.from_dict({'title': 't', 'ts': 5}).ts == 5
+
+
+def test_source_and_type_are_interned():
+    a = NewsItem.from_dict({'source': ''.join(['wall', 'streetcn']), 'type': ''.join(['li', 've'])})
+    b = NewsItem.from_dict({'source': 'wallstreetcn', 'type': 'live'})
+    assert a.source is b.source
+    assert a.type is b.type
+
+
+def test_dict_style_access():
+    item = NewsItem('t', '2024-01-02 00:00:00', 'l', 'reuters')
+    assert item['title'] == 't'
+    assert item.get('type', 'x') == ''
+    assert item.get('missing', 'x') == 'x'
+    assert 'link' in item and 'missing' not in item
+    with pytest.raises(KeyError):
+        item['missing']
+    with pytest.raises(KeyError):
+        item['missing'] = 1
+    item['ts'] = 7
+    assert item.sort_key == -7
+    assert dict(item)['source'] == 'reuters'
+    assert not hasattr(item, '__dict__')
+
+
+def test_to_dict_round_trips_through_json():
+    item = NewsItem('标题', '2024-01-02 00:00:00', 'l', 'reuters', 'news')
+    item.hotness = 3
+    record = json.loads(json.dumps(item.to_dict(), ensure_ascii=False))
+    assert 'hotness' not in record
+    assert NewsItem.from_dict(record) == item
+
+
+def test_to_items_passes_records_through_and_sorts_by_key():
+    existing = NewsItem('a', '2024-01-01 00:00:00')
+    items = to_items([existing, {'title': 'b', 'datetime': '2024-01-02 00:00:00'}])
+    assert items[0] is existing
+    assert [it.title for it in sorted(items, key=by_sort_key)] == ['b', 'a']
@@ -0,0 +1,60 @@
+import json
+import shutil
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+from news_store import NewsStore
+
+
+def make(title, dt, link=None):
+    return {'title': title, 'datetime': dt, 'link': link or f'https://example.com/{title}',
+            'source': 'reuters', 'type': 'article'}
+
+
+def test_ingest_only_appends_delta(tmp_path):
+    store = NewsStore(str(tmp_path))
+    first = [make('b', '2024-05-02 10:00:00'), make('a', '2024-05-01 09:00:00')]
+    assert store.ingest('reuters', first) == first
+
+    second = [make('c', '2024-05-02 10:00:00'), make('b', '2024-05-02 10:00:00'), make('a', '2024-05-01 09:00:00')]
+    assert [it['title'] for it in store.ingest('reuters', second)] == ['c']
+    assert store.ingest('reuters', second) == []
+    assert store.watermark('reuters') == {'datetime': '2024-05-02 10:00:00'}
+
+    lines = (tmp_path / '2024-05-02.jsonl').read_text(encoding='utf-8').splitlines()
+    assert [json.loads(line)['title'] for line in lines] == ['b', 'c']
+    assert store.days() == ['2024-05-02', '2024-05-01']
+
+
+def test_late_arriving_items_are_not_dropped(tmp_path):
+    store = NewsStore(str(tmp_path))
+    first = [make('evergreen', '2024-05-02 10:05:00'), make('a', '2024-05-02 09:50:00')]
+    assert store.ingest('reuters', first) == first
+    # 发布时间早于水位线、较晚才出现的新闻仍然入库
+    assert [it['title'] for it in store.ingest('reuters', [make('b', '2024-05-02 10:00:00')])] == ['b']
+    assert store.ingest('reuters', first) == []
+    # 早于回看窗口的新闻视为已处理
+    assert store.ingest('reuters', [make('old', '2024-04-29 10:00:00')]) == []
+    assert store.watermark('reuters') == {'datetime': '2024-05-02 10:05:00'}
+
+    # 已入库的链接从 JSONL 分区读取，归档和过滤器丢失时也不会重复入库
+    shutil.rmtree(tmp_path / 'archive')
+    shutil.rmtree(tmp_path / 'seen')
+    reopened = NewsStore(str(tmp_path))
+    assert reopened.ingest('reuters', [make('b', '2024-05-02 10:00:00'), make('a', '2024-05-02 09:50:00')]) == []
+
+
+def test_watermarks_survive_reopen_and_are_per_source(tmp_path):
+    NewsStore(str(tmp_path)).ingest('reuters', [make('a', '2024-05-01 09:00:00')])
+    store = NewsStore(str(tmp_path))
+    assert store.ingest('reuters', [make('a', '2024-05-01 09:00:00')]) == []
+    assert len(store.ingest('wallstreetcn', [make('a', '2024-05-01 09:00:00')])) == 1
+
+
+def test_recent_returns_history_newest_first(tmp_path):
+    store = NewsStore(str(tmp_path))
+    today = datetime.now(ZoneInfo('Asia/Shanghai')).strftime('%Y-%m-%d')
+    store.ingest('reuters', [make('old', '2000-01-01 00:00:00')])
+    store.ingest('reuters', [make('x', f'{today} 08:00:00'), make('y', f'{today} 09:00:00')])
+    assert [it['title'] for it in store.recent(days=2)] == ['y', 'x']
+    assert [it['title'] for it in store.recent(days=2, limit=1)] == ['y']
@@ -0,0 +1,32 @@
+import time
+
+from news_time import UNKNOWN_TS, normalize, to_ts
+
+
+def test_to_ts_is_beijing_time_regardless_of_local_timezone(monkeypatch):
+    expected = 1704124800  # 2024-01-02 00:00:00 +08:00
+    for tz in ('UTC', 'America/New_York'):
+        monkeypatch.setenv('TZ', tz)
+        time.tzset()
+        to_ts.cache_clear()
+        assert to_ts('2024-01-02 00:00:00') == expected
+    monkeypatch.delenv('TZ')
+    time.tzset()
+    assert to_ts('2024-01-02 00:00') == expected
+    assert to_ts('2024-01-02') == expected
+    assert to_ts('2024-01-01T16:00:00+00:00') == expected
+    assert to_ts('') == UNKNOWN_TS
+    assert to_ts('yesterday') == UNKNOWN_TS
+
+
+def test_normalize_keeps_sorted_input_and_sorts_otherwise():
+    items = [{'title': 'b', 'datetime': '2024-01-02 00:00:00'},
+             {'title': 'a', 'datetime': '2024-01-01 00:00:00', 'ts': 5}]
+    assert normalize(items) is items
+    assert [it['title'] for it in items] == ['b', 'a']
+    assert items[1]['ts'] == 5
+
+    items = [{'title': 'old', 'datetime': '2024-01-01 00:00:00'},
+             {'title': 'new', 'datetime': '2024-01-03 00:00:00'},
+             {'title': 'old2', 'datetime': '2024-01-01 00:00:00'}]
+    assert [it['title'] for it in normalize(items)] == ['new', 'old', 'old2']
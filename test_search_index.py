@@ -0,0 +1,18 @@
+from search_index import build_index, tokenize
+
+
+def test_tokenize_chinese_bigrams_and_english_words():
+    assert list(tokenize('美联储降息，Fed cuts rates 25bp')) == ['美联', '联储', '储降', '降息', 'fed', 'cuts', 'rates', '25bp']
+    assert list(tokenize('A股 大涨')) == ['a', '股', '大涨']
+
+
+def test_build_index_delta_encodes_sorted_postings():
+    index = build_index(['美联储降息', 'Fed 降息 fed', '其他'])
+    assert index['size'] == 3
+    postings = index['postings']
+    assert list(postings) == sorted(postings)
+    assert postings['降息'] == [0, 1]
+    assert postings['fed'] == [1]
+
+    index = build_index(['x'] * 5)
+    assert index['postings']['x'] == [0, 1, 1, 1, 1]
@@ -0,0 +1,42 @@
+import os
+
+from seen_filter import BloomFile, SeenFilter
+
+
+def test_bloom_file_persists_through_mmap(tmp_path):
+    path = str(tmp_path / 'a.bloom')
+    bloom = BloomFile(path, capacity=1000, error_rate=1e-3)
+    keys = [f'https://x/{i}'.encode() for i in range(1000)]
+    for key in keys[:500]:
+        bloom.add(key)
+    bloom.flush()
+    bloom.close()
+
+    bloom = BloomFile(path)
+    assert all(key in bloom for key in keys[:500])
+    false_positives = sum(key in bloom for key in keys[500:])
+    assert false_positives <= 5
+    bloom.close()
+
+
+def test_seen_filter_canonicalizes_and_rotates(tmp_path):
+    day = ['2024-05-01']
+    seen = SeenFilter(str(tmp_path), keep_days=2, capacity=100, today=lambda: day[0])
+    seen.add(['https://www.reuters.com/world/evergreen-explainer-2024-04-30/'])
+    assert seen.seen('https://www.reuters.com/markets/evergreen-explainer-2024-04-30?utm_source=x')
+    assert not seen.seen('https://www.reuters.com/world/other-2024-04-30/')
+    assert not seen.seen('')
+
+    day[0] = '2024-05-02'
+    assert seen.seen('https://www.reuters.com/world/evergreen-explainer-2024-04-30/')
+    seen.add(['https://a/2'])
+    day[0] = '2024-05-03'
+    assert not seen.seen('https://www.reuters.com/world/evergreen-explainer-2024-04-30/')
+    assert seen.seen('https://a/2')
+    assert sorted(os.listdir(tmp_path)) == ['2024-05-02.bloom', '2024-05-03.bloom']
+    seen.close()
+
+    # 新进程重新打开已有文件
+    reopened = SeenFilter(str(tmp_path), keep_days=2, capacity=100, today=lambda: '2024-05-03')
+    assert reopened.seen('https://a/2')
+    reopened.close()
@@ -0,0 +1,25 @@
+import pytest
+
+import source_registry
+from news_aggregator import NewsAggregator, NewsSource
+
+
+class PluginSource(NewsSource):
+    def fetch(self, use_cache=True, cache_ttl=60):
+        return [{'title': 'plugin', 'datetime': '2024-01-01 00:00:00', 'link': 'https://p/1'}]
+
+
+def test_builtin_sources_resolve_lazily():
+    assert list(source_registry.BUILTIN_SOURCES) == source_registry.available_sources()[:3]
+    assert type(source_registry.create_source('reuters')).__name__ == 'ReutersSource'
+    with pytest.raises(ValueError):
+        source_registry.create_source('missing')
+
+
+def test_registered_sources_join_default_aggregator(monkeypatch):
+    monkeypatch.setattr(source_registry, '_registry', dict(source_registry.BUILTIN_SOURCES))
+    source_registry.register_source('plugin', PluginSource)
+    source_registry.register_source('plugin_by_path', 'test_source_registry:PluginSource')
+    agg = NewsAggregator()
+    assert list(agg.sources) == ['wallstreetcn', 'wallstreetcn_live', 'reuters', 'plugin', 'plugin_by_path']
+    assert [it.title for it in agg.fetch_by_source('plugin_by_path')] == ['plugin']